@@ -1,7 +1,15 @@
-# Optional: Celery app (only if celery is installed; avoids ModuleNotFoundError on PythonAnywhere)
-try:
-    from .celery import app as celery_app
-    __all__ = ('celery_app',)
-except ImportError:
-    celery_app = None
-    __all__ = ()
+# Optional: Celery app (only if celery is installed; avoids ModuleNotFoundError on PythonAnywhere).
+# Imported on first use (agcbo.celery_app, the celery CLI or core.tasks), so web workers and
+# management commands that never queue a task don't pay for importing celery at boot.
+__all__ = ('celery_app',)
+
+
+def __getattr__(name):
+    if name != 'celery_app':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    try:
+        from .celery import app
+    except ImportError:
+        app = None
+    globals()['celery_app'] = app
+    return app
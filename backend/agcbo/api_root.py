@@ -14,6 +14,7 @@ def api_root(request, format=None):
             'login': reverse('token_obtain_pair', request=request, format=format),
             'refresh': reverse('token_refresh', request=request, format=format),
             'current_user': reverse('current_user', request=request, format=format),
+            'audit_log': reverse('auditlog-list', request=request, format=format),
         },
         'members': reverse('memberprofile-list', request=request, format=format),
         'projects': reverse('project-list', request=request, format=format),
@@ -23,5 +24,6 @@ def api_root(request, format=None):
         'sports': reverse('sportprogram-list', request=request, format=format),
         'gamification': reverse('badge-list', request=request, format=format),
         'reports': reverse('report-list', request=request, format=format),
+        'search': reverse('api-search', request=request, format=format),
         'message': 'AGCBO Digital Hub API - Welcome!',
     })
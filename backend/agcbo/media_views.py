@@ -1,11 +1,89 @@
 """
 Serve uploaded media files (images, videos, logos, etc.) in development and production.
-Uses Django's static.serve so /media/* requests are served from MEDIA_ROOT.
+
+Files are streamed from MEDIA_ROOT with FileResponse, so WSGI servers that
+support wsgi.file_wrapper (gunicorn, uWSGI) send them with sendfile(). Every
+response carries an ETag and Last-Modified, and conditional requests get a
+304 without the file being read. Single byte ranges are served as 206 partial
+content so browsers can seek in background videos. Content-hashed names (see
+HASHED_NAME_RE) never change, so they are cached for a year as immutable;
+other files are cached for MEDIA_CACHE_MAX_AGE seconds and then revalidated.
+
+With MEDIA_ACCEL = 'nginx' (X-Accel-Redirect to MEDIA_ACCEL_PREFIX) or
+'apache' (X-Sendfile) the view only checks the request and sets the headers,
+and the front proxy sends the file itself, ranges included.
 """
+import mimetypes
 import os
-from django.views.static import serve
+import re
+import stat
+from urllib.parse import quote
+
 from django.conf import settings
-from django.http import Http404
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+# A hex digest of at least 16 characters in the file name marks content-addressed media
+HASHED_NAME_RE = re.compile(r'(?:^|[._-])[0-9a-f]{16,}(?:[._-]|$)')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def _media_root():
+    return os.path.abspath(os.path.realpath(str(settings.MEDIA_ROOT)))
+
+
+def _cache_control(path):
+    if HASHED_NAME_RE.search(os.path.basename(path)):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={getattr(settings, "MEDIA_CACHE_MAX_AGE", 0)}'
+
+
+def _byte_range(header, size):
+    """
+    (start, end) inclusive for a single 'bytes=' range, None to serve the whole
+    file (no, malformed or multi-part ranges), or False when unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    """True when there is no If-Range or it still names the current file."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
 
 
 def serve_media(request, path):
@@ -13,8 +91,56 @@ def serve_media(request, path):
     Serve files from MEDIA_ROOT. path is the part after /media/ (e.g. site/logo.jpg).
     Uses a resolved absolute MEDIA_ROOT so it works regardless of working directory.
     """
-    document_root = os.path.abspath(os.path.realpath(str(settings.MEDIA_ROOT)))
-    path = path.strip('/')
-    if '..' in path or path.startswith('/'):
-        raise Http404("Invalid path")
-    return serve(request, path, document_root=document_root)
+    try:
+        fullpath = safe_join(_media_root(), path.strip('/'))
+        st = os.stat(fullpath)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404("File not found")
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("File not found")
+
+    size, mtime = st.st_size, st.st_mtime
+    etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(mtime),
+        'Cache-Control': _cache_control(fullpath),
+        'Accept-Ranges': 'bytes',
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if not_modified is not None:  # 304, or 412 for a failed If-Match / If-Unmodified-Since
+        for name, value in headers.items():
+            not_modified.headers.setdefault(name, value)
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+
+    accel = getattr(settings, 'MEDIA_ACCEL', '')
+    if accel:
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if accel == 'nginx':
+            response['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + path.strip('/'))
+        else:
+            response['X-Sendfile'] = fullpath
+        return response
+
+    byte_range = _byte_range(request.META.get('HTTP_RANGE'), size) if _if_range_matches(request, etag, mtime) else None
+    if byte_range is False:
+        response = HttpResponse(status=416, headers=headers)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is not None:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(fullpath, start, end - start + 1), status=206, content_type=content_type, headers=headers,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        return response
+
+    response = FileResponse(open(fullpath, 'rb'), content_type=content_type, headers=headers)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
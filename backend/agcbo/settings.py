@@ -2,6 +2,7 @@
 Django settings for agcbo project.
 """
 
+import importlib.util
 from pathlib import Path
 from datetime import timedelta
 
@@ -20,19 +21,14 @@ try:
 except Exception:
     from decouple import config
 
-# Cloudinary: only enable when package is installed AND credentials are set
-CLOUDINARY_AVAILABLE = False
-try:
-    import cloudinary
-    import cloudinary.uploader
-    import cloudinary.api
-    _cn = config('CLOUDINARY_CLOUD_NAME', default='')
-    _key = config('CLOUDINARY_API_KEY', default='')
-    _secret = config('CLOUDINARY_API_SECRET', default='')
-    if _cn.strip() and _key.strip() and _secret.strip():
-        CLOUDINARY_AVAILABLE = True
-except ImportError:
-    pass
+# Cloudinary: only enable when package is installed AND credentials are set. The package is
+# not imported here: cloudinary_storage configures it from CLOUDINARY_STORAGE on first use.
+_cn = config('CLOUDINARY_CLOUD_NAME', default='')
+_key = config('CLOUDINARY_API_KEY', default='')
+_secret = config('CLOUDINARY_API_SECRET', default='')
+CLOUDINARY_AVAILABLE = bool(
+    _cn.strip() and _key.strip() and _secret.strip() and importlib.util.find_spec('cloudinary') is not None
+)
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-this-in-production')
@@ -82,6 +78,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.AuditContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -131,6 +128,36 @@ try:
 except Exception:
     pass  # keep sqlite default
 
+# Cache: per-process memory by default; set CACHE_URL (e.g. redis://localhost:6379/1) to share
+# cached settings/pages between WSGI workers. The version numbers that invalidate them
+# (core.cache, 'versions') are always shared: without CACHE_URL they are kept in files under
+# CACHE_VERSIONS_DIR, so a save in one worker invalidates the cached copies in every worker.
+_cache_url = (config('CACHE_URL', default='') or '').strip()
+if _cache_url.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _cache_url,
+        },
+        'versions': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _cache_url,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'agcbo',
+        },
+        'versions': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_VERSIONS_DIR', default=str(BASE_DIR / 'var' / 'cache-versions')),
+        },
+    }
+# Seconds anonymous public pages stay cached (invalidated early when their models change); 0 disables
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)
+
 # Custom User Model
 AUTH_USER_MODEL = 'core.User'
 
@@ -163,26 +190,31 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Media files (uploaded logos, images, videos) – use absolute path so serving works from any CWD
 MEDIA_URL = '/media/'
 MEDIA_ROOT = (BASE_DIR / 'media').resolve()
+# Seconds browsers may reuse /media/ files before revalidating (content-hashed names are cached for a year)
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=3600, cast=int)
+# Hand /media/ files to the front proxy: 'nginx' (X-Accel-Redirect to an internal location at
+# MEDIA_ACCEL_PREFIX that aliases MEDIA_ROOT) or 'apache' (X-Sendfile); empty serves them from Django
+MEDIA_ACCEL = config('MEDIA_ACCEL', default='')
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+
+# Store local uploads content-addressed and deduplicated (core.storage.ContentAddressedStorage)
+MEDIA_CONTENT_ADDRESSED = config('MEDIA_CONTENT_ADDRESSED', default=True, cast=bool)
 
 # Cloudinary settings (only when all credentials are set). Django 4.2+ uses STORAGES only (not DEFAULT_FILE_STORAGE).
 if CLOUDINARY_AVAILABLE:
     CLOUDINARY_STORAGE = {
-        'CLOUD_NAME': config('CLOUDINARY_CLOUD_NAME', default=''),
-        'API_KEY': config('CLOUDINARY_API_KEY', default=''),
-        'API_SECRET': config('CLOUDINARY_API_SECRET', default=''),
+        'CLOUD_NAME': _cn,
+        'API_KEY': _key,
+        'API_SECRET': _secret,
     }
-    cloudinary.config(
-        cloud_name=config('CLOUDINARY_CLOUD_NAME', default=''),
-        api_key=config('CLOUDINARY_API_KEY', default=''),
-        api_secret=config('CLOUDINARY_API_SECRET', default='')
-    )
     STORAGES = {
         'default': {'BACKEND': 'cloudinary_storage.storage.MediaCloudinaryStorage'},
         'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
     }
 else:
     STORAGES = {
-        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'default': {'BACKEND': 'core.storage.ContentAddressedStorage' if MEDIA_CONTENT_ADDRESSED
+                    else 'django.core.files.storage.FileSystemStorage'},
         'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
     }
 
@@ -193,7 +225,6 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 SITE_ID = 1
 
 # REST Framework (don't import JWTAuthentication here - Django app registry not ready yet)
-import importlib.util
 JWT_AVAILABLE = importlib.util.find_spec('rest_framework_simplejwt') is not None
 
 REST_FRAMEWORK = {
@@ -234,6 +265,8 @@ CORS_ALLOWED_ORIGINS = config(
 )
 
 CORS_ALLOW_CREDENTIALS = True
+# Let browser clients read the keyset paginator's optional total (core.pagination)
+CORS_EXPOSE_HEADERS = ['X-Estimated-Count']
 
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
@@ -243,6 +276,28 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Responsive image renditions (core.images): widths generated for uploaded images, in WebP and JPEG.
+# Set IMAGE_RENDITIONS_ASYNC to generate them in a Celery task instead of right after the upload.
+IMAGE_RENDITION_WIDTHS = [320, 640, 1024, 1600]
+IMAGE_RENDITIONS_ASYNC = config('IMAGE_RENDITIONS_ASYNC', default=False, cast=bool)
+
+# Bulk approvals (core.approvals): set BULK_APPROVALS_ASYNC to run large batches and the
+# notification emails in Celery; their progress is kept in ApprovalJob rows for the status page.
+BULK_APPROVALS_ASYNC = config('BULK_APPROVALS_ASYNC', default=False, cast=bool)
+
+# Audit log writer (core.audit): entries are buffered per process and written in batches of
+# AUDIT_BATCH_SIZE, or after AUDIT_FLUSH_INTERVAL seconds or the request; until then they are
+# kept in spool files under AUDIT_SPOOL_DIR (must be writable and survive worker restarts).
+AUDIT_SPOOL_DIR = config('AUDIT_SPOOL_DIR', default=str(BASE_DIR / 'var' / 'audit'))
+AUDIT_BATCH_SIZE = config('AUDIT_BATCH_SIZE', default=100, cast=int)
+AUDIT_FLUSH_INTERVAL = config('AUDIT_FLUSH_INTERVAL', default=5, cast=float)
+
+# Audit log retention (core.audit_archive): archive_audit_log moves entries older than
+# AUDIT_RETENTION_DAYS into monthly gzip JSON-lines files under AUDIT_ARCHIVE_DIR. Keep that
+# directory outside MEDIA_ROOT, which is served publicly.
+AUDIT_RETENTION_DAYS = config('AUDIT_RETENTION_DAYS', default=365, cast=int)
+AUDIT_ARCHIVE_DIR = config('AUDIT_ARCHIVE_DIR', default=str(BASE_DIR / 'var' / 'audit-archive'))
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
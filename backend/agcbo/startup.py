@@ -0,0 +1,56 @@
+"""
+Cold-start instrumentation: how long Django setup spends importing the
+settings module and each app's models module, and the rest of setup (app
+configs and ready() hooks). The profile_startup command adds the URLconf and
+a per-module breakdown from python -X importtime.
+
+Set STARTUP_TIMING=1 in a WSGI worker's environment to log the breakdown to
+stderr when it boots.
+"""
+import importlib
+import time
+
+import django
+from django.apps import AppConfig
+from django.conf import settings
+
+
+def timed_setup():
+    """Run django.setup() and return [(phase, seconds)], slowest models modules first."""
+    start = time.perf_counter()
+    settings.INSTALLED_APPS  # first access imports the settings module
+    settings_seconds = time.perf_counter() - start
+
+    models = []
+    original = AppConfig.import_models
+
+    def timed_import_models(self):
+        began = time.perf_counter()
+        original(self)
+        models.append((f'{self.name}.models', time.perf_counter() - began))
+
+    AppConfig.import_models = timed_import_models
+    try:
+        django.setup(set_prefix=False)
+    finally:
+        AppConfig.import_models = original
+    total = time.perf_counter() - start
+
+    rows = [(settings.SETTINGS_MODULE, settings_seconds)]
+    rows += sorted(models, key=lambda row: row[1], reverse=True)
+    rows.append(('app configs and ready()', total - settings_seconds - sum(s for _, s in models)))
+    rows.append(('total', total))
+    return rows
+
+
+def timed_import(module):
+    """Import module (e.g. the ROOT_URLCONF) and return (module, seconds)."""
+    start = time.perf_counter()
+    importlib.import_module(module)
+    return module, time.perf_counter() - start
+
+
+def format_report(rows):
+    width = max(len(name) for name, _ in rows)
+    lines = [f'{name:<{width}}  {seconds * 1000:8.1f} ms' for name, seconds in rows]
+    return 'Django startup:\n' + '\n'.join(f'  {line}' for line in lines) + '\n'
@@ -5,6 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from core.views import site_search
 from .api_root import api_root
 from .media_views import serve_media
 
@@ -22,6 +23,7 @@ urlpatterns = [
     path('', include('pages.urls', namespace='pages')),
     path('manage/', include('pages.manage_urls', namespace='manage')),
     path('api/', api_root, name='api-root'),
+    path('api/search/', site_search, name='api-search'),
     path('api/auth/', include('core.urls')),
     path('api/members/', include('members.urls')),
     path('api/projects/', include('projects.urls')),
@@ -3,9 +3,15 @@ WSGI config for agcbo project.
 """
 
 import os
+import sys
 
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'agcbo.settings')
 
+if os.environ.get('STARTUP_TIMING'):
+    # Log where cold-start time goes (settings, models modules, ready hooks)
+    from agcbo.startup import format_report, timed_setup
+    sys.stderr.write(format_report(timed_setup()))
+
 application = get_wsgi_application()
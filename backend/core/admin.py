@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, AuditLog, Constituency, Ward, SiteSettings, Official, YouthJob, AboutPage, SectionStyle, SectionSlide
+from . import counters
+from .models import User, AuditLog, Constituency, Ward, SiteSettings, SiteCounter, MediaBlob, Official, YouthJob, AboutPage, SectionStyle, SectionSlide
 
 
 @admin.register(Constituency)
@@ -37,6 +38,28 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(SiteCounter)
+class SiteCounterAdmin(admin.ModelAdmin):
+    list_display = ['key', 'value', 'updated_at']
+    readonly_fields = ['key', 'value', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'refcount', 'created_at']
+    search_fields = ['name', 'sha256']
+    readonly_fields = ['name', 'sha256', 'size', 'refcount', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ['username', 'get_full_name_display', 'email', 'phone_number', 'ward_display', 'role', 'is_approved', 'is_active', 'created_at']
@@ -69,11 +92,13 @@ class UserAdmin(BaseUserAdmin):
     @admin.action(description='Approve selected members')
     def approve_members(self, request, queryset):
         updated = queryset.filter(role='member').update(is_approved=True)
+        counters.recount(*counters.keys_for_model(User))
         self.message_user(request, f'{updated} member(s) approved.')
 
     @admin.action(description='Reject / unapprove selected')
     def reject_members(self, request, queryset):
         updated = queryset.update(is_approved=False)
+        counters.recount(*counters.keys_for_model(User))
         self.message_user(request, f'{updated} user(s) unapproved.')
 
 
@@ -0,0 +1,167 @@
+"""
+Bulk approval of member, donor and county official accounts.
+
+DECISIONS maps a role and decision to the flag it sets. select() finds the
+users a decision would change (approving touches pending users, rejecting
+approved ones), by ticked ids and/or ward, constituency and registration date.
+apply() changes them CHUNK_SIZE at a time: per chunk one locking SELECT of the
+users still to change, one UPDATE and one bulk_create of their AuditLog rows,
+so a typical selection is a single UPDATE. Queryset updates skip the save
+signals, so the user counters are recounted once at the end.
+
+run() starts a job, recorded as an ApprovalJob row: larger selections go to
+Celery when BULK_APPROVALS_ASYNC is set, everything else runs in the request.
+The row holds the job's progress (job_status()), so the manage status page can
+follow a Celery job from any worker. Notification emails go out after the
+updates, over one SMTP connection, in a Celery task if enabled.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import get_connection, send_mass_mail
+from django.db import transaction
+from django.utils import timezone
+
+from . import counters
+from .models import ApprovalJob, AuditLog, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+DECISIONS = {
+    # (role, decision): (flag, value, AuditLog action)
+    ('member', 'approve'): ('is_approved', True, 'approve'),
+    ('member', 'reject'): ('is_approved', False, 'reject'),
+    ('donor', 'approve'): ('is_approved', True, 'approve'),
+    ('donor', 'reject'): ('is_approved', False, 'reject'),
+    ('county_official', 'verify'): ('is_verified', True, 'verify'),
+    ('county_official', 'reject'): ('is_verified', False, 'reject'),
+}
+NOTIFICATIONS = {
+    # AuditLog action: (subject, body); formatted with name and site
+    'approve': ('Your {site} account has been approved', 'Hello {name},\n\nYour {site} account has been approved. You can now log in.\n'),
+    'verify': ('Your {site} account has been verified', 'Hello {name},\n\nYour {site} county official account has been verified. You can now log in.\n'),
+    'reject': ('Your {site} account status has changed', 'Hello {name},\n\nYour {site} account is no longer approved. Please contact us if you think this is a mistake.\n'),
+}
+CHUNK_SIZE = 1000
+JOB_RETENTION = timedelta(days=1)
+
+
+def decisions_for(role):
+    return [decision for (r, decision) in DECISIONS if r == role]
+
+
+def select(role, decision, ids=None, ward=None, constituency=None, joined_from=None, joined_to=None):
+    """Users of role that decision would change, narrowed to ids and the given filters."""
+    flag, value, _ = DECISIONS[(role, decision)]
+    users = get_user_model().objects.filter(role=role, **{flag: not value})
+    if ids is not None:
+        users = users.filter(pk__in=ids)
+    if ward is not None:
+        users = users.filter(ward=ward)
+    if constituency is not None:
+        users = users.filter(ward__constituency=constituency)
+    if joined_from is not None:
+        users = users.filter(date_joined__date__gte=joined_from)
+    if joined_to is not None:
+        users = users.filter(date_joined__date__lte=joined_to)
+    return users
+
+
+# ---------- Jobs ----------
+
+JOB_FIELDS = ('role', 'decision', 'total', 'done', 'changed', 'finished')
+
+
+def job_status(job_id):
+    """{'role', 'decision', 'total', 'done', 'changed', 'finished'} of a job, or None if unknown or expired."""
+    return ApprovalJob.objects.filter(pk=job_id).values(*JOB_FIELDS).first()
+
+
+def run(role, decision, user_ids, actor=None, ip_address=None):
+    """Start a job applying decision to user_ids; returns its ApprovalJob (finished unless queued)."""
+    ApprovalJob.objects.filter(finished=True, updated_at__lt=timezone.now() - JOB_RETENTION).delete()
+    job = ApprovalJob.objects.create(role=role, decision=decision, total=len(user_ids))
+    args = (role, decision, list(user_ids), getattr(actor, 'pk', None), ip_address, str(job.pk))
+    if settings.BULK_APPROVALS_ASYNC and len(user_ids) > CHUNK_SIZE:
+        try:
+            from .tasks import bulk_approval
+            bulk_approval.delay(*args)
+            return job
+        except Exception:
+            logger.warning('Could not queue bulk %s of %d users; running it now', decision, len(user_ids), exc_info=True)
+    apply(*args)
+    job.refresh_from_db()
+    return job
+
+
+def apply(role, decision, user_ids, actor_id=None, ip_address=None, job_id=None):
+    """Apply decision to user_ids (the job body); returns the number of users changed."""
+    flag, value, action = DECISIONS[(role, decision)]
+    User = get_user_model()
+    changed = []
+    for start in range(0, len(user_ids), CHUNK_SIZE):
+        with transaction.atomic():
+            rows = list(
+                User.objects.select_for_update()
+                .filter(pk__in=user_ids[start:start + CHUNK_SIZE], role=role, **{flag: not value})
+                .values_list('pk', 'username')
+            )
+            if rows:
+                pks = [pk for pk, _ in rows]
+                User.objects.filter(pk__in=pks).update(**{flag: value, 'updated_at': timezone.now()})
+                AuditLog.objects.bulk_create([
+                    AuditLog(user_id=actor_id, action=action, model_name='User', object_id=str(pk),
+                             object_repr=username, changes={flag: [not value, value]}, ip_address=ip_address)
+                    for pk, username in rows
+                ], batch_size=CHUNK_SIZE)
+                changed += pks
+        if job_id:
+            ApprovalJob.objects.filter(pk=job_id).update(
+                done=min(start + CHUNK_SIZE, len(user_ids)), changed=len(changed), updated_at=timezone.now(),
+            )
+
+    if changed:
+        counters.recount(*counters.keys_for_model(User))
+        schedule_notifications(changed, action)
+    if job_id:
+        ApprovalJob.objects.filter(pk=job_id).update(
+            done=len(user_ids), changed=len(changed), finished=True, updated_at=timezone.now(),
+        )
+    return len(changed)
+
+
+# ---------- Notifications ----------
+
+def schedule_notifications(user_ids, action):
+    """Email the users about the decision: in Celery if enabled and reachable, else now."""
+    if settings.BULK_APPROVALS_ASYNC:
+        try:
+            from .tasks import send_approval_notifications
+            send_approval_notifications.delay(list(user_ids), action)
+            return
+        except Exception:
+            logger.warning('Could not queue %d approval notifications; sending them now', len(user_ids), exc_info=True)
+    try:
+        send_notifications(user_ids, action)
+    except Exception:
+        # The decisions are committed; a mail server outage must not undo or fail them
+        logger.exception('Sending %d approval notifications failed', len(user_ids))
+
+
+def send_notifications(user_ids, action):
+    """Send the notification for action to each of user_ids with an email address; returns the number sent."""
+    subject, body = NOTIFICATIONS[action]
+    site = SiteSettings.load().site_name
+    users = (
+        get_user_model().objects.filter(pk__in=user_ids).exclude(email='')
+        .values_list('email', 'first_name', 'username')
+    )
+    messages = [
+        (subject.format(site=site), body.format(site=site, name=first_name or username), None, [email])
+        for email, first_name, username in users.iterator()
+    ]
+    if not messages:
+        return 0
+    return send_mass_mail(messages, fail_silently=False, connection=get_connection())
@@ -0,0 +1,229 @@
+"""
+Buffered AuditLog writer.
+
+record() takes the same arguments as AuditLog.objects.create() but only
+appends the entry to a per-process buffer, so an admin action costs no
+database write. Inside a transaction the entry is appended once it commits, so
+a rolled-back action is not logged. The buffer is written with one bulk_create when it reaches
+AUDIT_BATCH_SIZE entries, when its oldest entry is AUDIT_FLUSH_INTERVAL
+seconds old, after each request has been sent (request_finished, see
+core.signals) and at interpreter exit, but never inside a transaction.
+
+Entries are durable before they are buffered: each one is also appended to
+this process's spool file in AUDIT_SPOOL_DIR (JSON lines, flushed to the OS
+on every write). A flush starts a new spool file and deletes the old one once
+its entries are committed. A spool file is locked while its process uses it,
+so any spool file that can be locked belongs to a process that died or failed
+to flush; recover() inserts and deletes those files (each process runs it on
+its first flush; the flush_audit_log command runs it on demand). Every entry
+has a unique entry_id, and inserts skip ids already stored, so an entry
+replayed from a spool file is never logged twice.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; open spool files can't be deleted there anyway
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _lock(f):
+    """Take the spool file lock without waiting; False if another process holds it."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def client_ip(request):
+    """The client's address: the first X-Forwarded-For hop if set, else REMOTE_ADDR."""
+    xff = request.META.get('HTTP_X_FORWARDED_FOR')
+    if xff:
+        return xff.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def _to_row(entry):
+    entry = dict(entry)
+    entry['timestamp'] = parse_datetime(entry['timestamp'])
+    entry['entry_id'] = uuid.UUID(entry['entry_id'])
+    return AuditLog(**entry)
+
+
+def _insert(entries):
+    """Insert entries, skipping ones already stored (by entry_id)."""
+    rows = [_to_row(e) for e in entries]
+    try:
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    except IntegrityError:
+        # An acting user deleted before the flush breaks the foreign key: keep the entry without them
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    AuditLog.objects.bulk_create([row], ignore_conflicts=True)
+            except IntegrityError:
+                row.user_id = None
+                AuditLog.objects.bulk_create([row], ignore_conflicts=True)
+
+
+class AuditBuffer:
+    def __init__(self, spool_dir, batch_size, flush_interval):
+        self.spool_dir = Path(spool_dir)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.entries = []
+        self.oldest = None
+        self.spool = self.spool_path = None
+        self.recovered = False
+        self.lock = threading.Lock()
+
+    def _open_spool(self):
+        """Create, lock, then publish a new spool file (a recoverer never sees it unlocked)."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        name = f'audit-{os.getpid()}-{uuid.uuid4().hex}'
+        pending = self.spool_dir / f'{name}.tmp'
+        f = open(pending, 'a', encoding='utf-8')
+        _lock(f)
+        path = self.spool_dir / f'{name}.jsonl'
+        os.replace(pending, path)
+        return f, path
+
+    def record(self, user=None, action='', model_name='', object_id='', object_repr='', changes=None,
+               ip_address=None, user_id=None):
+        entry = {
+            'user_id': getattr(user, 'pk', user) if user is not None else user_id,
+            'action': action,
+            'model_name': model_name,
+            'object_id': str(object_id),
+            'object_repr': str(object_repr)[:200],
+            'changes': changes or {},
+            'ip_address': ip_address,
+            'timestamp': timezone.now().isoformat(),
+            'entry_id': uuid.uuid4().hex,
+        }
+        if transaction.get_connection().in_atomic_block:
+            # Spooled and buffered only if the caller's transaction commits: a rollback logs nothing
+            transaction.on_commit(lambda: self._append(entry))
+        else:
+            self._append(entry)
+
+    def _append(self, entry):
+        with self.lock:
+            if self.spool is None:
+                self.spool, self.spool_path = self._open_spool()
+            self.spool.write(json.dumps(entry) + '\n')
+            self.spool.flush()
+            self.entries.append(entry)
+            if self.oldest is None:
+                self.oldest = time.monotonic()
+            due = len(self.entries) >= self.batch_size or time.monotonic() - self.oldest >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered entries in one bulk_create; returns how many were written."""
+        if transaction.get_connection().in_atomic_block:
+            # Inside someone's transaction a rollback would take the entries with it: wait for the next flush
+            return 0
+        with self.lock:
+            entries, spool, path = self.entries, self.spool, self.spool_path
+            self.entries, self.spool, self.spool_path, self.oldest = [], None, None, None
+            pending_recovery = not self.recovered
+            self.recovered = True
+        if spool is not None:
+            spool.close()  # releases the lock: if the insert fails, any recover() picks the file up
+        written = 0
+        if entries:
+            try:
+                _insert(entries)
+                written = len(entries)
+            except DatabaseError:
+                logger.exception('Writing %d audit entries failed; they stay in %s', len(entries), path)
+                self.recovered = pending_recovery = False  # retry the file on a later flush
+            else:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # a concurrent recover() already replayed it
+        if pending_recovery:
+            self.recover()
+        return written
+
+    def recover(self):
+        """Insert and delete the spool files of processes that died or failed to flush; returns the entry count."""
+        if not self.spool_dir.is_dir():
+            return 0
+        recovered = 0
+        for path in sorted(self.spool_dir.glob('audit-*.jsonl')):
+            if path == self.spool_path:
+                continue
+            try:
+                f = open(path, 'r+', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            with f:
+                if not _lock(f):
+                    continue  # its process is alive and still using it
+                entries = []
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        logger.warning('Skipping a truncated audit entry in %s', path)
+                try:
+                    if entries:
+                        _insert(entries)
+                    os.remove(path)
+                except (DatabaseError, OSError):
+                    logger.exception('Recovering audit entries from %s failed', path)
+                    continue
+                recovered += len(entries)
+        return recovered
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AuditBuffer(settings.AUDIT_SPOOL_DIR, settings.AUDIT_BATCH_SIZE, settings.AUDIT_FLUSH_INTERVAL)
+                atexit.register(_buffer.flush)
+    return _buffer
+
+
+def record(**entry):
+    """Log an admin action (AuditLog.objects.create() arguments); it is written in the next batch."""
+    get_buffer().record(**entry)
+
+
+def flush():
+    """Write this process's buffered entries now (e.g. before reading the log back)."""
+    return _buffer.flush() if _buffer is not None else 0
+
+
+def recover():
+    return get_buffer().recover()
@@ -0,0 +1,159 @@
+"""
+AuditLog retention: archive old entries to compressed monthly files.
+
+archive() moves entries older than AUDIT_RETENTION_DAYS out of the AuditLog
+table into AUDIT_ARCHIVE_DIR, one gzip file of JSON lines per month (by local
+time): auditlog-2025-01.jsonl.gz holds January 2025, oldest entry first. It
+works CHUNK_SIZE entries at a time, oldest first along the timestamp index: each
+chunk is appended to its months' files as a new gzip member and synced to disk,
+then its rows are deleted in the same transaction, so the table and its indexes
+only ever hold the retention window. An interrupted run leaves at most one
+chunk in both places; search() skips such repeats (every line carries the
+entry's id).
+
+search() streams the archive: it opens only the months in the requested
+period, reads one line at a time and parses only lines that contain the values
+being looked for, so memory use doesn't depend on the archive's size.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs aren't serialised; don't start two at once
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+FIELDS = ('id', 'entry_id', 'timestamp', 'user_id', 'action', 'model_name', 'object_id', 'object_repr',
+          'changes', 'ip_address')
+FILE_RE = re.compile(r'^auditlog-(\d{4})-(\d{2})\.jsonl\.gz$')
+
+
+class ArchiveBusy(Exception):
+    """Another archive() run holds the archive directory."""
+
+
+def archive_dir():
+    return Path(settings.AUDIT_ARCHIVE_DIR)
+
+
+def path_for(month):
+    """The archive file of the month (a date in it)."""
+    return archive_dir() / f'auditlog-{month:%Y-%m}.jsonl.gz'
+
+
+def archived_months(since=None, until=None):
+    """(first day of month, path) of each archive file, oldest first, limited to months overlapping [since, until)."""
+    if not archive_dir().is_dir():
+        return []
+    first = timezone.localtime(since).date().replace(day=1) if since else None
+    last = timezone.localtime(until).date() if until else None
+    months = []
+    for path in archive_dir().iterdir():
+        match = FILE_RE.match(path.name)
+        if not match:
+            continue
+        month = date(int(match[1]), int(match[2]), 1)
+        if (first is None or month >= first) and (last is None or month <= last):
+            months.append((month, path))
+    return sorted(months)
+
+
+@contextmanager
+def _exclusive(directory):
+    """Hold the archive directory's lock file (one archive() run at a time)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / '.lock', 'w') as f:
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise ArchiveBusy(f'Another audit log archive run holds {directory / ".lock"}') from None
+        yield
+
+
+def _line(row):
+    row = dict(row, timestamp=row['timestamp'].isoformat(), entry_id=row['entry_id'] and row['entry_id'].hex)
+    return json.dumps(row) + '\n'
+
+
+def _append(path, lines):
+    """Append lines to path as one gzip member and sync it; a failed write is cut off again."""
+    data = gzip.compress(''.join(lines).encode('utf-8'))
+    with open(path, 'ab') as f:
+        size = f.tell()
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.truncate(size)
+            raise
+
+
+def archive(cutoff=None, chunk_size=CHUNK_SIZE):
+    """Move entries older than cutoff (default: the retention period) to the archive; returns {month: count}."""
+    if cutoff is None:
+        cutoff = timezone.now() - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+    old = AuditLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp', 'id')
+    archived = defaultdict(int)
+    with _exclusive(archive_dir()):
+        while True:
+            with transaction.atomic():
+                rows = list(old.values(*FIELDS)[:chunk_size])
+                if not rows:
+                    break
+                by_month = defaultdict(list)
+                for row in rows:
+                    by_month[timezone.localtime(row['timestamp']).date().replace(day=1)].append(_line(row))
+                AuditLog.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+                for month, lines in sorted(by_month.items()):
+                    _append(path_for(month), lines)
+                    archived[month] += len(lines)
+    return dict(archived)
+
+
+def search(user_id=None, model_name=None, object_id=None, since=None, until=None):
+    """Yield the archived entries (dicts, oldest first) matching every given filter; since/until bound the timestamp."""
+    wanted = {
+        name: value for name, value in (
+            ('user_id', user_id), ('model_name', model_name),
+            ('object_id', None if object_id is None else str(object_id)),
+        ) if value is not None
+    }
+    # How each value appears in a line (json.dumps of the entry); lines without them aren't parsed
+    needles = [json.dumps({name: value})[1:-1] for name, value in wanted.items()]
+    for _, path in archived_months(since, until):
+        seen = set()
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if not all(needle in line for needle in needles):
+                        continue
+                    entry = json.loads(line)
+                    if entry['id'] in seen or any(entry[name] != value for name, value in wanted.items()):
+                        continue
+                    entry['timestamp'] = parse_datetime(entry['timestamp'])
+                    if (since and entry['timestamp'] < since) or (until and entry['timestamp'] >= until):
+                        continue
+                    seen.add(entry['id'])
+                    yield entry
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            logger.warning('%s ends in an incomplete write; the entries after it are skipped', path)
@@ -0,0 +1,85 @@
+"""
+Versioned cache for data that is read on every public render.
+
+Each tracked model has a version number stored in the 'versions' cache, which
+every worker shares (files when no CACHE_URL is set); saving or deleting a row
+bumps it (see core.signals). Cached values live under keys that
+embed the versions of the models they were built from, so a bump makes stale
+entries unreachable without having to find and delete them. A small per-process
+memo sits in front of the Django cache, so a warm hit costs one get_many for
+the version numbers and no database queries.
+"""
+import time
+
+from django.core.cache import cache, caches
+
+KEY_PREFIX = 'agcbo'
+VERSIONS_CACHE = 'versions'
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+_MISSING = object()
+_tracked = set()
+_local = {}
+
+
+def model_label(model):
+    """'app_label.modelname' for a model class, instance or label string."""
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def track(*models):
+    """Register models whose saves/deletes should bump their cache version."""
+    for model in models:
+        _tracked.add(model_label(model))
+
+
+def is_tracked(model):
+    return model_label(model) in _tracked
+
+
+def _version_key(label):
+    return f'{KEY_PREFIX}:version:{label}'
+
+
+def get_versions(*models):
+    """Return the current version of each model (creating missing ones) as a tuple."""
+    labels = [model_label(m) for m in models]
+    keys = [_version_key(label) for label in labels]
+    versions_cache = caches[VERSIONS_CACHE]
+    found = versions_cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not versions_cache.add(key, version, None):
+                version = versions_cache.get(key, version)
+        versions.append(version)
+    return tuple(versions)
+
+
+def bump(*models):
+    """Invalidate everything cached from these models by giving them a new version."""
+    version = time.time_ns()
+    caches[VERSIONS_CACHE].set_many({_version_key(model_label(m)): version for m in models}, None)
+
+
+def cached(name, loader, depends_on, timeout=DEFAULT_TIMEOUT):
+    """
+    Return loader() cached under name for as long as none of the depends_on
+    models has changed. Values are kept in the Django cache (shared between
+    workers when a shared backend is configured) and memoised per process.
+    """
+    versions = get_versions(*depends_on)
+    hit = _local.get(name)
+    if hit is not None and hit[0] == versions:
+        return hit[1]
+    key = f'{KEY_PREFIX}:{name}:' + '.'.join(str(v) for v in versions)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        cache.set(key, value, timeout)
+    _local[name] = (versions, value)
+    return value
@@ -0,0 +1,156 @@
+"""
+Field-level change capture for AuditLog.changes.
+
+Every instance of a model in TRACKED remembers the values of its tracked
+fields as it is loaded (post_init, from the row the query already fetched, so
+no SELECT is added before an UPDATE). After a save, diff() compares them with
+the saved values and the signals (core.signals) log one AuditLog entry (through
+core.audit, so batched, and only once the save commits) holding only the fields
+that changed, as {field: [old, new]}; a create logs the fields it set, as
+[None, value]. A save that changes no tracked field, or is rolled back, logs
+nothing, so last_login updates and the like stay out of the log.
+
+Tracked fields are a model's concrete fields except its primary key,
+auto_now / auto_now_add timestamps and the fields TRACKED excludes; SECRET
+fields (passwords, ID numbers, contact details) are logged as changed without
+their values, so the log and its archive hold no personal data. A field that was deferred
+when the instance was loaded has no old value and is left out of the diff.
+
+The entry's user and IP address come from the request being served
+(AuditContextMiddleware); saves outside a request are logged without them.
+Views that save for a named reason, such as approving a member, wrap the save
+in action('approve') so the entry says so instead of 'update'.
+"""
+import copy
+import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.apps import apps
+from django.db import models
+
+from .audit import client_ip
+
+# label: fields never logged (besides the primary key and auto timestamps)
+TRACKED = {
+    'core.User': ('last_login', 'last_login_ip'),
+    'projects.Project': (),
+    'events.Event': ('seats_taken', 'waitlist_issued'),  # counters maintained by queryset updates
+    'funding.Donation': (),
+    'core.SiteSettings': (),
+}
+# label: fields logged as changed, never with their values
+SECRET = {
+    'core.User': frozenset({'password', 'id_or_passport_number', 'full_names_as_on_id', 'phone_number', 'email'}),
+    'funding.Donation': frozenset({'donor_email', 'donor_phone'}),
+}
+MASK = '********'
+
+_request = ContextVar('audit_request', default=None)
+_action = ContextVar('audit_action', default=None)
+
+
+def tracked_models():
+    return [apps.get_model(label) for label in TRACKED]
+
+
+@lru_cache(maxsize=None)
+def tracked_fields(model):
+    """(name, attname, is_file, is_json, is_secret) of each tracked field of model; empty if model isn't tracked."""
+    label = model._meta.concrete_model._meta.label
+    excluded = TRACKED.get(label)
+    if excluded is None:
+        return ()
+    secret = SECRET.get(label, ())
+    return tuple(
+        (f.name, f.attname, isinstance(f, models.FileField), isinstance(f, models.JSONField), f.name in secret)
+        for f in model._meta.concrete_fields
+        if not f.primary_key and f.name not in excluded
+        and not getattr(f, 'auto_now', False) and not getattr(f, 'auto_now_add', False)
+    )
+
+
+def _value(value, is_file, is_json):
+    if is_file:
+        return getattr(value, 'name', value) or ''
+    if is_json and isinstance(value, (dict, list)):
+        return copy.deepcopy(value)  # edited in place, it would otherwise change the snapshot too
+    return value
+
+
+def snapshot(instance):
+    """Remember the tracked values instance holds now (deferred fields are skipped)."""
+    loaded = instance.__dict__
+    instance._tracked_values = {
+        attname: _value(loaded[attname], is_file, is_json)
+        for _, attname, is_file, is_json, _ in tracked_fields(type(instance)) if attname in loaded
+    }
+
+
+def _plain(value):
+    """value as JSON: dates as ISO 8601, decimals, UUIDs and the like as strings."""
+    if value is None or isinstance(value, (str, bool, int, float, dict, list)):
+        return value
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def diff(instance, created=False, update_fields=None):
+    """{field: [old, new]} of the tracked fields the save of instance changed (JSON-ready)."""
+    loaded = instance.__dict__
+    before = loaded.get('_tracked_values', {})
+    changes = {}
+    for name, attname, is_file, is_json, is_secret in tracked_fields(type(instance)):
+        if update_fields is not None and name not in update_fields and attname not in update_fields:
+            continue
+        if attname not in loaded:
+            continue
+        new = _value(loaded[attname], is_file, is_json)
+        if created:
+            if new is None or new == '':
+                continue
+            old = None
+        elif attname not in before or before[attname] == new:
+            continue
+        else:
+            old = before[attname]
+        changes[name] = [old and MASK, new and MASK] if is_secret else [_plain(old), _plain(new)]
+    return changes
+
+
+# ---------- Request context ----------
+
+@contextmanager
+def acting(request):
+    """Attribute the changes saved inside the block to request's user and IP address."""
+    token = _request.set(request)
+    try:
+        yield
+    finally:
+        _request.reset(token)
+
+
+@contextmanager
+def action(name):
+    """Log the changes saved inside the block under action name (e.g. 'approve') instead of create/update."""
+    token = _action.set(name)
+    try:
+        yield
+    finally:
+        _action.reset(token)
+
+
+def current_action(created):
+    return _action.get() or ('create' if created else 'update')
+
+
+def current_actor():
+    """(user or None, IP address or None) of the request being served."""
+    request = _request.get()
+    if request is None:
+        return None, None
+    # Read at save time: DRF authenticates API requests after the middleware has run
+    user = getattr(request, 'user', None)
+    return (user if getattr(user, 'is_authenticated', False) else None), client_ip(request)
@@ -1,3 +1,6 @@
+from . import cache as site_cache
+
+
 def site_settings(request):
     try:
         from .models import SiteSettings
@@ -7,12 +10,17 @@ def site_settings(request):
     return {'site_settings': settings}
 
 
+def _load_section_styles():
+    from .models import SectionStyle
+    styles = SectionStyle.objects.filter(is_active=True).prefetch_related('slides').order_by('section_key')
+    return {s.section_key: s for s in styles}
+
+
 def section_styles(request):
-    """Load all active section styles keyed by section_key for template use."""
+    """Load all active section styles keyed by section_key for template use (cached until one changes)."""
     try:
-        from .models import SectionStyle
-        styles = SectionStyle.objects.filter(is_active=True).prefetch_related('slides').order_by('section_key')
-        by_key = {s.section_key: s for s in styles}
+        from .models import SectionStyle, SectionSlide
+        by_key = site_cache.cached('section_styles', _load_section_styles, depends_on=[SectionStyle, SectionSlide])
     except Exception:
         by_key = {}
     return {'section_styles': by_key}
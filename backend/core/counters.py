@@ -0,0 +1,104 @@
+"""
+Site-wide counters (home/about stats, manage dashboard) stored in SiteCounter.
+
+Readers get every counter in one query. Writers never touch the hot pages: when
+a model listed in COUNTERS is saved or deleted, core.signals recounts only the
+counters that depend on it, after the transaction commits. A recount writes
+only the counters whose value changed.
+"""
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import cache as site_cache
+from .models import SiteCounter
+
+
+def _approved_members():
+    User = apps.get_model('core', 'User')
+    return User.objects.filter(role='member', is_approved=True).count()
+
+
+def _pending_approvals():
+    User = apps.get_model('core', 'User')
+    return User.objects.filter(role='member', is_approved=False).count()
+
+
+def _communities():
+    """Wards with at least one approved member."""
+    Ward = apps.get_model('core', 'Ward')
+    return Ward.objects.annotate(
+        approved=Count('members', filter=Q(members__role='member', members__is_approved=True))
+    ).filter(approved__gt=0).count()
+
+
+def _public_projects():
+    return apps.get_model('projects', 'Project').objects.filter(is_public=True).count()
+
+
+def _published_events():
+    return apps.get_model('events', 'Event').objects.filter(is_published=True).count()
+
+
+def _gallery_items():
+    return apps.get_model('gallery', 'GalleryItem').objects.filter(is_public=True).count()
+
+
+def _published_officials():
+    return apps.get_model('core', 'Official').objects.filter(is_published=True).count()
+
+
+def _published_youth_jobs():
+    return apps.get_model('core', 'YouthJob').objects.filter(is_published=True).count()
+
+
+# key -> (count function, model labels whose writes can change it)
+COUNTERS = {
+    'approved_members': (_approved_members, ['core.user']),
+    'pending_approvals': (_pending_approvals, ['core.user']),
+    'communities': (_communities, ['core.user', 'core.ward']),
+    'public_projects': (_public_projects, ['projects.project']),
+    'published_events': (_published_events, ['events.event']),
+    'gallery_items': (_gallery_items, ['gallery.galleryitem']),
+    'published_officials': (_published_officials, ['core.official']),
+    'published_youth_jobs': (_published_youth_jobs, ['core.youthjob']),
+}
+
+# User fields that affect the member counters (saves touching only last_login etc. are skipped)
+USER_FIELDS = {'role', 'is_approved', 'ward', 'ward_id'}
+
+
+def keys_for_model(model):
+    label = model._meta.label_lower
+    return [key for key, (_, labels) in COUNTERS.items() if label in labels]
+
+
+def recount(*keys):
+    """
+    Recompute the given counters (all when none given) and store the ones that
+    changed. An unchanged value writes nothing, so it neither locks the row nor
+    bumps the SiteCounter cache version behind the home and about pages.
+    """
+    changed = False
+    for key in keys or COUNTERS:
+        count_fn, _ = COUNTERS[key]
+        value = count_fn()
+        if SiteCounter.objects.filter(key=key).exclude(value=value).update(value=value, updated_at=timezone.now()):
+            changed = True
+        else:
+            # Unchanged, or not stored yet (creating it bumps the cache through post_save)
+            SiteCounter.objects.get_or_create(key=key, defaults={'value': value})
+    if changed:
+        # update() sends no post_save, so bump the cache as core.signals would
+        transaction.on_commit(lambda: site_cache.bump(SiteCounter))
+
+
+def get_counts():
+    """All counters as a dict in a single query; missing ones are computed once."""
+    counts = dict(SiteCounter.objects.values_list('key', 'value'))
+    missing = [key for key in COUNTERS if key not in counts]
+    if missing:
+        recount(*missing)
+        counts.update(SiteCounter.objects.filter(key__in=missing).values_list('key', 'value'))
+    return counts
@@ -0,0 +1,144 @@
+"""
+Serializer-declared eager loading for API querysets.
+
+Nested serializer fields are discovered automatically: forward relations are
+joined with select_related, to-many relations become a Prefetch whose queryset
+is eager loaded for the nested serializer in turn. Serializers only declare
+what can't be discovered:
+
+    select_related_fields / prefetch_related_fields
+        relations read by plain fields, e.g. CharField(source='county.name')
+    annotate_queryset(queryset)   (classmethod)
+        annotations the serializer reads; annotations don't follow
+        select_related, so a nested serializer with this hook is prefetched
+    column_dependencies
+        {field name: columns} for fields that aren't model fields (properties,
+        SerializerMethodFields), e.g. {'skills_list': ('skills',)}
+
+Lookups follow the serializer instance, so relations dropped by ?fields= (see
+core.serializers.DynamicFieldsMixin) are not loaded, and with defer=True the
+columns no remaining field reads are deferred too. Serializers with a field
+whose columns can't be worked out keep loading every column.
+
+Viewsets using EagerLoadingMixin apply all of it in get_queryset(), so list
+endpoints run a fixed number of queries however many rows they render.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _prefixed(lookup, prefix):
+    if isinstance(lookup, Prefetch):
+        return Prefetch(prefix + lookup.prefetch_through, queryset=lookup.queryset, to_attr=lookup.to_attr)
+    return prefix + lookup
+
+
+def _lookup_path(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+
+def _related_model(model, source):
+    """Model reached by following source from model, or None if source isn't a relation."""
+    for name in source.split('.'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation:
+            return None
+        model = field.related_model
+    return model
+
+
+def unused_columns(serializer, model):
+    """
+    Plain (non-key, non-relation) columns of model that no field of serializer
+    reads; empty when some field's columns are unknown.
+    """
+    dependencies = getattr(serializer, 'column_dependencies', {})
+    needed = set()
+    for name, field in serializer.fields.items():
+        if name in dependencies:
+            needed.update(dependencies[name])
+            continue
+        source = field.source or name
+        if source == '*':
+            return []
+        try:
+            needed.add(model._meta.get_field(source.split('.')[0]).name)
+        except FieldDoesNotExist:
+            return []
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation and field.name not in needed
+    ]
+
+
+def eager_lookups(serializer, model, prefix='', defer=False):
+    """
+    (select_related, prefetch_related, deferred) lookups needed to render model
+    rows with serializer (an instance, so trimmed field sets are honoured).
+    """
+    select = [prefix + lookup for lookup in getattr(serializer, 'select_related_fields', ())]
+    prefetch = [_prefixed(lookup, prefix) for lookup in getattr(serializer, 'prefetch_related_fields', ())]
+    deferred = [prefix + column for column in unused_columns(serializer, model)] if defer else []
+    declared = {_lookup_path(lookup) for lookup in select + prefetch}
+
+    for name, field in serializer.fields.items():
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        source = field.source or name
+        if not isinstance(nested, serializers.ModelSerializer) or source == '*':
+            continue
+        related_model = _related_model(model, source)
+        path = prefix + source.replace('.', '__')
+        if related_model is None or path in declared:
+            continue
+        if many or hasattr(nested, 'annotate_queryset'):
+            queryset = setup_eager_loading(nested, related_model._default_manager.all(), defer=defer)
+            prefetch.append(Prefetch(path, queryset=queryset))
+        else:
+            select.append(path)
+            nested_select, nested_prefetch, nested_deferred = eager_lookups(nested, related_model, path + '__', defer)
+            select += nested_select
+            prefetch += nested_prefetch
+            deferred += nested_deferred
+    return select, prefetch, deferred
+
+
+def setup_eager_loading(serializer, queryset, defer=False):
+    """
+    Apply everything serializer (class or instance) reads to queryset:
+    annotations, joins and prefetches, plus deferring unread columns if defer.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if hasattr(serializer, 'annotate_queryset'):
+        queryset = serializer.annotate_queryset(queryset)
+    select, prefetch, deferred = eager_lookups(serializer, queryset.model, defer=defer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """
+    Viewset mixin: eager load get_queryset() for the serializer of the current
+    request (after ?fields= / ?expand=). Unread columns are deferred for reads
+    only, so writes still load and save whole rows.
+    Viewsets overriding get_queryset() must build on super().get_queryset().
+    """
+
+    def get_queryset(self):
+        return self.eager_load(super().get_queryset())
+
+    def eager_load(self, queryset):
+        """Eager load a queryset built outside get_queryset() (e.g. in an extra action)."""
+        defer = self.request is not None and self.request.method in SAFE_METHODS
+        return setup_eager_loading(self.get_serializer(), queryset, defer=defer)
@@ -0,0 +1,207 @@
+"""
+Responsive image renditions.
+
+When an image is uploaded to an ImageField (or to a field listed in a model's
+`rendition_fields`), WebP and JPEG copies are generated at each width in
+settings.IMAGE_RENDITION_WIDTHS narrower than the original, and stored next to
+it: gallery/photo.jpg gets gallery/photo__w640.webp, gallery/photo__w640.jpg,
+and so on, plus a gallery/photo__renditions.json manifest written last. Templates
+build srcset attributes from the manifest (see pages_extras), which is cached,
+so a render never touches the images themselves. Originals without a manifest
+(not generated yet, or not images) are simply served as they are.
+
+Generation runs after the upload commits: in a Celery task when
+IMAGE_RENDITIONS_ASYNC is set and a broker is reachable, otherwise in-process.
+The generate_renditions command backfills existing media.
+"""
+import json
+import logging
+import posixpath
+from functools import lru_cache
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import models
+
+from .cache import DEFAULT_TIMEOUT, KEY_PREFIX
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    # format: (extension, Pillow save options)
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+MISSING_TIMEOUT = 60
+
+
+def rendition_fields(model):
+    """Names of the fields of model whose uploads get renditions."""
+    return _rendition_fields(model._meta.concrete_model)
+
+
+@lru_cache(maxsize=None)
+def _rendition_fields(model):
+    declared = getattr(model, 'rendition_fields', None)
+    if declared is not None:
+        return tuple(declared)
+    return tuple(f.name for f in model._meta.concrete_fields if isinstance(f, models.ImageField))
+
+
+def _stem(name):
+    return posixpath.splitext(name)[0]
+
+
+def manifest_name(name):
+    return f'{_stem(name)}__renditions.json'
+
+
+def _cache_key(name):
+    return f'{KEY_PREFIX}:renditions:{name}'
+
+
+def get_manifest(fieldfile):
+    """
+    {'width', 'height', 'sources': {format: [[width, name], ...]}} for a stored
+    file, or None when it has no renditions. Cached, including misses (briefly).
+    """
+    if not fieldfile or not getattr(fieldfile, 'name', None):
+        return None
+    name = fieldfile.name
+    manifest = cache.get(_cache_key(name))
+    if manifest is None:
+        try:
+            with fieldfile.storage.open(manifest_name(name), 'rb') as f:
+                manifest = json.loads(f.read())
+        except Exception:
+            manifest = {}
+        cache.set(_cache_key(name), manifest, DEFAULT_TIMEOUT if manifest else MISSING_TIMEOUT)
+    return manifest or None
+
+
+def _prepare(image, fmt):
+    """Convert to a mode the target format can store (JPEG has no alpha: flatten onto white)."""
+    from PIL import Image
+
+    if fmt == 'jpeg':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            rgba = image.convert('RGBA')
+            background = Image.new('RGB', rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            return background
+        return image.convert('RGB') if image.mode != 'RGB' else image
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+    return image
+
+
+def _save(storage, name, data):
+    if hasattr(storage, 'save_as'):  # content-addressed storage would rename it
+        return storage.save_as(name, ContentFile(data))
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+def delete_renditions(storage, name):
+    """Delete the renditions and manifest of a stored file (before the file itself is deleted)."""
+    try:
+        with storage.open(manifest_name(name), 'rb') as f:
+            manifest = json.loads(f.read())
+    except Exception:
+        return
+    for entries in manifest['sources'].values():
+        for _, rendition in entries:
+            storage.delete(rendition)
+    storage.delete(manifest_name(name))
+    cache.delete(_cache_key(name))
+
+
+def generate(fieldfile, widths=None):
+    """
+    Write the renditions and manifest for a stored image; returns the manifest,
+    or None when the file can't be read as an image (e.g. a video).
+    """
+    # Pillow is imported here, not at module level: the signals import this module at startup
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    storage, name = fieldfile.storage, fieldfile.name
+    widths = sorted(set(widths or settings.IMAGE_RENDITION_WIDTHS), reverse=True)
+    try:
+        with storage.open(name, 'rb') as f:
+            image = Image.open(f)
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, OSError, ValueError) as exc:
+        logger.info('No renditions for %s: %s', name, exc)
+        return None
+
+    original_width, original_height = image.size
+    # Never upscale; an image narrower than every width still gets one rendition at its own size
+    targets = [w for w in widths if w < original_width] or [original_width]
+    sources = {fmt: [] for fmt in FORMATS}
+    current = image
+    for width in targets:  # widest first, each resized from the previous one
+        height = max(1, round(original_height * width / original_width))
+        if current.size != (width, height):
+            current = current.resize((width, height), Image.LANCZOS)
+        for fmt, (extension, options) in FORMATS.items():
+            buffer = BytesIO()
+            _prepare(current, fmt).save(buffer, fmt.upper(), **options)
+            saved = _save(storage, f'{_stem(name)}__w{width}.{extension}', buffer.getvalue())
+            sources[fmt].append([width, saved])
+
+    manifest = {
+        'width': original_width,
+        'height': original_height,
+        'sources': {fmt: sorted(entries) for fmt, entries in sources.items()},
+    }
+    _save(storage, manifest_name(name), json.dumps(manifest).encode())
+    cache.set(_cache_key(name), manifest, DEFAULT_TIMEOUT)
+    return manifest
+
+
+def generate_for_instance(instance, field_name, reuse=False):
+    """
+    Generate renditions for instance.field_name and call the model's
+    renditions_generated(field_name, manifest) hook, if any; returns the manifest.
+    With reuse, a file that already has renditions keeps them.
+    """
+    fieldfile = getattr(instance, field_name)
+    if not fieldfile:
+        return None
+    manifest = (reuse and get_manifest(fieldfile)) or generate(fieldfile)
+    hook = getattr(instance, 'renditions_generated', None)
+    if manifest and hook is not None:
+        hook(field_name, manifest)
+    return manifest
+
+
+def generate_for(model_label, pk, field_name):
+    """Generate renditions for one field of one row (the task body); returns the manifest or None."""
+    instance = apps.get_model(model_label)._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return None
+    # A content-addressed name always holds the same bytes: a deduplicated upload keeps its renditions
+    reuse = getattr(getattr(instance, field_name).storage, 'content_addressed', False)
+    return generate_for_instance(instance, field_name, reuse=reuse)
+
+
+def schedule(instance, field_name):
+    """Generate renditions for instance.field_name in Celery if enabled and reachable, else now."""
+    args = (instance._meta.label, instance.pk, field_name)
+    if settings.IMAGE_RENDITIONS_ASYNC:
+        try:
+            from .tasks import generate_renditions
+            generate_renditions.delay(*args)
+            return
+        except Exception:
+            logger.warning('Could not queue renditions for %s #%s %s; generating them now', *args, exc_info=True)
+    try:
+        generate_for(*args)
+    except Exception:
+        # A broken upload must not break the request that saved it; the backfill command can retry
+        logger.exception('Generating renditions for %s #%s %s failed', *args)
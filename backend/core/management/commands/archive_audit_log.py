@@ -0,0 +1,35 @@
+"""
+Move audit log entries older than the retention period (AUDIT_RETENTION_DAYS,
+or --days) into the monthly archive files (core.audit_archive), deleting them
+from the AuditLog table in chunks. Safe to run at any time, e.g. daily from
+cron; a run started while another is in progress stops without doing anything.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import audit_archive
+
+
+class Command(BaseCommand):
+    help = 'Archive audit log entries older than the retention period to compressed monthly files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.AUDIT_RETENTION_DAYS,
+                            help=f'Keep this many days in the table (default {settings.AUDIT_RETENTION_DAYS})')
+        parser.add_argument('--chunk-size', type=int, default=audit_archive.CHUNK_SIZE,
+                            help=f'Entries moved per transaction (default {audit_archive.CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        try:
+            archived = audit_archive.archive(cutoff, chunk_size=options['chunk_size'])
+        except audit_archive.ArchiveBusy as e:
+            raise CommandError(str(e))
+        for month, count in sorted(archived.items()):
+            self.stdout.write(f'  {audit_archive.path_for(month).name}: {count} entries')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {sum(archived.values())} audit entries older than {timezone.localtime(cutoff):%Y-%m-%d %H:%M}.'
+        ))
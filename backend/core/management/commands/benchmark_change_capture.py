@@ -0,0 +1,101 @@
+"""
+Measure what field-level change capture (core.changes) adds to loading and
+saving a tracked model, and fail if a save costs more than the budget.
+
+Creates --rows projects and times the capture receivers on them directly
+(best of --rounds, so other load on the machine counts as little as possible):
+the snapshot taken as each row loads, and the diff plus buffered AuditLog
+entry after each row is saved with a changed title. A plain save is timed too,
+for scale; database time varies too much from save to save to measure the
+overhead as a difference. Nothing is written: the projects are rolled back and
+the entries go to a throwaway audit buffer (the on_commit callbacks that record
+them are run by hand, as the transaction never commits). The test suite runs it
+with the default budget (core.tests.test_change_capture).
+"""
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import audit
+from core.signals import connect_change_capture, log_field_changes, snapshot_tracked_fields
+from projects.models import Project
+
+
+def _run_on_commit():
+    """Run the on_commit callbacks queued so far now (the benchmark's transaction never commits)."""
+    connection = transaction.get_connection()
+    while connection.run_on_commit:
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback, _ in callbacks:
+            callback()
+
+
+def _best(rounds, fn):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = 'Check that change capture stays within a per-save time budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200, help='Projects to load and save per round (default 200)')
+        parser.add_argument('--rounds', type=int, default=5, help='Rounds per measurement; the best counts (default 5)')
+        parser.add_argument('--budget-us', type=float, default=100,
+                            help='Overhead allowed per save, in microseconds (default 100)')
+
+    def handle(self, *args, **options):
+        rows, rounds = options['rows'], options['rounds']
+        spool_dir = tempfile.mkdtemp(prefix='audit-benchmark-')
+        saved_buffer = audit._buffer
+        audit._buffer = audit.AuditBuffer(spool_dir, batch_size=float('inf'), flush_interval=float('inf'))
+        try:
+            with transaction.atomic():
+                Project.objects.bulk_create([
+                    Project(title=f'Change capture benchmark {i}', slug=f'change-capture-benchmark-{i}',
+                            description='Benchmark', objectives='Benchmark')
+                    for i in range(rows)
+                ])
+                connect_change_capture(Project, connect=False)
+                projects = list(Project.objects.filter(slug__startswith='change-capture-benchmark-'))
+                counter = iter(range(10 ** 9))
+
+                def snapshot():
+                    for project in projects:
+                        snapshot_tracked_fields(Project, project)
+
+                def capture():
+                    for project in projects:
+                        project.title = f'Change capture benchmark {next(counter)}'
+                        log_field_changes(Project, project)
+                    _run_on_commit()
+
+                def save():
+                    for project in projects:
+                        project.title = f'Change capture benchmark {next(counter)}'
+                        project.save()
+
+                snapshot()
+                load_time, capture_time = _best(rounds, snapshot), _best(rounds, capture)
+                save_time = _best(rounds, save)
+                transaction.set_rollback(True)
+        finally:
+            connect_change_capture(Project)
+            audit._buffer = saved_buffer
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+        load_us, capture_us, save_us = (t / rows * 1e6 for t in (load_time, capture_time, save_time))
+        self.stdout.write(f'  snapshot on load: {load_us:8.1f} us/row')
+        self.stdout.write(f'  capture on save:  {capture_us:8.1f} us/row')
+        self.stdout.write(f'  uncaptured save:  {save_us:8.1f} us/row')
+        message = f'Change capture adds {capture_us:.1f} us per save (budget {options["budget_us"]:g} us).'
+        if capture_us > options['budget_us']:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(message))
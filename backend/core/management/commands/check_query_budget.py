@@ -0,0 +1,66 @@
+"""
+Render every API list endpoint as an admin and fail if any of them runs more
+SQL queries than the budget. Serializer eager loading (core.eager_loading)
+keeps list endpoints at a fixed query count however many rows they return, so
+a regression shows up here as soon as the database holds a page of data
+(run after seed_data). Nothing is written: the temporary admin is rolled back.
+core.tests.test_query_budget enforces the same bound in the test suite, on rows
+it creates itself, and checks that the counts stay flat as the rows double.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+
+def _list_endpoints(patterns, prefix=''):
+    """Paths of DRF list routes (no URL arguments) under patterns."""
+    for pattern in patterns:
+        route = str(pattern.pattern).lstrip('^').rstrip('$')
+        if isinstance(pattern, URLResolver):
+            yield from _list_endpoints(pattern.url_patterns, prefix + route)
+            continue
+        actions = getattr(pattern.callback, 'actions', None) or {}
+        if actions.get('get') == 'list' and not pattern.pattern.regex.groups:
+            yield '/' + prefix + route
+
+
+class Command(BaseCommand):
+    help = 'Check that API list endpoints stay within a fixed SQL query budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-queries', type=int, default=10,
+                            help='Queries allowed per list request (default 10)')
+        parser.add_argument('--prefix', default='/api/', help='Only check endpoints under this path')
+
+    def handle(self, *args, **options):
+        budget = options['max_queries']
+        paths = sorted(p for p in _list_endpoints(get_resolver().url_patterns) if p.startswith(options['prefix']))
+        over = []
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), transaction.atomic():
+            admin = get_user_model().objects.create_user(
+                username='query-budget-check', role='super_admin', is_staff=True, is_superuser=True,
+            )
+            client = APIClient()
+            client.force_authenticate(admin)
+            for path in paths:
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(path)
+                data = getattr(response, 'data', None)
+                rows = data.get('results', data) if isinstance(data, dict) else data
+                count = len(rows) if isinstance(rows, list) else '-'
+                line = f'  {path}: {len(ctx.captured_queries)} queries, {count} rows (HTTP {response.status_code})'
+                if len(ctx.captured_queries) > budget:
+                    over.append(path)
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+            transaction.set_rollback(True)
+
+        if over:
+            raise CommandError(f'{len(over)} endpoint(s) over the budget of {budget} queries: {", ".join(over)}')
+        self.stdout.write(self.style.SUCCESS(f'{len(paths)} list endpoints within {budget} queries.'))
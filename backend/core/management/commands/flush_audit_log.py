@@ -0,0 +1,17 @@
+"""
+Write audit entries left in spool files (core.audit) by workers that died or
+could not reach the database before flushing. Spool files still held by
+running processes are left alone; their entries are written by those
+processes. Safe to run at any time, e.g. from cron after a deploy.
+"""
+from django.core.management.base import BaseCommand
+
+from core import audit
+
+
+class Command(BaseCommand):
+    help = 'Write audit log entries left in spool files by stopped workers'
+
+    def handle(self, *args, **options):
+        count = audit.recover()
+        self.stdout.write(self.style.SUCCESS(f'Recovered {count} audit entries.'))
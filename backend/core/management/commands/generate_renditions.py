@@ -0,0 +1,45 @@
+"""
+Backfill responsive image renditions (core.images) for media uploaded before
+the pipeline existed, or regenerate them all with --force (e.g. after changing
+IMAGE_RENDITION_WIDTHS). Files that already have a manifest are skipped.
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core import images
+
+
+class Command(BaseCommand):
+    help = 'Generate WebP/JPEG renditions for existing uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', metavar='APP.MODEL',
+                            help='Only this model (repeatable), e.g. gallery.GalleryItem')
+        parser.add_argument('--force', action='store_true', help='Regenerate renditions that already exist')
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options['models']] if options['models'] else apps.get_models()
+        generated = skipped = failed = 0
+        for model in models:
+            for field_name in images.rendition_fields(model):
+                rows = (
+                    model._default_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                    .only('pk', field_name).order_by('pk')
+                )
+                for instance in rows.iterator():
+                    fieldfile = getattr(instance, field_name)
+                    if not options['force'] and fieldfile.storage.exists(images.manifest_name(fieldfile.name)):
+                        skipped += 1
+                        continue
+                    try:
+                        manifest = images.generate_for_instance(instance, field_name)
+                    except Exception as exc:
+                        manifest = None
+                        self.stderr.write(f'  {model._meta.label} #{instance.pk} {field_name}: {exc}')
+                    if manifest:
+                        generated += 1
+                    else:
+                        failed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated renditions for {generated} files ({skipped} already done, {failed} not images or unreadable).'
+        ))
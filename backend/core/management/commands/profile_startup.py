@@ -0,0 +1,74 @@
+"""
+Profile cold start: run Django setup and import the ROOT_URLCONF in a fresh
+interpreter under python -X importtime, then report the slowest module imports
+(project modules only unless --all) followed by the setup breakdown from
+agcbo.startup (settings, each models module, app configs and ready(), URLconf).
+Use it to spot a module that pulls in a heavy dependency at import time; such
+imports belong inside the function that needs them.
+"""
+import os
+import re
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in the child interpreter; its stderr carries the importtime lines
+SCRIPT = '''
+from django.conf import settings
+from agcbo.startup import format_report, timed_import, timed_setup
+rows = timed_setup()
+rows.insert(-1, timed_import(settings.ROOT_URLCONF))
+rows[-1] = ('total', rows[-1][1] + rows[-2][1])
+print(format_report(rows))
+'''
+IMPORT_TIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import times for the settings, URLconf and app modules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help='Number of modules to list (default 25)')
+        parser.add_argument('--all', action='store_true', help='Include third-party and standard library modules')
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative',
+                            help='Order by time including (cumulative) or excluding (self) nested imports')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE, PYTHONDONTWRITEBYTECODE='')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        imports, errors = [], []
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_RE.match(line)
+            if match:
+                own, cumulative, _, module = match.groups()
+                imports.append((module, int(own), int(cumulative)))
+            elif not line.startswith('import time:'):
+                errors.append(line)
+        if result.returncode:
+            raise CommandError('Startup failed:\n' + '\n'.join(errors[-20:]))
+
+        if not options['all']:
+            packages = {'agcbo'} | {
+                config.name.split('.')[0] for config in apps.get_app_configs()
+                if config.path.startswith(str(settings.BASE_DIR))
+            }
+            imports = [row for row in imports if row[0].split('.')[0] in packages]
+        column = 2 if options['sort'] == 'cumulative' else 1
+        imports.sort(key=lambda row: row[column], reverse=True)
+
+        shown = imports[:options['limit']]
+        if shown:
+            width = max(len(module) for module, _, _ in shown)
+            self.stdout.write(f'Slowest imports ({options["sort"]}):')
+            self.stdout.write(f'  {"module":<{width}}  {"self":>10}  {"cumulative":>10}')
+            for module, own, cumulative in shown:
+                self.stdout.write(f'  {module:<{width}}  {own / 1000:7.1f} ms  {cumulative / 1000:7.1f} ms')
+            self.stdout.write('')
+        self.stdout.write(result.stdout.rstrip() + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Profiled {len(imports)} module imports.'))
@@ -0,0 +1,19 @@
+"""
+Rebuild the SiteCounter table from scratch (home/about stats, manage dashboard).
+Run after bulk imports or raw SQL changes that bypass model signals.
+"""
+from django.core.management.base import BaseCommand
+
+from core import counters
+from core.models import SiteCounter
+
+
+class Command(BaseCommand):
+    help = 'Recompute all site counters from the source tables'
+
+    def handle(self, *args, **options):
+        SiteCounter.objects.exclude(key__in=counters.COUNTERS).delete()
+        counters.recount()
+        for key, value in SiteCounter.objects.values_list('key', 'value'):
+            self.stdout.write(f'  {key}: {value}')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(counters.COUNTERS)} counters.'))
@@ -0,0 +1,18 @@
+"""
+Rebuild the site search index (core.search) from scratch: one SearchDocument
+per public row of every searchable model. Run it once after migrating, and
+after bulk updates or imports that bypass the save signals.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} documents.'))
@@ -0,0 +1,57 @@
+"""
+Search the audit log archive (core.audit_archive) by user, model and object
+id, optionally within a date range, printing matching entries oldest first as
+JSON lines. Archive files are streamed, so a search over years of archive uses
+little memory; narrowing it with --since/--until skips whole months.
+"""
+import json
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core import audit_archive
+
+
+def _day_start(value):
+    day = parse_date(value) if value else None
+    if value and day is None:
+        raise CommandError(f'Invalid date {value!r}: use YYYY-MM-DD')
+    return timezone.make_aware(datetime.combine(day, time.min)) if day else None
+
+
+class Command(BaseCommand):
+    help = 'Search archived audit log entries by user, model and object id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Acting user: id or username')
+        parser.add_argument('--model', help='Model name, e.g. Project')
+        parser.add_argument('--object-id', help='Primary key of the changed object')
+        parser.add_argument('--since', help='First day to include (YYYY-MM-DD)')
+        parser.add_argument('--until', help='Last day to include (YYYY-MM-DD)')
+        parser.add_argument('--limit', type=int, default=100, help='Entries to print at most (default 100)')
+
+    def handle(self, *args, **options):
+        user_id = options['user']
+        if user_id and not user_id.isdigit():
+            # Usernames of deleted users can't be resolved; search by their id instead
+            user_id = get_user_model().objects.filter(username=user_id).values_list('pk', flat=True).first()
+            if user_id is None:
+                raise CommandError(f'No user named {options["user"]!r}')
+        until = _day_start(options['until'])
+        entries = audit_archive.search(
+            user_id=int(user_id) if user_id else None,
+            model_name=options['model'],
+            object_id=options['object_id'],
+            since=_day_start(options['since']),
+            until=until and until + timedelta(days=1),
+        )
+        count = 0
+        for entry in islice(entries, options['limit']):
+            entry['timestamp'] = entry['timestamp'].isoformat()
+            self.stdout.write(json.dumps(entry))
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Found {count} archived entries.'))
@@ -0,0 +1,13 @@
+"""Request-scoped middleware for core."""
+from . import changes
+
+
+class AuditContextMiddleware:
+    """Attribute the model changes a request saves (core.changes) to its user and IP address."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with changes.acting(request):
+            return self.get_response(request)
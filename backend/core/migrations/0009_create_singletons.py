@@ -0,0 +1,21 @@
+# Data migration: create the SiteSettings and AboutPage rows once so load() is a plain read
+
+from django.db import migrations
+
+
+def create_singletons(apps, schema_editor):
+    for model_name in ('SiteSettings', 'AboutPage'):
+        model = apps.get_model('core', model_name)
+        if not model.objects.filter(pk=1).exists():
+            model.objects.create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_alter_auditlog_action_alter_sectionslide_image_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_singletons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_auditlog_entry_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_joined', 'id'], name='core_user_date_jo_769c70_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'is_approved', 'date_joined'], name='core_user_role_4bef22_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='youthjob',
+            index=models.Index(fields=['created_at', 'id'], name='core_youthj_created_79cb55_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='youthjob',
+            index=models.Index(fields=['title', 'id'], name='core_youthj_title_fd2578_idx'),
+        ),
+    ]
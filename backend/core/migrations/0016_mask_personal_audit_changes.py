@@ -0,0 +1,33 @@
+from django.db import migrations
+
+MASK = '********'
+SECRET = {
+    'User': ('id_or_passport_number', 'full_names_as_on_id', 'phone_number', 'email'),
+    'Donation': ('donor_email', 'donor_phone'),
+}
+
+
+def mask_personal_changes(apps, schema_editor):
+    """Mask the personal values already logged before these fields became secret (core.changes.SECRET)."""
+    AuditLog = apps.get_model('core', 'AuditLog')
+    for model_name, fields in SECRET.items():
+        for entry in AuditLog.objects.filter(model_name=model_name).exclude(changes={}).only('changes').iterator():
+            changes = entry.changes
+            if not isinstance(changes, dict) or not any(f in changes for f in fields):
+                continue
+            for field in fields:
+                if field in changes:
+                    old, new = changes[field]
+                    changes[field] = [old and MASK, new and MASK]
+            AuditLog.objects.filter(pk=entry.pk).update(changes=changes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_approvaljob'),
+    ]
+
+    operations = [
+        migrations.RunPython(mask_personal_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from core.prefix_indexes import create_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_mask_personal_audit_changes'),
+    ]
+
+    operations = [
+        create_operation('core_user', 'username', 'first_name', 'last_name', 'email'),
+        create_operation('core_youthjob', 'title', 'organization'),
+    ]
@@ -1,8 +1,10 @@
 import re
+import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
 
+from core import cache as site_cache
 from core.storage import get_storage
 
 
@@ -82,6 +84,11 @@ class User(AbstractUser):
         ordering = ['-created_at']
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Manage lists (pages.listing): keyset paging by join date, overall and per role / approval
+            models.Index(fields=['date_joined', 'id']),
+            models.Index(fields=['role', 'is_approved', 'date_joined']),
+        ]
     
     def __str__(self):
         return self.username
@@ -116,7 +123,10 @@ class AuditLog(models.Model):
     object_repr = models.CharField(max_length=200)
     changes = models.JSONField(default=dict, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens, not when a batch of entries is written (core.audit)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+    # Identifies an entry replayed from an audit spool file, so it is only stored once
+    entry_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)
     
     class Meta:
         ordering = ['-timestamp']
@@ -131,7 +141,136 @@ class AuditLog(models.Model):
         return f"{self.user} - {self.action} - {self.model_name} - {self.timestamp}"
 
 
-class SiteSettings(models.Model):
+class SiteCounter(models.Model):
+    """Denormalised site-wide count (members, projects, ...) kept current by core.counters."""
+    key = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['key']
+        verbose_name = 'Site counter'
+        verbose_name_plural = 'Site counters'
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+
+class ApprovalJob(models.Model):
+    """Progress of a bulk approval (core.approvals), shared by every worker and the Celery task."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    role = models.CharField(max_length=20)
+    decision = models.CharField(max_length=20)
+    total = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Approval job'
+        verbose_name_plural = 'Approval jobs'
+
+    def __str__(self):
+        return f"{self.decision} {self.role}: {self.done}/{self.total}"
+
+
+class MediaBlob(models.Model):
+    """Content-addressed media file and the number of field values using it (core.storage)."""
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Media blob'
+        verbose_name_plural = 'Media blobs'
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+
+class SearchDocument(models.Model):
+    """
+    Search index entry for one public row of a searchable model (core.search). The
+    full-text index over title and body lives in the database: a weighted tsvector
+    column with a GIN index on PostgreSQL, an FTS5 table kept in sync by triggers on SQLite.
+    """
+    content_type = models.ForeignKey('contenttypes.ContentType', on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    kind = models.CharField(max_length=20, db_index=True)
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=500, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [['content_type', 'object_id']]
+        verbose_name = 'Search document'
+        verbose_name_plural = 'Search documents'
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class CounterFieldsMixin:
+    """
+    Model mixin for counters maintained only by F() / conditional UPDATEs: a save
+    of an existing row leaves COUNTER_FIELDS out, so writing back the value loaded
+    with the instance can't undo increments made since (admin, forms, API PUT).
+    """
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    f.name for f in self._meta.concrete_fields
+                    if not f.primary_key and f.attname not in deferred
+                ]
+            kwargs['update_fields'] = [name for name in update_fields if name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+
+
+class SingletonModel(models.Model):
+    """
+    Abstract single-row model (pk=1). The row is created by a data migration, so
+    load() is a cached read and never takes the get_or_create write path.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.pk = 1
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def _fetch(cls):
+        obj = cls.objects.filter(pk=1).first()
+        if obj is None:
+            # Row missing (e.g. deleted by hand): recreate it once.
+            obj, _ = cls.objects.get_or_create(pk=1)
+        return obj
+
+    @classmethod
+    def load(cls):
+        """Shared cached instance for reading; do not modify it."""
+        return site_cache.cached(f'singleton:{cls._meta.label_lower}', cls._fetch, depends_on=[cls])
+
+    @classmethod
+    def refresh(cls):
+        """A fresh instance from the database (safe to edit). The cache is left alone: saving bumps it (core.signals)."""
+        return cls._fetch()
+
+
+class SiteSettings(SingletonModel):
     """Singleton: logo, hotlines, address, social links (editable in admin)."""
     site_name = models.CharField(max_length=200, default='AGCBO Digital Hub')
     registration_number = models.CharField(max_length=80, blank=True, default='DSD/22/120/02/168788', help_text='CBO Registration No. (displayed in header and key areas)')
@@ -154,15 +293,6 @@ class SiteSettings(models.Model):
         verbose_name = 'Site settings'
         verbose_name_plural = 'Site settings'
 
-    def save(self, *args, **kwargs):
-        self.pk = 1
-        super().save(*args, **kwargs)
-
-    @classmethod
-    def load(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
-
 
 class Official(models.Model):
     """CBO officials (Chairperson, Treasurer, Secretary, etc.) – displayed on Officials page."""
@@ -202,12 +332,16 @@ class YouthJob(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Youth jobs / opportunities'
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['title', 'id']),
+        ]
 
     def __str__(self):
         return self.title
 
 
-class AboutPage(models.Model):
+class AboutPage(SingletonModel):
     """Editable About page content (singleton). When set, public About page uses this."""
     tagline = models.CharField(max_length=300, blank=True, default='Empowering youth, transforming communities')
     vision = models.TextField(blank=True)
@@ -219,15 +353,6 @@ class AboutPage(models.Model):
         verbose_name = 'About page content'
         verbose_name_plural = 'About page content'
 
-    def save(self, *args, **kwargs):
-        self.pk = 1
-        super().save(*args, **kwargs)
-
-    @classmethod
-    def load(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
-
 
 class SectionStyle(models.Model):
     """Background style for a site section (header, hero, footer, etc.). Editable from manage panel."""
@@ -0,0 +1,37 @@
+"""
+Prefix-search indexes for the manage list search boxes (pages.listing).
+
+A search matches words at the start of a column with istartswith. That is an
+index range scan, not a table scan, when the column has an index built the way
+the backend compares case-insensitively: UPPER(column) with text_pattern_ops on
+PostgreSQL, COLLATE NOCASE on SQLite. Django can't declare either one portably,
+so migrations create them with create_operation(); other backends get none.
+"""
+from django.db import migrations
+
+
+def _name(table, column):
+    return f'{table}_{column}_prefix'[:63]
+
+
+def create_operation(table, *columns):
+    """A migration operation adding a prefix-search index on each of columns of table."""
+
+    def create(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        quote = schema_editor.quote_name
+        for column in columns:
+            if vendor == 'postgresql':
+                expression = f'(UPPER({quote(column)}::text) text_pattern_ops)'
+            elif vendor == 'sqlite':
+                expression = f'({quote(column)} COLLATE NOCASE)'
+            else:
+                return
+            schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {quote(_name(table, column))} ON {quote(table)} {expression}')
+
+    def drop(apps, schema_editor):
+        if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+            for column in columns:
+                schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(_name(table, column))}')
+
+    return migrations.RunPython(create, drop)
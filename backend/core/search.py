@@ -0,0 +1,252 @@
+"""
+Site-wide full-text search.
+
+Every public row of the models in SEARCHABLE has a SearchDocument holding its
+title, the text of its other searchable fields and its page URL. The signals
+(core.signals) keep documents current as rows are saved and deleted; a row that
+is unpublished loses its document. rebuild_search_index rebuilds them all.
+
+The database indexes the documents itself (see migration core 0012): on
+PostgreSQL a weighted tsvector column with a GIN index, queried with
+websearch_to_tsquery, ranked by ts_rank_cd and highlighted by ts_headline; on
+SQLite an FTS5 table kept in sync by triggers, ranked by bm25 with titles
+weighted above bodies. Elsewhere (or without FTS5) titles and bodies are
+matched by substring. search() returns (total, results) with the title and a
+snippet as HTML: text escaped, matches in <mark>.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, connections
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from .models import SearchDocument
+
+# kind: result type (the API's 'type'); title: field; body: fields; public: filter a row must match
+Searchable = namedtuple('Searchable', 'kind title body public url')
+SearchResult = namedtuple('SearchResult', 'kind object_id title snippet url rank')
+
+
+def _first_link(*fields):
+    """URL of the first set field: a link field's value or a file field's file."""
+    def url(obj):
+        value = next((getattr(obj, name) for name in fields if getattr(obj, name)), '')
+        return getattr(value, 'url', value)
+    return url
+
+
+SEARCHABLE = {
+    'projects.Project': Searchable(
+        'project', 'title', ('description', 'objectives'), {'is_public': True},
+        lambda obj: reverse('pages:project_detail', args=[obj.slug]),
+    ),
+    'events.Event': Searchable(
+        'event', 'title', ('description', 'venue'), {'is_published': True},
+        lambda obj: reverse('pages:event_detail', args=[obj.slug]),
+    ),
+    'events.Announcement': Searchable('announcement', 'title', ('content',), {'is_published': True}, lambda obj: ''),
+    'core.YouthJob': Searchable(
+        'job', 'title', ('description', 'organization', 'location'), {'is_published': True},
+        lambda obj: f"{reverse('pages:youth_jobs')}#job-{obj.pk}",
+    ),
+    'gallery.GalleryItem': Searchable(
+        'gallery', 'title', ('description', 'tags'), {'is_public': True}, _first_link('file', 'url'),
+    ),
+    'reports.Report': Searchable(
+        'report', 'title', ('description',), {'is_public': True}, _first_link('report_url', 'report_file'),
+    ),
+    'core.Official': Searchable(
+        'official', 'name', ('title', 'bio'), {'is_published': True},
+        lambda obj: f"{reverse('pages:officials')}#official-{obj.pk}",
+    ),
+}
+KINDS = tuple(spec.kind for spec in SEARCHABLE.values())
+
+FTS_TABLE = 'core_searchdocument_fts'
+PG_CONFIG = 'english'  # must match the generated column in migration core 0012
+# Private-use characters mark matches in database output; they survive escaping and become <mark>
+START, STOP = '\ue000', '\ue001'
+SNIPPET_WORDS = 30
+
+
+def spec_for(model):
+    """The Searchable for model, or None if it isn't searchable."""
+    return SEARCHABLE.get(model._meta.concrete_model._meta.label)
+
+
+def _is_public(spec, instance):
+    return all(getattr(instance, name) == value for name, value in spec.public.items())
+
+
+def _document_fields(spec, instance):
+    body = '\n'.join(str(getattr(instance, name) or '') for name in spec.body)
+    return {
+        'kind': spec.kind,
+        'title': str(getattr(instance, spec.title) or '')[:300],
+        'body': body.strip(),
+        'url': spec.url(instance)[:500],
+    }
+
+
+def index_instance(instance):
+    """Create, update or (for a row that isn't public) delete the document of instance."""
+    spec = spec_for(type(instance))
+    if spec is None:
+        return
+    content_type = ContentType.objects.get_for_model(instance)
+    if not _is_public(spec, instance):
+        SearchDocument.objects.filter(content_type=content_type, object_id=instance.pk).delete()
+        return
+    SearchDocument.objects.update_or_create(
+        content_type=content_type, object_id=instance.pk, defaults=_document_fields(spec, instance),
+    )
+
+
+def remove_instance(instance):
+    if spec_for(type(instance)) is not None:
+        SearchDocument.objects.filter(content_type=ContentType.objects.get_for_model(instance), object_id=instance.pk).delete()
+
+
+def rebuild():
+    """Replace every document with one per public row of the searchable models; returns the count."""
+    documents = []
+    for label, spec in SEARCHABLE.items():
+        model = apps.get_model(label)
+        content_type = ContentType.objects.get_for_model(model)
+        documents += [
+            SearchDocument(content_type=content_type, object_id=obj.pk, **_document_fields(spec, obj))
+            for obj in model._default_manager.filter(**spec.public).iterator()
+        ]
+    SearchDocument.objects.all().delete()
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+    return len(documents)
+
+
+# ---------- Queries ----------
+
+def _marked(text):
+    """Escape text from the database and turn the match markers into <mark> tags."""
+    return mark_safe(escape(text).replace(START, '<mark>').replace(STOP, '</mark>'))
+
+
+@lru_cache(maxsize=None)
+def _backend(alias):
+    conn = connections[alias]
+    if conn.vendor == 'postgresql':
+        return 'postgresql'
+    if conn.vendor == 'sqlite' and FTS_TABLE in conn.introspection.table_names():
+        return 'sqlite'
+    return 'substring'
+
+
+def _kind_filter(kinds, column):
+    if not kinds:
+        return '', []
+    return f' AND {column} IN ({", ".join(["%s"] * len(kinds))})', list(kinds)
+
+
+def _search_postgresql(query, kinds, limit, offset):
+    where, params = _kind_filter(kinds, 'd.kind')
+    tsquery = f"websearch_to_tsquery('{PG_CONFIG}', %s)"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT COUNT(*) FROM core_searchdocument d WHERE d.search_vector @@ {tsquery}{where}', [query, *params],
+        )
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"""
+            SELECT d.kind, d.object_id, d.url, ts_rank_cd(d.search_vector, q) AS rank,
+                   ts_headline('{PG_CONFIG}', d.title, q, %s), ts_headline('{PG_CONFIG}', d.body, q, %s)
+            FROM core_searchdocument d, {tsquery} q
+            WHERE d.search_vector @@ q{where}
+            ORDER BY rank DESC, d.updated_at DESC LIMIT %s OFFSET %s
+            """,
+            [
+                f'StartSel={START}, StopSel={STOP}, HighlightAll=true',
+                f'StartSel={START}, StopSel={STOP}, MaxWords={SNIPPET_WORDS}, MinWords=10, MaxFragments=2, FragmentDelimiter=" … "',
+                query, *params, limit, offset,
+            ],
+        )
+        rows = cursor.fetchall()
+    return total, [
+        SearchResult(kind, object_id, _marked(title), _marked(snippet), url, float(rank))
+        for kind, object_id, url, rank, title, snippet in rows
+    ]
+
+
+def _fts5_query(query):
+    """An FTS5 MATCH expression requiring every word of query (as a prefix); None if it has no words."""
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words) or None
+
+
+def _search_sqlite(query, kinds, limit, offset):
+    match = _fts5_query(query)
+    if match is None:
+        return 0, []
+    where, params = _kind_filter(kinds, 'd.kind')
+    source = f'{FTS_TABLE} JOIN core_searchdocument d ON d.id = {FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH %s{where}'
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {source}', [match, *params])
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"""
+            SELECT d.kind, d.object_id, d.url, bm25({FTS_TABLE}, 10.0, 1.0) AS rank,
+                   highlight({FTS_TABLE}, 0, %s, %s), snippet({FTS_TABLE}, 1, %s, %s, '…', %s)
+            FROM {source}
+            ORDER BY rank, d.updated_at DESC LIMIT %s OFFSET %s
+            """,
+            [START, STOP, START, STOP, SNIPPET_WORDS, match, *params, limit, offset],
+        )
+        rows = cursor.fetchall()
+    # bm25 is lower for better matches; report it so that higher ranks first, as on PostgreSQL
+    return total, [
+        SearchResult(kind, object_id, _marked(title), _marked(snippet), url, -rank)
+        for kind, object_id, url, rank, title, snippet in rows
+    ]
+
+
+def _highlight(text, words):
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    return mark_safe(pattern.sub(lambda m: f'<mark>{m.group(0)}</mark>', escape(text)))
+
+
+def _search_substring(query, kinds, limit, offset):
+    words = re.findall(r'\w+', query)
+    if not words:
+        return 0, []
+    documents = SearchDocument.objects.all()
+    for word in words:
+        documents = documents.filter(Q(title__icontains=word) | Q(body__icontains=word))
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    total = documents.count()
+    results = []
+    for doc in documents.order_by('-updated_at')[offset:offset + limit]:
+        in_title = sum(word.lower() in doc.title.lower() for word in words)
+        results.append(SearchResult(
+            doc.kind, doc.object_id, _highlight(doc.title, words),
+            _highlight(Truncator(doc.body).words(SNIPPET_WORDS), words), doc.url, float(in_title),
+        ))
+    return total, results
+
+
+def search(query, kinds=None, limit=20, offset=0):
+    """(total matches, [SearchResult] for the requested page) for query, best match first."""
+    query = (query or '').strip()
+    if not query:
+        return 0, []
+    kinds = [kind for kind in (kinds or ()) if kind in KINDS]
+    backend = _backend(connection.alias)
+    if backend == 'postgresql':
+        return _search_postgresql(query, kinds, limit, offset)
+    if backend == 'sqlite':
+        return _search_sqlite(query, kinds, limit, offset)
+    return _search_substring(query, kinds, limit, offset)
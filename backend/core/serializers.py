@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from .models import AuditLog
+
 # JWT serializers (optional)
 try:
     from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
@@ -12,6 +14,76 @@ except ImportError:
 User = get_user_model()
 
 
+def _split_paths(value):
+    """'id,team.name' (or a list of names) -> {'id': [], 'team': ['name']}; None stays None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    paths = {}
+    for path in value:
+        head, _, rest = path.strip().partition('.')
+        if head:
+            paths.setdefault(head, [])
+            if rest:
+                paths[head].append(rest)
+    return paths
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and expandable relations for ModelSerializers.
+
+    ?fields=id,title,team.name keeps only the listed fields (dotted names reach
+    into embedded serializers). ?expand=team,team.team_members replaces an
+    embedded compact summary with the full serializer named in
+    expandable_fields. The query parameters apply to the serializer a view
+    builds with a request in its context; embedded serializers and direct
+    callers can pass fields= / expand= instead.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and fields is None and expand is None:
+            params = getattr(request, 'query_params', request.GET)
+            fields, expand = params.get('fields'), params.get('expand')
+        self._apply_fieldset(_split_paths(fields), _split_paths(expand) or {})
+
+    def _apply_fieldset(self, fields, expand):
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name, field in list(self.fields.items()):
+            many = isinstance(field, serializers.ListSerializer)
+            nested = field.child if many else field
+            serializer_class = self.expandable_fields.get(name) if name in expand else None
+            # [] means "the whole embedded object", same as not listing sub-fields at all
+            sub_fields = (fields.get(name) or None) if fields is not None else None
+            sub_expand = expand.get(name) or None
+            if serializer_class is None:
+                if not isinstance(nested, DynamicFieldsMixin) or (sub_fields is None and sub_expand is None):
+                    continue
+                serializer_class = type(nested)
+            kwargs = {'many': many, 'read_only': True}
+            if field.source != name:
+                kwargs['source'] = field.source
+            if issubclass(serializer_class, DynamicFieldsMixin):
+                kwargs.update(fields=sub_fields, expand=sub_expand)
+            self.fields[name] = serializer_class(**kwargs)
+
+
+class UserSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
+    
+    column_dependencies = {'full_name': ('first_name', 'last_name')}
+    
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'full_name']
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -55,3 +127,23 @@ if JWT_AVAILABLE and TokenObtainPairSerializer:
 else:
     class CustomTokenObtainPairSerializer(serializers.Serializer):
         pass  # Placeholder
+
+
+class AuditLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    user = UserSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = AuditLog
+        fields = ['id', 'user', 'action', 'model_name', 'object_id', 'object_repr',
+                  'changes', 'ip_address', 'timestamp']
+        read_only_fields = fields
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """A core.search.SearchResult; title and snippet are HTML (escaped text, matches in <mark>)."""
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+    title = serializers.CharField()
+    snippet = serializers.CharField()
+    url = serializers.CharField()
+    rank = serializers.FloatField()
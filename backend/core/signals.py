@@ -0,0 +1,200 @@
+"""Signal handlers for core: bump cache versions, recount site counters, generate image renditions, count media references, update the search index and log field changes when models change; flush audit entries after requests."""
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django.core.signals import request_finished
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from . import audit
+from . import changes
+from . import cache as site_cache
+from . import counters
+from . import images
+from . import search
+from .storage import content_addressed_fields
+from .models import SiteSettings, AboutPage, SectionStyle, SectionSlide, SiteCounter
+
+# Read by the context processors / singleton load() on every template render
+site_cache.track(SiteSettings, AboutPage, SectionStyle, SectionSlide, SiteCounter)
+
+
+def _is_live_write(sender, kwargs):
+    """False for fixture loading and for historical models saved by data migrations."""
+    return not kwargs.get('raw') and sender._meta.apps is apps
+
+
+@receiver(request_finished, dispatch_uid='core_flush_audit_log')
+def flush_audit_log(sender, **kwargs):
+    """Write the audit entries buffered by the request once its response has been sent."""
+    audit.flush()
+
+
+@receiver(post_save, dispatch_uid='core_bump_cache_version_on_save')
+@receiver(post_delete, dispatch_uid='core_bump_cache_version_on_delete')
+def bump_cache_version(sender, **kwargs):
+    """Invalidate cached data built from sender once the write is committed."""
+    if not _is_live_write(sender, kwargs) or not site_cache.is_tracked(sender):
+        return
+    transaction.on_commit(lambda: site_cache.bump(sender))
+
+
+@receiver(post_save, dispatch_uid='core_recount_counters_on_save')
+@receiver(post_delete, dispatch_uid='core_recount_counters_on_delete')
+def recount_site_counters(sender, **kwargs):
+    """Keep SiteCounter rows current for the counters that depend on sender."""
+    if not _is_live_write(sender, kwargs):
+        return
+    keys = counters.keys_for_model(sender)
+    if not keys:
+        return
+    update_fields = kwargs.get('update_fields')
+    if sender._meta.label_lower == 'core.user' and update_fields and not (set(update_fields) & counters.USER_FIELDS):
+        return
+    transaction.on_commit(lambda: counters.recount(*keys))
+
+
+@receiver(pre_save, dispatch_uid='core_note_image_uploads')
+def note_image_uploads(sender, instance, **kwargs):
+    """Remember which rendition fields hold a new upload (files are committed during save)."""
+    if not _is_live_write(sender, kwargs):
+        return
+    fields = images.rendition_fields(sender)
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None:
+        fields = [name for name in fields if name in update_fields]
+    uploads = [name for name in fields if getattr(instance, name) and not getattr(instance, name)._committed]
+    if uploads:
+        instance._new_uploads = uploads
+
+
+@receiver(post_save, dispatch_uid='core_generate_image_renditions')
+def generate_image_renditions(sender, instance, **kwargs):
+    """Generate renditions for new uploads once the row is committed."""
+    for name in instance.__dict__.pop('_new_uploads', ()):
+        transaction.on_commit(lambda name=name: images.schedule(instance, name))
+
+
+# ---------- Media reference counting (core.storage.ContentAddressedStorage) ----------
+
+def _raw_name(value):
+    return getattr(value, 'name', value) or ''
+
+
+def snapshot_media_names(sender, instance, **kwargs):
+    """Remember the stored file names an instance was loaded with (deferred fields are skipped)."""
+    instance._media_names = {
+        name: _raw_name(instance.__dict__[name]) for name in content_addressed_fields(sender) if name in instance.__dict__
+    }
+
+
+def note_media_changes(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Work out which file fields change in this save (new uploads are committed after pre_save)."""
+    if raw:
+        return
+    names = [n for n in content_addressed_fields(sender) if update_fields is None or n in update_fields]
+    loaded = getattr(instance, '_media_names', {})
+    if any(n not in loaded for n in names) and not instance._state.adding and instance.pk is not None:
+        # Loaded later than the instance (deferred): read what is stored now
+        stored = sender._base_manager.filter(pk=instance.pk).values(*names).first() or {}
+        loaded = {**stored, **loaded}
+    changes = []
+    for name in names:
+        value = getattr(instance, name)
+        uploaded = bool(value) and not value._committed
+        old = '' if instance._state.adding else loaded.get(name, '')
+        if uploaded or _raw_name(value) != old:
+            changes.append((name, old))
+    instance._media_changes = changes
+
+
+def count_media_references(sender, instance, raw=False, **kwargs):
+    """Take references on newly assigned files and release the replaced ones (in the save's transaction)."""
+    for name, old in instance.__dict__.pop('_media_changes', ()):
+        field_file = getattr(instance, name)
+        if field_file:
+            field_file.storage.acquire(field_file.name)
+        if old:
+            field_file.storage.release(old)
+    snapshot_media_names(sender, instance)
+
+
+def release_media_references(sender, instance, **kwargs):
+    """Release the files of a deleted row; unreferenced files are deleted after commit."""
+    for name in content_addressed_fields(sender):
+        field_file = getattr(instance, name)
+        if field_file:
+            field_file.storage.release(field_file.name)
+
+
+for _model in apps.get_models():
+    if content_addressed_fields(_model):
+        label = _model._meta.label_lower
+        post_init.connect(snapshot_media_names, sender=_model, dispatch_uid=f'core_media_snapshot_{label}')
+        pre_save.connect(note_media_changes, sender=_model, dispatch_uid=f'core_media_changes_{label}')
+        post_save.connect(count_media_references, sender=_model, dispatch_uid=f'core_media_refcount_{label}')
+        post_delete.connect(release_media_references, sender=_model, dispatch_uid=f'core_media_release_{label}')
+
+
+# ---------- Search index (core.search) ----------
+
+def update_search_document(sender, instance, **kwargs):
+    """Index the saved row, or drop its document if it is no longer public."""
+    if _is_live_write(sender, kwargs):
+        search.index_instance(instance)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    if _is_live_write(sender, kwargs):
+        search.remove_instance(instance)
+
+
+for _label in search.SEARCHABLE:
+    _model = apps.get_model(_label)
+    post_save.connect(update_search_document, sender=_model, dispatch_uid=f'core_search_index_{_label.lower()}')
+    post_delete.connect(delete_search_document, sender=_model, dispatch_uid=f'core_search_remove_{_label.lower()}')
+
+
+# ---------- Field-level change capture (core.changes) ----------
+
+def snapshot_tracked_fields(sender, instance, **kwargs):
+    changes.snapshot(instance)
+
+
+def log_field_changes(sender, instance, created=False, update_fields=None, **kwargs):
+    """Log the tracked fields the save changed, then remember the saved values for the next save."""
+    if not _is_live_write(sender, kwargs):
+        return
+    diff = changes.diff(instance, created, update_fields)
+    if diff:
+        user, ip_address = changes.current_actor()
+        # Logged once the save commits: a rolled-back save (e.g. a failed admin form) logs nothing
+        transaction.on_commit(partial(
+            audit.record,
+            user=user,
+            action=changes.current_action(created),
+            model_name=sender.__name__,
+            object_id=str(instance.pk),
+            object_repr=str(instance),
+            changes=diff,
+            ip_address=ip_address,
+        ))
+    changes.snapshot(instance)
+
+
+def connect_change_capture(model, connect=True):
+    """Connect (or, with connect=False, disconnect) the change capture receivers of model."""
+    label = model._meta.label_lower
+    for signal, handler, uid in (
+        (post_init, snapshot_tracked_fields, f'core_changes_snapshot_{label}'),
+        (post_save, log_field_changes, f'core_changes_log_{label}'),
+    ):
+        if connect:
+            signal.connect(handler, sender=model, dispatch_uid=uid)
+        else:
+            signal.disconnect(sender=model, dispatch_uid=uid)
+
+
+for _model in changes.tracked_models():
+    connect_change_capture(_model)
@@ -2,21 +2,137 @@
 Storage utility for optional Cloudinary support.
 Only imports cloudinary_storage when credentials are set, so migrate/run work
 without CLOUDINARY_STORAGE in settings (cloudinary_storage requires it on import).
+
+Local media is stored content-addressed (ContentAddressedStorage) unless
+MEDIA_CONTENT_ADDRESSED is off: an upload is named after the SHA-256 of its
+bytes, identical uploads to the same directory share one file, and each file
+is reference-counted in core.MediaBlob so it is deleted (with its renditions)
+only once no row uses it any more. Names never change content, so their URLs
+can be cached forever (see agcbo.media_views).
 """
+import hashlib
+import posixpath
+from functools import lru_cache
+
 from django.conf import settings
+from django.core.files import File
 from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+from django.utils.text import slugify
+
+HASH_LENGTH = 32
+
+
+def content_addressed_fields(model):
+    """Names of the file fields of model stored in a ContentAddressedStorage."""
+    return tuple(
+        f.name for f in model._meta.concrete_fields
+        if isinstance(f, models.FileField) and getattr(f.storage, 'content_addressed', False)
+    )
 
 
+@lru_cache(maxsize=None)
 def get_storage():
-    """Return Cloudinary storage only if credentials are set, else FileSystemStorage."""
-    try:
-        from decouple import config
-        _cn = (config('CLOUDINARY_CLOUD_NAME', default='') or '').strip()
-        _key = (config('CLOUDINARY_API_KEY', default='') or '').strip()
-        _secret = (config('CLOUDINARY_API_SECRET', default='') or '').strip()
-        if _cn and _key and _secret:
+    """
+    Return Cloudinary storage only if credentials are set, else local (content-addressed) storage.
+    Resolved once per process: every file field shares the same instance, and the
+    credentials come from settings.CLOUDINARY_AVAILABLE rather than re-reading .env.
+    """
+    if getattr(settings, 'CLOUDINARY_AVAILABLE', False):
+        try:
             from cloudinary_storage.storage import MediaCloudinaryStorage
             return MediaCloudinaryStorage()
-    except Exception:
-        pass
-    return FileSystemStorage(location=settings.MEDIA_ROOT)
+        except Exception:
+            pass
+    # No explicit location: MEDIA_ROOT is read when first needed (and follows override_settings)
+    if getattr(settings, 'MEDIA_CONTENT_ADDRESSED', False):
+        return ContentAddressedStorage()
+    return FileSystemStorage()
+
+
+def content_hash(content):
+    """Hex SHA-256 of a File, read in chunks (the file is rewound afterwards)."""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that saves uploads as <upload dir>/<slug>.<sha256 prefix>.<ext>.
+    An upload whose bytes already exist in the same directory reuses that
+    file, whatever it was called. save() only stores or finds the file: the row
+    that holds the name takes the reference after its save, in its own
+    transaction (acquire(), from core.signals), so FieldFile.save() and a failed
+    model save count the same as assigning a file; release() gives it back.
+    """
+    content_addressed = True
+
+    def save(self, name, content, max_length=None):
+        from .models import MediaBlob
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        sha256 = content_hash(content)
+        directory = posixpath.dirname(self.generate_filename(name))
+
+        with transaction.atomic():
+            # Locking the blob row keeps a concurrent release() from deleting the file we reuse
+            blob = next((
+                b for b in MediaBlob.objects.select_for_update().filter(sha256=sha256)
+                if posixpath.dirname(b.name) == directory and self.exists(b.name)
+            ), None)
+            if blob is None:
+                stem, ext = posixpath.splitext(posixpath.basename(name))
+                blob_name = posixpath.join(directory, f'{slugify(stem)[:30] or "file"}.{sha256[:HASH_LENGTH]}{ext.lower()}')
+                if not self.exists(blob_name):
+                    blob_name = super().save(blob_name, content, max_length=max_length)
+                blob, _ = MediaBlob.objects.select_for_update().get_or_create(
+                    name=blob_name, defaults={'sha256': sha256, 'size': content.size},
+                )
+        return blob.name
+
+    def acquire(self, name):
+        """Take a reference on a stored name for the row that now holds it (uploaded or copied from another row)."""
+        from .models import MediaBlob
+
+        if name:
+            MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+    def save_as(self, name, content):
+        """Store content under exactly name, replacing any file there (derived files such as renditions)."""
+        if self.exists(name):
+            self.delete(name)
+        return super().save(name, content)
+
+    def release(self, name):
+        """Drop one reference to name; the file goes once the last one is released and committed."""
+        from .models import MediaBlob
+
+        if not name or not MediaBlob.objects.filter(name=name).update(refcount=F('refcount') - 1):
+            return  # not a managed blob (e.g. uploaded before content addressing): never deleted
+        transaction.on_commit(lambda: self.collect(name))
+
+    def collect(self, name):
+        """Delete name, its renditions and its MediaBlob row if nothing references it."""
+        from . import images
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name, refcount__lte=0).first()
+            if blob is None:
+                return False
+            images.delete_renditions(self, name)
+            self.delete(name)
+            blob.delete()
+        return True
@@ -0,0 +1,21 @@
+"""Celery tasks for core (discovered by agcbo.celery; only imported when celery is installed)."""
+from celery import shared_task
+
+from agcbo import celery_app  # noqa: F401 (loads the project app, so .delay() uses its broker settings)
+
+from . import approvals, images
+
+
+@shared_task(ignore_result=True)
+def generate_renditions(model_label, pk, field_name):
+    images.generate_for(model_label, pk, field_name)
+
+
+@shared_task(ignore_result=True)
+def bulk_approval(role, decision, user_ids, actor_id, ip_address, job_id):
+    approvals.apply(role, decision, user_ids, actor_id, ip_address, job_id)
+
+
+@shared_task(ignore_result=True)
+def send_approval_notifications(user_ids, action):
+    approvals.send_notifications(user_ids, action)
@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from core import audit, changes
+from core.models import AuditLog, User
+from funding.models import Donation
+
+
+class ChangeCaptureTests(TransactionTestCase):
+    # Entries are recorded once the save commits, so the saves here must really commit
+    def logged(self, model_name, action):
+        audit.flush()
+        return AuditLog.objects.filter(model_name=model_name, action=action).latest('timestamp').changes
+
+    def test_personal_data_is_masked(self):
+        user = User.objects.create_user(
+            'member', email='member@example.com', password='secret', role='member',
+            phone_number='0712345678', id_or_passport_number='12345678', full_names_as_on_id='Jane Wanjiru',
+        )
+        created = self.logged('User', 'create')
+        for field in ('email', 'phone_number', 'id_or_passport_number', 'full_names_as_on_id', 'password'):
+            self.assertEqual(created[field], [None, changes.MASK], field)
+        self.assertEqual(created['role'], [None, 'member'])
+
+        user = User.objects.get(pk=user.pk)
+        user.phone_number = '0798765432'
+        user.first_name = 'Jane'
+        user.save()
+        self.assertEqual(self.logged('User', 'update'), {
+            'phone_number': [changes.MASK, changes.MASK], 'first_name': ['', 'Jane'],
+        })
+
+    def test_donor_contact_is_masked(self):
+        Donation.objects.create(donor_name='Donor', donor_email='donor@example.com', donor_phone='0700000000',
+                                amount=100, payment_method='mpesa')
+        created = self.logged('Donation', 'create')
+        self.assertEqual(created['donor_email'], [None, changes.MASK])
+        self.assertEqual(created['donor_phone'], [None, changes.MASK])
+        self.assertEqual(created['donor_name'], [None, 'Donor'])
+
+    def test_capture_stays_within_budget(self):
+        # Raises CommandError when a save costs more than the budget (default 100 us)
+        call_command('benchmark_change_capture', rows=100, rounds=5, stdout=StringIO())
@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from core import cache as site_cache
+from core import counters
+from core.models import SiteCounter, User
+
+
+class RecountTests(TestCase):
+    def setUp(self):
+        counters.recount()
+
+    def test_unchanged_counters_are_not_written(self):
+        version = site_cache.get_versions(SiteCounter)
+        updated_at = dict(SiteCounter.objects.values_list('key', 'updated_at'))
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            counters.recount()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(site_cache.get_versions(SiteCounter), version)
+        self.assertEqual(dict(SiteCounter.objects.values_list('key', 'updated_at')), updated_at)
+
+    def test_changed_counter_is_stored_and_bumps_the_cache(self):
+        version = site_cache.get_versions(SiteCounter)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='pending', role='member', is_approved=False)
+        self.assertEqual(SiteCounter.objects.get(key='pending_approvals').value, 1)
+        self.assertNotEqual(site_cache.get_versions(SiteCounter), version)
+
+    def test_missing_counter_is_created(self):
+        SiteCounter.objects.filter(key='published_events').delete()
+        counters.recount('published_events')
+        self.assertEqual(SiteCounter.objects.get(key='published_events').value, 0)
@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from core.models import MediaBlob
+from gallery.models import GalleryItem
+
+DATA = b'not really a document, but stored the same way'
+
+
+class MediaReferenceCountTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def item(self, **fields):
+        return GalleryItem(title='Item', year=2024, **fields)
+
+    def refcount(self):
+        return MediaBlob.objects.get().refcount
+
+    def test_assigned_file_is_counted_once(self):
+        first = self.item(file=SimpleUploadedFile('notes.txt', DATA))
+        first.save()
+        self.assertEqual(self.refcount(), 1)
+        second = self.item(file=SimpleUploadedFile('copy.txt', DATA))
+        second.save()
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertEqual(self.refcount(), 2)
+
+    def test_field_file_save_is_counted_once(self):
+        first = self.item()
+        first.file.save('notes.txt', ContentFile(DATA))
+        self.assertEqual(self.refcount(), 1)
+        second = self.item()
+        second.file.save('copy.txt', ContentFile(DATA), save=False)
+        second.save()
+        self.assertEqual(self.refcount(), 2)
+        call_command('reconcile_media', stdout=StringIO())  # raises if the counts drifted
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+            second.delete()
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_failed_save_takes_no_reference(self):
+        item = self.item()
+        item.file.save('notes.txt', ContentFile(DATA), save=False)
+        item.year = 'not a year'
+        with self.assertRaises((ValueError, TypeError)), transaction.atomic():
+            item.save()
+        self.assertEqual(self.refcount(), 0)
+        call_command('reconcile_media', stdout=StringIO())
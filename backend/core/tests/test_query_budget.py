@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.management.commands.check_query_budget import _list_endpoints
+from core.models import AuditLog, User
+from events.models import Announcement, Event, EventRegistration
+from funding.models import Donation, DonationTier, FundingSource, Sponsor
+from gallery.models import GalleryItem
+from gamification.models import Badge, Leaderboard, MemberBadge, PointsTransaction
+from members.models import Certificate, MemberProfile
+from projects.models import County, Ministry, Project, ProjectCategory, ProjectMember, ProjectReport
+from reports.models import ContactMessage, Report
+from sports.models import Match, SportProgram, Team, TeamMember, TrainingSchedule
+
+MAX_QUERIES = 10
+ROWS = 3
+
+
+class ListQueryBudgetTests(TestCase):
+    """
+    Every API list endpoint runs the same number of queries for ROWS and 2 * ROWS
+    rows of everything it shows (eager loading, core.eager_loading), and no more
+    than MAX_QUERIES: a serializer field that queries per row fails here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='query-budget', role='super_admin', is_staff=True, is_superuser=True,
+        )
+        cls.paths = sorted(p for p in _list_endpoints(get_resolver().url_patterns) if p.startswith('/api/'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_rows(self, start, count):
+        now = timezone.now()
+        for i in range(start, start + count):
+            user = User.objects.create_user(username=f'member-{i}', role='member', is_approved=True)
+            member = MemberProfile.objects.create(user=user)
+            Certificate.objects.create(member=member, title='Certificate', issued_by='AGCBO', issue_date=now.date())
+
+            county = County.objects.create(name=f'County {i}')
+            ministry = Ministry.objects.create(name=f'Ministry {i}')
+            category = ProjectCategory.objects.create(name=f'Category {i}', slug=f'category-{i}')
+            project = Project.objects.create(
+                title=f'Project {i}', slug=f'project-{i}', description='Project', objectives='Objectives',
+                category=category, county=county, ministry=ministry, created_by=user,
+            )
+            ProjectMember.objects.create(project=project, member=member)
+            ProjectReport.objects.create(project=project, title='Report', report_file='reports/r.pdf', report_date=now.date())
+
+            event = Event.objects.create(
+                title=f'Event {i}', slug=f'event-{i}', description='Event', event_type='other', venue='Hall',
+                start_date=now, end_date=now + timedelta(hours=1), project=project, county=county,
+                is_published=True, created_by=user,
+            )
+            EventRegistration.objects.create(event=event, member=member, full_name='Member')
+            Announcement.objects.create(title=f'Announcement {i}', slug=f'announcement-{i}', content='News', is_published=True)
+
+            sponsor = Sponsor.objects.create(name=f'Sponsor {i}')
+            FundingSource.objects.create(name=f'Source {i}', source_type='ministry')
+            DonationTier.objects.create(name=f'Tier {i}', amount=100, project=project)
+            Donation.objects.create(
+                donor_name='Donor', donor_email='donor@example.com', amount=100, payment_method='mpesa',
+                status='completed', project=project, sponsor=sponsor, created_by=user,
+            )
+
+            badge = Badge.objects.create(name=f'Badge {i}', slug=f'badge-{i}', description='Badge')
+            MemberBadge.objects.create(member=member, badge=badge)
+            PointsTransaction.objects.create(member=member, points=5, transaction_type='event_attendance', description='Event')
+            Leaderboard.objects.create(year=now.year, month=now.month, member=member, total_points=5, rank=i + 1)
+
+            program = SportProgram.objects.create(name=f'Program {i}', sport_type='football')
+            team = Team.objects.create(name=f'Team {i}', sport_program=program)
+            TeamMember.objects.create(team=team, member=member)
+            Match.objects.create(team=team, opponent='Rivals', match_type='friendly', venue='Stadium', match_date=now)
+            TrainingSchedule.objects.create(team=team, title='Training', venue='Stadium', start_time=now,
+                                            end_time=now + timedelta(hours=1))
+
+            GalleryItem.objects.create(title='Photo', year=now.year, event=event, project=project)
+            Report.objects.create(title=f'Report {i}', report_type='annual', report_file='reports/a.pdf', report_date=now.date())
+            ContactMessage.objects.create(name='Visitor', email='visitor@example.com', subject='Hello', message='Hi')
+            AuditLog.objects.create(user=user, action='update', model_name='Project', object_id=str(project.pk))
+
+    def query_counts(self):
+        counts = {}
+        for path in self.paths:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 200, path)
+            counts[path] = len(queries)
+        return counts
+
+    def test_list_endpoints_run_a_fixed_number_of_queries(self):
+        self.add_rows(0, ROWS)
+        counts = self.query_counts()
+        self.add_rows(ROWS, ROWS)
+        for path in self.paths:
+            with self.subTest(path=path):
+                self.assertLessEqual(counts[path], MAX_QUERIES)
+                with self.assertNumQueries(counts[path]):
+                    response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
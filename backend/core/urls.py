@@ -1,9 +1,13 @@
 from django.urls import path
-from .views import RegisterView, CustomTokenObtainPairView, current_user
+from rest_framework.routers import SimpleRouter
+from .views import RegisterView, CustomTokenObtainPairView, current_user, AuditLogViewSet
+
+router = SimpleRouter()
+router.register(r'audit-log', AuditLogViewSet, basename='auditlog')
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('refresh/', CustomTokenObtainPairView.as_view(), name='token_refresh'),
     path('me/', current_user, name='current_user'),
-]
+] + router.urls
@@ -1,8 +1,9 @@
-from rest_framework import generics, status
+from rest_framework import generics, status, viewsets
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
+from django_filters.rest_framework import DjangoFilterBackend
 
 # JWT imports (optional)
 try:
@@ -12,9 +13,15 @@ try:
 except ImportError:
     JWT_AVAILABLE = False
 
+from . import search
+from .eager_loading import EagerLoadingMixin
+from .models import AuditLog
+from .pagination import KeysetPagination
 from .serializers import (
     UserSerializer, 
     UserRegistrationSerializer,
+    AuditLogSerializer,
+    SearchResultSerializer,
 )
 
 User = get_user_model()
@@ -60,3 +67,41 @@ def current_user(request):
     """
     serializer = UserSerializer(request.user)
     return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def site_search(request):
+    """
+    Full-text search over public projects, events, announcements, jobs, gallery items,
+    reports and officials, best match first. ?q=words, ?type=project,event (any of
+    core.search.KINDS), ?limit= (max 50) and ?offset= page through the results.
+    """
+    query = request.query_params.get('q', '')
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        offset = max(int(request.query_params.get('offset', 0)), 0)
+    except ValueError:
+        return Response({'error': 'limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    total, results = search.search(query, kinds=kinds, limit=limit, offset=offset)
+    return Response({
+        'query': query,
+        'count': total,
+        'limit': limit,
+        'offset': offset,
+        'results': SearchResultSerializer(results, many=True).data,
+    })
+
+
+class AuditLogViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Admin actions feed, newest first (keyset paginated on the timestamp index)
+    """
+    queryset = AuditLog.objects.all()
+    serializer_class = AuditLogSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = KeysetPagination
+    ordering = ['-timestamp', '-id']
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['action', 'model_name', 'user']
@@ -1,11 +1,16 @@
 from django.contrib import admin
+from . import registration as registration_engine
 from .models import Event, EventRegistration, Announcement
 
 
 class EventRegistrationInline(admin.TabularInline):
     model = EventRegistration
     extra = 0
-    readonly_fields = ['registered_at']
+    readonly_fields = ['waitlist_number', 'registered_at']
+
+    def has_add_permission(self, request, obj=None):
+        # New registrations need a seat from the engine: add them from the registrations list
+        return False
 
 
 @admin.register(Event)
@@ -15,7 +20,7 @@ class EventAdmin(admin.ModelAdmin):
     list_filter = ['event_type', 'is_published', 'is_featured', 'requires_registration', 'created_at']
     search_fields = ['title', 'description', 'venue']
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ['created_at', 'updated_at', 'registered_count']
+    readonly_fields = ['created_at', 'updated_at', 'registered_count', 'seats_taken', 'waitlist_issued']
     inlines = [EventRegistrationInline]
     date_hierarchy = 'start_date'
 
@@ -23,9 +28,20 @@ class EventAdmin(admin.ModelAdmin):
 @admin.register(EventRegistration)
 class EventRegistrationAdmin(admin.ModelAdmin):
     list_display = ['event', 'member', 'full_name', 'is_confirmed', 
-                    'payment_status', 'registered_at']
+                    'payment_status', 'waitlist_number', 'registered_at']
     list_filter = ['is_confirmed', 'payment_status', 'registered_at']
     search_fields = ['event__title', 'member__user__username', 'full_name', 'email']
+    readonly_fields = ['waitlist_number']
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a registration to another event would carry its seat along
+        return self.readonly_fields + (['event'] if obj else [])
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            # The change form's transaction covers the seat and the row
+            obj.waitlist_number = registration_engine.place(obj.event_id)
+        super().save_model(request, obj, form, change)
 
 
 @admin.register(Announcement)
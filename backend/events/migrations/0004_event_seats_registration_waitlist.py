@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_seats(apps, schema_editor):
+    # Every registration made before the waitlist existed holds a seat
+    Event = apps.get_model('events', 'Event')
+    for event in Event.objects.annotate(n=Count('event_registrations')).filter(n__gt=0):
+        Event.objects.filter(pk=event.pk).update(seats_taken=event.n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_alter_announcement_featured_image_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Registrations holding a seat'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_issued',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Waitlist numbers handed out so far'),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='waitlist_number',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(count_existing_seats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_seats_registration_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['-registered_at'], name='events_even_registe_14fffe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['member', '-registered_at'], name='events_even_member__329eaf_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+from core.prefix_indexes import create_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_title_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_date', 'id'], name='events_even_start_d_8ea970_idx'),
+        ),
+        create_operation('events_event', 'title', 'venue'),
+    ]
@@ -1,9 +1,23 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from core.models import CounterFieldsMixin
 from core.storage import get_storage
 
 
-class Event(models.Model):
+class EventQuerySet(models.QuerySet):
+    def with_registration_counts(self):
+        """Annotate confirmed registration counts so registered_count/is_full need no extra query per row."""
+        # Subquery rather than a JOIN + GROUP BY, which would drop Meta.ordering
+        confirmed = (
+            EventRegistration.objects.filter(event=OuterRef('pk'), is_confirmed=True)
+            .order_by().values('event').annotate(n=Count('pk')).values('n')
+        )
+        return self.annotate(confirmed_registration_count=Coalesce(Subquery(confirmed), 0))
+
+
+class Event(CounterFieldsMixin, models.Model):
     """
     Events and activities
     """
@@ -40,6 +54,10 @@ class Event(models.Model):
     requires_registration = models.BooleanField(default=False)
     max_participants = models.IntegerField(null=True, blank=True)
     registration_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Maintained by events.registration with conditional UPDATEs (never read-modify-write);
+    # saves of an existing event leave them out (COUNTER_FIELDS)
+    seats_taken = models.PositiveIntegerField(default=0, editable=False, help_text="Registrations holding a seat")
+    waitlist_issued = models.PositiveIntegerField(default=0, editable=False, help_text="Waitlist numbers handed out so far")
     
     # Association
     project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='events')
@@ -53,11 +71,17 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EventQuerySet.as_manager()
+
+    COUNTER_FIELDS = ('seats_taken', 'waitlist_issued')
+    
     class Meta:
         ordering = ['-start_date']
         indexes = [
             models.Index(fields=['start_date', 'is_published']),
             models.Index(fields=['event_type', 'is_published']),
+            models.Index(fields=['title', 'id']),
+            models.Index(fields=['start_date', 'id']),
         ]
     
     def __str__(self):
@@ -65,12 +89,15 @@ class Event(models.Model):
     
     @property
     def registered_count(self):
+        annotated = getattr(self, 'confirmed_registration_count', None)
+        if annotated is not None:
+            return annotated
         return self.event_registrations.filter(is_confirmed=True).count()
     
     @property
     def is_full(self):
         if self.max_participants:
-            return self.registered_count >= self.max_participants
+            return self.seats_taken >= self.max_participants
         return False
 
 
@@ -93,16 +120,26 @@ class EventRegistration(models.Model):
         ('free', 'Free'),
     ])
     notes = models.TextField(blank=True)
+    # Null when the registration holds a seat; otherwise its place in the queue (lower first)
+    waitlist_number = models.PositiveIntegerField(null=True, blank=True, editable=False)
     registered_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         unique_together = ['event', 'member']
         ordering = ['-registered_at']
+        indexes = [
+            models.Index(fields=['-registered_at']),
+            models.Index(fields=['member', '-registered_at']),
+        ]
     
     def __str__(self):
         if self.member:
             return f"{self.member.user.username} - {self.event.title}"
         return f"{self.full_name} - {self.event.title}"
+    
+    @property
+    def is_waitlisted(self):
+        return self.waitlist_number is not None
 
 
 class Announcement(models.Model):
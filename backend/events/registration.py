@@ -0,0 +1,80 @@
+"""
+Event registration engine: atomic seat reservation with a waitlist.
+
+Seats are taken with a single conditional UPDATE on Event.seats_taken
+(WHERE seats_taken < max_participants), so concurrent requests can never
+overbook, on any database backend, without holding row locks across the
+request. When the event is full the registration gets the next waitlist number
+instead; releasing a seat hands it to the earliest waitlisted registration.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .models import Event, EventRegistration
+
+
+class AlreadyRegistered(Exception):
+    pass
+
+
+def _take_seat(event_id):
+    """Reserve one seat; False when the event is at capacity."""
+    has_room = Q(max_participants__isnull=True) | Q(max_participants__lte=0) | Q(seats_taken__lt=F('max_participants'))
+    return Event.objects.filter(pk=event_id).filter(has_room).update(seats_taken=F('seats_taken') + 1) == 1
+
+
+def _next_waitlist_number(event_id):
+    Event.objects.filter(pk=event_id).update(waitlist_issued=F('waitlist_issued') + 1)
+    # Our UPDATE holds the row lock until commit, so this reads our own increment
+    return Event.objects.filter(pk=event_id).values_list('waitlist_issued', flat=True).get()
+
+
+def place(event_id):
+    """
+    Seat or waitlist number for a new registration of the event: None when it
+    got a seat. Call inside the transaction that saves the registration.
+    """
+    return None if _take_seat(event_id) else _next_waitlist_number(event_id)
+
+
+def register(event, member=None, **fields):
+    """
+    Create a registration for event, holding a seat if one is free and a
+    waitlist number otherwise. Raises AlreadyRegistered for duplicate members.
+    """
+    try:
+        with transaction.atomic():
+            waitlist_number = place(event.pk)
+            return EventRegistration.objects.create(
+                event=event, member=member, waitlist_number=waitlist_number, **fields
+            )
+    except IntegrityError:
+        # unique (event, member): the rollback also returned the seat / number
+        raise AlreadyRegistered()
+
+
+def waitlist_position(registration):
+    """1-based place in the event's waitlist, or None if the registration holds a seat."""
+    if registration.waitlist_number is None:
+        return None
+    return EventRegistration.objects.filter(
+        event_id=registration.event_id,
+        waitlist_number__isnull=False,
+        waitlist_number__lte=registration.waitlist_number,
+    ).count()
+
+
+def release_seat(event_id):
+    """Give a freed seat to the earliest waitlisted registration, or return it to the pool."""
+    with transaction.atomic():
+        while True:
+            next_pk = (
+                EventRegistration.objects.filter(event_id=event_id, waitlist_number__isnull=False)
+                .order_by('waitlist_number').values_list('pk', flat=True).first()
+            )
+            if next_pk is None:
+                Event.objects.filter(pk=event_id, seats_taken__gt=0).update(seats_taken=F('seats_taken') - 1)
+                return None
+            # Conditional so two releases never promote the same registration
+            if EventRegistration.objects.filter(pk=next_pk, waitlist_number__isnull=False).update(waitlist_number=None):
+                return next_pk
@@ -1,34 +1,53 @@
 from rest_framework import serializers
 from .models import Event, EventRegistration, Announcement
-from projects.serializers import ProjectListSerializer
-from members.serializers import MemberProfileSerializer
+from core.serializers import DynamicFieldsMixin
+from projects.serializers import ProjectListSerializer, ProjectSummarySerializer
+from members.serializers import MemberProfileSerializer, MemberProfileSummarySerializer
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact event embedded by other serializers; ?expand= gives the full EventSerializer"""
+    class Meta:
+        model = Event
+        fields = ['id', 'title', 'slug', 'event_type', 'venue', 'start_date', 'end_date']
+
+
+class EventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     county_name = serializers.CharField(source='county.name', read_only=True)
-    project = ProjectListSerializer(read_only=True)
+    project = ProjectSummarySerializer(read_only=True)
     registered_count = serializers.ReadOnlyField()
     is_full = serializers.ReadOnlyField()
     
+    select_related_fields = ('county',)
+    expandable_fields = {'project': ProjectListSerializer}
+    column_dependencies = {'registered_count': (), 'is_full': ('max_participants', 'seats_taken')}
+    
     class Meta:
         model = Event
         fields = ['id', 'title', 'slug', 'description', 'event_type', 'featured_image',
                   'venue', 'county', 'county_name', 'address', 'is_online', 'online_link',
                   'start_date', 'end_date', 'registration_deadline', 'requires_registration',
                   'max_participants', 'registration_fee', 'project', 'is_published',
-                  'is_featured', 'registered_count', 'is_full', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'registered_count', 'is_full']
+                  'is_featured', 'registered_count', 'seats_taken', 'is_full', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'registered_count', 'seats_taken', 'is_full']
+    
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return queryset.with_registration_counts()
 
 
-class EventRegistrationSerializer(serializers.ModelSerializer):
-    event = EventSerializer(read_only=True)
-    member = MemberProfileSerializer(read_only=True)
+class EventRegistrationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    event = EventSummarySerializer(read_only=True)
+    member = MemberProfileSummarySerializer(read_only=True)
+    
+    expandable_fields = {'event': EventSerializer, 'member': MemberProfileSerializer}
+    column_dependencies = {'is_waitlisted': ('waitlist_number',)}
     
     class Meta:
         model = EventRegistration
         fields = ['id', 'event', 'member', 'full_name', 'email', 'phone',
-                  'is_confirmed', 'payment_status', 'notes', 'registered_at']
-        read_only_fields = ['id', 'registered_at']
+                  'is_confirmed', 'payment_status', 'notes', 'is_waitlisted', 'registered_at']
+        read_only_fields = ['id', 'registered_at', 'is_waitlisted']
 
 
 class EventRegistrationCreateSerializer(serializers.ModelSerializer):
@@ -37,7 +56,7 @@ class EventRegistrationCreateSerializer(serializers.ModelSerializer):
         fields = ['event', 'full_name', 'email', 'phone', 'notes']
 
 
-class AnnouncementSerializer(serializers.ModelSerializer):
+class AnnouncementSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Announcement
         fields = ['id', 'title', 'slug', 'content', 'featured_image', 'is_published',
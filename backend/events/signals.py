@@ -0,0 +1,13 @@
+"""Signal handlers for events: keep Event.seats_taken in step with deleted registrations."""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import EventRegistration
+from .registration import release_seat
+
+
+@receiver(post_delete, sender=EventRegistration, dispatch_uid='events_release_seat_on_delete')
+def release_seat_on_delete(sender, instance, **kwargs):
+    """A cancelled registration that held a seat passes it to the waitlist (admin, API or cascade)."""
+    if instance.waitlist_number is None:
+        release_seat(instance.event_id)
@@ -3,9 +3,10 @@ from rest_framework.routers import DefaultRouter
 from .views import EventViewSet, EventRegistrationViewSet, AnnouncementViewSet
 
 router = DefaultRouter()
-router.register(r'', EventViewSet, basename='event')
+# Register the prefixed routes first: the '' route's detail pattern would otherwise swallow them
 router.register(r'registrations', EventRegistrationViewSet, basename='eventregistration')
 router.register(r'announcements', AnnouncementViewSet, basename='announcement')
+router.register(r'', EventViewSet, basename='event')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,9 +1,13 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from core.eager_loading import EagerLoadingMixin
+from core.pagination import KeysetPagination
+from . import registration as registration_engine
 from .models import Event, EventRegistration, Announcement
 from .serializers import (
     EventSerializer, EventRegistrationSerializer, EventRegistrationCreateSerializer,
@@ -11,8 +15,8 @@ from .serializers import (
 )
 
 
-class EventViewSet(viewsets.ModelViewSet):
-    queryset = Event.objects.select_related('county', 'project').all()
+class EventViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
@@ -26,61 +30,71 @@ class EventViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def register(self, request, pk=None):
-        """Register for an event"""
-        event = self.get_object()
-        
-        if event.is_full:
-            return Response(
-                {'error': 'Event is full'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        if event.registration_deadline and timezone.now() > event.registration_deadline:
-            return Response(
-                {'error': 'Registration deadline has passed'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Check if already registered
-        member = None
-        if request.user.is_authenticated and hasattr(request.user, 'member_profile'):
-            member = request.user.member_profile
-            if EventRegistration.objects.filter(event=event, member=member).exists():
-                return Response(
-                    {'error': 'Already registered'}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        serializer = EventRegistrationCreateSerializer(data={
-            **request.data,
-            'event': event.id,
-        })
-        serializer.is_valid(raise_exception=True)
-        registration = serializer.save(member=member)
-        
+        """Register for an event (seat reserved atomically; waitlisted when full)"""
+        return _register(request, self.get_object(), request.data)
+
+
+def _register(request, event, data):
+    """Register request's member for event through the registration engine (201, or 400 when it can't)."""
+    if event.registration_deadline and timezone.now() > event.registration_deadline:
+        return Response(
+            {'error': 'Registration deadline has passed'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    member = getattr(request.user, 'member_profile', None)
+    serializer = EventRegistrationCreateSerializer(data={
+        **data,
+        'event': event.id,
+    })
+    serializer.is_valid(raise_exception=True)
+    fields = {k: v for k, v in serializer.validated_data.items() if k != 'event'}
+    try:
+        registration = registration_engine.register(event, member=member, **fields)
+    except registration_engine.AlreadyRegistered:
         return Response(
-            EventRegistrationSerializer(registration).data,
-            status=status.HTTP_201_CREATED
+            {'error': 'Already registered'}, 
+            status=status.HTTP_400_BAD_REQUEST
         )
+    
+    data = EventRegistrationSerializer(registration).data
+    data['waitlist_position'] = registration_engine.waitlist_position(registration)
+    return Response(data, status=status.HTTP_201_CREATED)
 
 
-class EventRegistrationViewSet(viewsets.ModelViewSet):
-    queryset = EventRegistration.objects.select_related('event', 'member__user').all()
+class EventRegistrationViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = EventRegistration.objects.all()
     serializer_class = EventRegistrationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering = ['-registered_at', '-id']
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['event', 'is_confirmed', 'payment_status']
     
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_admin_user:
-            return self.queryset
+            return queryset
         if hasattr(user, 'member_profile'):
-            return self.queryset.filter(member=user.member_profile)
-        return self.queryset.none()
+            return queryset.filter(member=user.member_profile)
+        return queryset.none()
+    
+    # Seats only change through the registration engine: POST registers like
+    # /events/{id}/register/, updates can't touch event, member or waitlist_number
+    # (not writable in EventRegistrationSerializer) and a delete hands the seat on
+    # (events.signals).
+    def create(self, request, *args, **kwargs):
+        """Register for the event in the body (seat reserved atomically; waitlisted when full)"""
+        serializer = EventRegistrationCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        event = serializer.validated_data['event']
+        if not event.is_published and not request.user.is_admin_user:
+            raise NotFound()
+        return _register(request, event, request.data)
 
 
-class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
+class AnnouncementViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Announcement.objects.all()
     serializer_class = AnnouncementSerializer
     permission_classes = [AllowAny]
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import FundingSource, Sponsor, Donation, DonationTier
+from .models import FundingSource, Sponsor, Donation, DonationTier, DonationSummary
 
 
 @admin.register(FundingSource)
@@ -31,3 +31,13 @@ class DonationTierAdmin(admin.ModelAdmin):
     list_display = ['name', 'amount', 'currency', 'project', 'is_active', 'created_at']
     list_filter = ['is_active', 'currency', 'created_at']
     search_fields = ['name', 'description']
+
+
+@admin.register(DonationSummary)
+class DonationSummaryAdmin(admin.ModelAdmin):
+    list_display = ['month', 'currency', 'payment_method', 'project', 'donation_count', 'total_amount']
+    list_filter = ['currency', 'payment_method', 'month']
+    readonly_fields = ['currency', 'project', 'payment_method', 'month', 'donation_count', 'total_amount', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,15 @@
+"""
+Rebuild DonationSummary from the donations table (after bulk imports or
+QuerySet.update() calls that bypass the save signals).
+"""
+from django.core.management.base import BaseCommand
+
+from funding import summary
+
+
+class Command(BaseCommand):
+    help = 'Recompute donation summary rows from completed donations'
+
+    def handle(self, *args, **options):
+        rows = summary.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt donation summary ({rows} rows).'))
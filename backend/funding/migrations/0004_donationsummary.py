@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def build_summary(apps, schema_editor):
+    Donation = apps.get_model('funding', 'Donation')
+    DonationSummary = apps.get_model('funding', 'DonationSummary')
+    totals = {}
+    rows = Donation.objects.filter(status='completed').values_list(
+        'currency', 'project_id', 'payment_method', 'created_at', 'amount'
+    )
+    for currency, project_id, method, created_at, amount in rows.iterator():
+        key = (currency, project_id, method, timezone.localtime(created_at).date().replace(day=1))
+        count, total = totals.get(key, (0, 0))
+        totals[key] = (count + 1, total + amount)
+    DonationSummary.objects.bulk_create([
+        DonationSummary(currency=c, project_id=p, payment_method=m, month=month, donation_count=n, total_amount=t)
+        for (c, p, m, month), (n, t) in totals.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_ministry_logo_alter_project_featured_image_and_more'),
+        ('funding', '0003_alter_fundingsource_logo_alter_sponsor_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('payment_method', models.CharField(choices=[('mpesa', 'M-Pesa'), ('bank', 'Bank Transfer'), ('paypal', 'PayPal'), ('stripe', 'Stripe'), ('cash', 'Cash'), ('other', 'Other')], max_length=20)),
+                ('month', models.DateField(help_text='First day of the month the donation was made')),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donation_summaries', to='projects.project')),
+            ],
+            options={
+                'verbose_name_plural': 'Donation summaries',
+                'ordering': ['-month', 'currency'],
+                'unique_together': {('currency', 'project', 'payment_method', 'month')},
+            },
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
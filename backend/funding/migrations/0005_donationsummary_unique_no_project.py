@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def merge_no_project_rows(apps, schema_editor):
+    """Fold duplicate no-project rows (which the old unique_together let through) into one per key."""
+    DonationSummary = apps.get_model('funding', 'DonationSummary')
+    kept = {}
+    for row in DonationSummary.objects.filter(project__isnull=True).order_by('pk').iterator():
+        key = (row.currency, row.payment_method, row.month)
+        first = kept.get(key)
+        if first is None:
+            kept[key] = row
+            continue
+        first.donation_count += row.donation_count
+        first.total_amount += row.total_amount
+        first.save(update_fields=['donation_count', 'total_amount'])
+        row.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_ministry_logo_alter_project_featured_image_and_more'),
+        ('funding', '0004_donationsummary'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='donationsummary',
+            unique_together=set(),
+        ),
+        migrations.RunPython(merge_no_project_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='donationsummary',
+            constraint=models.UniqueConstraint(fields=('currency', 'project', 'payment_method', 'month'), name='funding_donationsummary_unique_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='donationsummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('currency', 'payment_method', 'month'), name='funding_donationsummary_unique_key_no_project'),
+        ),
+        migrations.AlterField(
+            model_name='donationsummary',
+            name='project',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='donation_summaries', to='projects.project'),
+        ),
+    ]
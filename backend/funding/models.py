@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 from core.storage import get_storage
 
 
@@ -115,6 +116,25 @@ class Donation(models.Model):
     
     def __str__(self):
         return f"{self.donor_name} - {self.amount} {self.currency}"
+    
+    SUMMARY_FIELDS = ('status', 'amount', 'currency', 'project_id', 'payment_method', 'created_at')
+    
+    def save(self, *args, **kwargs):
+        # DonationSummary is updated by the signal handlers: keep it in this transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+    
+    def summary_contribution(self):
+        """(summary key, amount) this donation adds to DonationSummary, or None unless completed."""
+        if self.status != 'completed' or self.amount is None or self.created_at is None:
+            return None
+        month = timezone.localtime(self.created_at).date().replace(day=1)
+        key = (self.currency, self.project_id, self.payment_method, month)
+        return key, self.amount
 
 
 class DonationTier(models.Model):
@@ -134,3 +154,32 @@ class DonationTier(models.Model):
     
     def __str__(self):
         return f"{self.name} - {self.amount} {self.currency}"
+
+
+class DonationSummary(models.Model):
+    """
+    Completed donation totals per currency, project, payment method and month.
+    Maintained incrementally by funding.summary; read by the donation stats endpoint.
+    A deleted project's rows are folded into the no-project rows (funding.signals).
+    """
+    currency = models.CharField(max_length=3)
+    project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, null=True, blank=True, related_name='donation_summaries')
+    payment_method = models.CharField(max_length=20, choices=Donation.PAYMENT_METHOD_CHOICES)
+    month = models.DateField(help_text="First day of the month the donation was made")
+    donation_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-month', 'currency']
+        constraints = [
+            models.UniqueConstraint(fields=['currency', 'project', 'payment_method', 'month'],
+                                    name='funding_donationsummary_unique_key'),
+            # NULLs never clash in the constraint above: one no-project row per key needs its own
+            models.UniqueConstraint(fields=['currency', 'payment_method', 'month'], condition=models.Q(project__isnull=True),
+                                    name='funding_donationsummary_unique_key_no_project'),
+        ]
+        verbose_name_plural = 'Donation summaries'
+    
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.currency} {self.payment_method}: {self.total_amount}"
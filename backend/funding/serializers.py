@@ -1,12 +1,15 @@
 from rest_framework import serializers
 from .models import FundingSource, Sponsor, Donation, DonationTier
-from projects.serializers import ProjectListSerializer
+from core.serializers import DynamicFieldsMixin
+from projects.serializers import ProjectListSerializer, ProjectSummarySerializer
 
 
-class FundingSourceSerializer(serializers.ModelSerializer):
+class FundingSourceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     ministry_name = serializers.CharField(source='ministry.name', read_only=True)
     county_name = serializers.CharField(source='county.name', read_only=True)
     
+    select_related_fields = ('ministry', 'county')
+    
     class Meta:
         model = FundingSource
         fields = ['id', 'name', 'source_type', 'ministry', 'ministry_name',
@@ -15,7 +18,7 @@ class FundingSourceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class SponsorSerializer(serializers.ModelSerializer):
+class SponsorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Sponsor
         fields = ['id', 'name', 'organization_type', 'description', 'logo',
@@ -23,10 +26,12 @@ class SponsorSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class DonationSerializer(serializers.ModelSerializer):
-    project = ProjectListSerializer(read_only=True)
+class DonationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    project = ProjectSummarySerializer(read_only=True)
     sponsor = SponsorSerializer(read_only=True)
     
+    expandable_fields = {'project': ProjectListSerializer}
+    
     class Meta:
         model = Donation
         fields = ['id', 'donor_name', 'donor_email', 'donor_phone', 'is_anonymous',
@@ -43,7 +48,7 @@ class DonationCreateSerializer(serializers.ModelSerializer):
                   'amount', 'currency', 'payment_method', 'project', 'notes']
 
 
-class DonationTierSerializer(serializers.ModelSerializer):
+class DonationTierSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DonationTier
         fields = ['id', 'name', 'amount', 'currency', 'description', 'project', 
@@ -0,0 +1,40 @@
+"""Signal handlers for funding: keep DonationSummary in step with donation status changes and project deletions."""
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import summary
+from .models import Donation
+
+
+@receiver(pre_save, sender=Donation, dispatch_uid='funding_summary_snapshot_on_save')
+@receiver(pre_delete, sender=Donation, dispatch_uid='funding_summary_snapshot_on_delete')
+def snapshot_before_write(sender, instance, raw=False, **kwargs):
+    """
+    Lock the stored row and remember what it contributes now. The contribution
+    the instance was loaded with may be stale: two concurrent mark_completed
+    calls both load 'pending', but only the first sees it once locked.
+    """
+    if raw:
+        return
+    stored = None
+    if not instance._state.adding and instance.pk is not None:
+        stored = Donation.objects.select_for_update().filter(pk=instance.pk).only(*Donation.SUMMARY_FIELDS).first()
+    instance._summary_snapshot = stored.summary_contribution() if stored else None
+
+
+@receiver(post_save, sender=Donation, dispatch_uid='funding_summary_on_save')
+def update_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    summary.apply_change(instance.__dict__.pop('_summary_snapshot'), instance.summary_contribution())
+
+
+@receiver(post_delete, sender=Donation, dispatch_uid='funding_summary_on_delete')
+def update_summary_on_delete(sender, instance, **kwargs):
+    summary.apply_change(instance.__dict__.pop('_summary_snapshot'), None)
+
+
+@receiver(pre_delete, sender='projects.Project', dispatch_uid='funding_summary_fold_deleted_project')
+def fold_summary_on_project_delete(sender, instance, **kwargs):
+    """Donations of a deleted project are kept without it: fold its summary rows into the no-project rows."""
+    summary.fold_project(instance.pk)
@@ -0,0 +1,72 @@
+"""
+Incremental maintenance of DonationSummary.
+
+Each completed donation contributes (count 1, amount) to exactly one summary
+row. Before a donation is saved or deleted, its stored row is locked and its
+current contribution read (funding.signals), so a save only has to apply the
+difference between the old and new contribution: two single-row UPDATEs at
+most, no matter how many donations exist. Donation.save() runs the write and
+the summary update in one transaction, and the lock keeps concurrent saves of
+the same donation (a double-clicked mark_completed) from counting it twice.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Donation, DonationSummary
+
+
+def _apply(key, count_delta, amount_delta):
+    currency, project_id, payment_method, month = key
+    rows = DonationSummary.objects.filter(
+        currency=currency, project_id=project_id, payment_method=payment_method, month=month
+    )
+    if rows.update(donation_count=F('donation_count') + count_delta, total_amount=F('total_amount') + amount_delta):
+        return
+    try:
+        with transaction.atomic():
+            DonationSummary.objects.create(
+                currency=currency, project_id=project_id, payment_method=payment_method, month=month,
+                donation_count=count_delta, total_amount=amount_delta,
+            )
+    except IntegrityError:
+        # Created concurrently: the row exists now, so the UPDATE applies
+        rows.update(donation_count=F('donation_count') + count_delta, total_amount=F('total_amount') + amount_delta)
+
+
+def apply_change(old, new):
+    """Move a donation's contribution from old to new ((key, amount) pairs or None)."""
+    if old == new:
+        return
+    if old is not None:
+        _apply(old[0], -1, -old[1])
+    if new is not None:
+        _apply(new[0], 1, new[1])
+
+
+def fold_project(project_id):
+    """Move a project's rows into the matching no-project rows (its donations lose the project too)."""
+    with transaction.atomic():
+        rows = DonationSummary.objects.filter(project_id=project_id)
+        for currency, payment_method, month, count, amount in rows.values_list(
+            'currency', 'payment_method', 'month', 'donation_count', 'total_amount'
+        ):
+            _apply((currency, None, payment_method, month), count, amount)
+        rows.delete()
+
+
+def rebuild():
+    """Recompute the whole summary table from completed donations."""
+    with transaction.atomic():
+        DonationSummary.objects.all().delete()
+        totals = {}
+        for donation in Donation.objects.filter(status='completed').only(
+            'currency', 'project_id', 'payment_method', 'created_at', 'amount', 'status'
+        ).iterator():
+            key, amount = donation.summary_contribution()
+            count, total = totals.get(key, (0, 0))
+            totals[key] = (count + 1, total + amount)
+        DonationSummary.objects.bulk_create([
+            DonationSummary(currency=c, project_id=p, payment_method=m, month=month, donation_count=n, total_amount=t)
+            for (c, p, m, month), (n, t) in totals.items()
+        ], batch_size=500)
+    return len(totals)
@@ -3,30 +3,35 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import FundingSource, Sponsor, Donation, DonationTier
+from django.db.models import Sum
+from core.eager_loading import EagerLoadingMixin
+from core.pagination import KeysetPagination
+from .models import FundingSource, Sponsor, Donation, DonationTier, DonationSummary
 from .serializers import (
     FundingSourceSerializer, SponsorSerializer, DonationSerializer,
     DonationCreateSerializer, DonationTierSerializer
 )
 
 
-class FundingSourceViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = FundingSource.objects.select_related('ministry', 'county').all()
+class FundingSourceViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = FundingSource.objects.all()
     serializer_class = FundingSourceSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['source_type', 'ministry', 'county']
 
 
-class SponsorViewSet(viewsets.ReadOnlyModelViewSet):
+class SponsorViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Sponsor.objects.filter(is_active=True)
     serializer_class = SponsorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class DonationViewSet(viewsets.ModelViewSet):
-    queryset = Donation.objects.select_related('project', 'sponsor').all()
+class DonationViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = Donation.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    ordering = ['-created_at', '-id']
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'payment_method', 'project', 'currency']
     
@@ -36,11 +41,12 @@ class DonationViewSet(viewsets.ModelViewSet):
         return DonationSerializer
     
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_authenticated and user.is_admin_user:
-            return self.queryset
+            return queryset
         # Public users can only see completed donations (anonymous if requested)
-        return self.queryset.filter(status='completed')
+        return queryset.filter(status='completed')
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
     def mark_completed(self, request, pk=None):
@@ -56,19 +62,29 @@ class DonationViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get donation statistics"""
-        total_donations = Donation.objects.filter(status='completed').count()
-        total_amount = sum(
-            d.amount for d in Donation.objects.filter(status='completed')
+        """Completed donation totals by currency, project, payment method and month (from DonationSummary)"""
+        rows = DonationSummary.objects.filter(donation_count__gt=0)
+        sums = {'donations': Sum('donation_count'), 'total_amount': Sum('total_amount')}
+        
+        by_currency = list(rows.values('currency').annotate(**sums).order_by('currency'))
+        by_project = list(
+            rows.values('project', 'project__title', 'currency').annotate(**sums).order_by('-total_amount')
+        )
+        by_payment_method = list(
+            rows.values('payment_method', 'currency').annotate(**sums).order_by('payment_method', 'currency')
         )
+        by_month = list(rows.values('month', 'currency').annotate(**sums).order_by('-month', 'currency'))
         
         return Response({
-            'total_donations': total_donations,
-            'total_amount': total_amount,
+            'total_donations': sum(row['donations'] for row in by_currency),
+            'by_currency': by_currency,
+            'by_project': by_project,
+            'by_payment_method': by_payment_method,
+            'by_month': by_month,
         })
 
 
-class DonationTierViewSet(viewsets.ReadOnlyModelViewSet):
+class DonationTierViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = DonationTier.objects.filter(is_active=True).select_related('project')
     serializer_class = DonationTierSerializer
     permission_classes = [AllowAny]
@@ -1,5 +1,6 @@
 import re
 from django.db import models
+from django.db.models import Q
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from core.storage import get_storage
@@ -34,6 +35,9 @@ class GalleryItem(models.Model):
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Uploads that get responsive renditions (core.images); the thumbnail is one of them
+    rendition_fields = ('file',)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -58,6 +62,12 @@ class GalleryItem(models.Model):
             return self.url
         return None
 
+    def renditions_generated(self, field_name, manifest):
+        """Use the smallest JPEG rendition of an uploaded image as its thumbnail unless one was set."""
+        if field_name == 'file' and not self.thumbnail:
+            _, name = manifest['sources']['jpeg'][0]
+            GalleryItem.objects.filter(pk=self.pk).filter(Q(thumbnail='') | Q(thumbnail__isnull=True)).update(thumbnail=name)
+
     def get_embed_url(self):
         """Convert YouTube/Vimeo watch URL to embed URL for iframe. Returns None for non-embed videos."""
         if not self.url:
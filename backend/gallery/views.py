@@ -1,12 +1,13 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
+from core.eager_loading import EagerLoadingMixin
 from .models import GalleryItem
 from .serializers import GalleryItemSerializer
 
 
-class GalleryItemViewSet(viewsets.ModelViewSet):
-    queryset = GalleryItem.objects.select_related('project', 'event').all()
+class GalleryItemViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = GalleryItem.objects.all()
     serializer_class = GalleryItemSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
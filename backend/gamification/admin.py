@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Badge, MemberBadge, PointsTransaction, Leaderboard
+from .models import Badge, MemberBadge, PointsTransaction, Leaderboard, MemberMonthlyPoints
 
 
 @admin.register(Badge)
@@ -32,3 +32,14 @@ class LeaderboardAdmin(admin.ModelAdmin):
     list_filter = ['year', 'month', 'created_at']
     search_fields = ['member__user__username']
     ordering = ['year', 'month', 'rank']
+
+
+@admin.register(MemberMonthlyPoints)
+class MemberMonthlyPointsAdmin(admin.ModelAdmin):
+    list_display = ['year', 'month', 'member', 'total_points', 'updated_at']
+    list_filter = ['year', 'month']
+    search_fields = ['member__user__username']
+    readonly_fields = ['member', 'year', 'month', 'total_points', 'updated_at']
+    
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,63 @@
+"""
+Bulk points awards for an event's attendees or a project's members.
+
+Eligible members (confirmed EventRegistrations / active ProjectMembers) who
+don't already hold a transaction of the same type for the same event or project
+are resolved in one query, so re-running an award never pays anyone twice.
+Their transactions are inserted with one bulk_create, and the balances, the
+monthly leaderboard and badges are brought up to date for all of them at once
+rather than through per-row save signals.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from events.models import Event, EventRegistration
+from projects.models import Project, ProjectMember
+
+from . import badges, balances, leaderboard
+from .models import PointsTransaction
+
+DEFAULT_TRANSACTION_TYPES = {Event: 'event_attendance', Project: 'project_participation'}
+
+
+def _eligible(source):
+    if isinstance(source, Event):
+        return EventRegistration.objects.filter(event=source, is_confirmed=True, member__isnull=False)
+    if isinstance(source, Project):
+        return ProjectMember.objects.filter(project=source, is_active=True)
+    raise TypeError(f'Points can only be awarded for an Event or a Project, not {type(source).__name__}')
+
+
+def award_points(source, points, transaction_type=None, description='', created_by=None):
+    """
+    Give points to every eligible member of source (an Event or Project) not yet
+    awarded this transaction_type for it. Returns the ids of the members awarded.
+    """
+    model = type(source)
+    transaction_type = transaction_type or DEFAULT_TRANSACTION_TYPES[model]
+    link = model._meta.model_name  # 'event' / 'project' on PointsTransaction
+    description = description or f'{dict(PointsTransaction.TRANSACTION_TYPE_CHOICES)[transaction_type]}: {source}'
+    already_awarded = PointsTransaction.objects.filter(
+        member=OuterRef('member'), transaction_type=transaction_type, **{link: source},
+    )
+    with transaction.atomic():
+        # Serialise awards for the same source so concurrent requests can't both pass the check
+        model.objects.select_for_update().filter(pk=source.pk).exists()
+        member_ids = list(
+            _eligible(source).filter(~Exists(already_awarded))
+            .order_by().values_list('member_id', flat=True).distinct()
+        )
+        if not member_ids:
+            return []
+        created = PointsTransaction.objects.bulk_create([
+            PointsTransaction(member_id=member_id, points=points, transaction_type=transaction_type,
+                              description=description, created_by=created_by, **{link: source})
+            for member_id in member_ids
+        ], batch_size=1000)
+        balances.add_to_many(member_ids, points)
+        local = timezone.localtime(created[0].created_at)
+        leaderboard.add_points_many(member_ids, local.year, local.month, points)
+        if points > 0:
+            badges.award(member_ids)
+    return member_ids
@@ -0,0 +1,73 @@
+"""
+Automatic badge awards from points thresholds.
+
+Active badges with a positive points_required are earned automatically once a
+member's points balance reaches it (badges left at 0 are awarded by hand). The
+thresholds are cached in ascending order (core.cache, invalidated whenever a
+Badge changes), so the badges a balance qualifies for are a bisect away and
+evaluating a member costs no badge queries. award() handles any number of
+members with a fixed number of queries: their balances, the badges they already
+hold, then one bulk insert each for MemberBadge and the matching badge_earned
+PointsTransaction log entries (worth 0 points, so balances are unaffected).
+"""
+from bisect import bisect_right
+
+from django.db import transaction
+
+from core import cache as site_cache
+from members.models import MemberProfile
+
+from .models import Badge, MemberBadge, PointsTransaction
+
+
+def _load_thresholds():
+    badges = Badge.objects.filter(is_active=True, points_required__gt=0).order_by('points_required', 'pk')
+    rows = list(badges.values_list('points_required', 'pk', 'name'))
+    return [points for points, _, _ in rows], [(pk, name) for _, pk, name in rows]
+
+
+def thresholds():
+    """(ascending points thresholds, matching [(badge id, name)]) of the automatically awarded badges."""
+    return site_cache.cached('badge_thresholds', _load_thresholds, depends_on=[Badge])
+
+
+def qualifying_badges(balance):
+    """[(badge id, name)] of the automatic badges a points balance has reached."""
+    points, badges = thresholds()
+    return badges[:bisect_right(points, balance)]
+
+
+def award(member_ids):
+    """Award every automatic badge the given members have reached but don't hold; returns the number awarded."""
+    points, _ = thresholds()
+    if not points or not member_ids:
+        return 0
+    with transaction.atomic():
+        # Locking the members serialises concurrent evaluations, so each badge is logged once
+        balances = dict(
+            MemberProfile.objects.select_for_update()
+            .filter(pk__in=member_ids, points_balance__gte=points[0])
+            .values_list('pk', 'points_balance')
+        )
+        if not balances:
+            return 0
+        held = set(MemberBadge.objects.filter(member_id__in=balances).values_list('member_id', 'badge_id'))
+        earned = [
+            (member_id, badge_id, name)
+            for member_id, balance in balances.items()
+            for badge_id, name in qualifying_badges(balance)
+            if (member_id, badge_id) not in held
+        ]
+        if not earned:
+            return 0
+        MemberBadge.objects.bulk_create(
+            [MemberBadge(member_id=member_id, badge_id=badge_id) for member_id, badge_id, _ in earned],
+            batch_size=1000, ignore_conflicts=True,
+        )
+        # bulk_create skips the save signals: 0-point entries don't touch balances or the leaderboard
+        PointsTransaction.objects.bulk_create([
+            PointsTransaction(member_id=member_id, points=0, transaction_type='badge_earned',
+                              description=f'Earned the {name} badge')
+            for member_id, _, name in earned
+        ], batch_size=1000)
+    return len(earned)
@@ -0,0 +1,61 @@
+"""
+Member points balances (MemberProfile.points_balance).
+
+Each PointsTransaction write adds its delta to the member's balance with an
+F() update inside the transaction that writes the row (PointsTransaction.save()
+is atomic), so reading a balance is a single column and never a SUM over the
+ledger. reconcile() compares balances with the ledger and repairs drift left
+by bulk operations or raw SQL.
+"""
+from collections import defaultdict
+
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from members.models import MemberProfile
+
+from .models import PointsTransaction
+
+
+def apply_change(old, new):
+    """
+    Move balances from ledger entry old to new (PointsTransaction.ledger_entry();
+    either may be None). Returns the ids of members whose balance went up.
+    """
+    deltas = defaultdict(int)
+    if old is not None:
+        deltas[old[0]] -= old[3]
+    if new is not None:
+        deltas[new[0]] += new[3]
+    for member_id, delta in deltas.items():
+        if delta:
+            MemberProfile.objects.filter(pk=member_id).update(points_balance=F('points_balance') + delta)
+    return [member_id for member_id, delta in deltas.items() if delta > 0]
+
+
+def add_to_many(member_ids, points):
+    """Add the same points to many balances with one UPDATE (bulk awards)."""
+    if points and member_ids:
+        MemberProfile.objects.filter(pk__in=member_ids).update(points_balance=F('points_balance') + points)
+
+
+def _ledger_total():
+    total = (
+        PointsTransaction.objects.filter(member=OuterRef('pk'))
+        .order_by().values('member').annotate(total=Sum('points')).values('total')
+    )
+    return Coalesce(Subquery(total), 0)
+
+
+def drifted():
+    """(member id, stored balance, ledger total) for every member whose balance is wrong."""
+    return list(
+        MemberProfile.objects.annotate(ledger_total=_ledger_total())
+        .exclude(points_balance=F('ledger_total'))
+        .values_list('pk', 'points_balance', 'ledger_total')
+    )
+
+
+def repair(member_ids):
+    """Set balances to their ledger totals in one UPDATE (computed in SQL, so no write is lost)."""
+    return MemberProfile.objects.filter(pk__in=member_ids).update(points_balance=_ledger_total())
@@ -0,0 +1,204 @@
+"""
+Live monthly leaderboard.
+
+MemberMonthlyPoints holds each member's running total for a month, and
+LeaderboardScore holds one row per distinct total with its dense rank and the
+number of members on it. A points change updates the member's row and at most
+two score rows. The other scores' ranks shift with a single UPDATE, and only
+when a total first appears or its last member leaves, so nobody is re-ranked
+from scratch. A member's rank is two unique-index lookups (their total, then
+that total's score row), i.e. O(log n) whatever the number of members.
+
+Writes for a month are serialised on its LeaderboardPeriod row so concurrent
+awards can't interleave rank shifts. snapshot() copies a month's standings
+into Leaderboard rows; rebuild() recomputes a month from PointsTransaction.
+Bulk awards (add_points_many()) move many totals at once and regenerate the
+month's score rows in one aggregate instead of shifting ranks per member.
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from .models import Leaderboard, LeaderboardPeriod, LeaderboardScore, MemberBadge, MemberMonthlyPoints, PointsTransaction
+
+
+def current_period():
+    now = timezone.localtime()
+    return now.year, now.month
+
+
+def previous_period(year, month):
+    return (year, month - 1) if month > 1 else (year - 1, 12)
+
+
+def period_bounds(year, month):
+    """Aware [start, end) datetimes of a month in the site timezone."""
+    next_year, next_month = (year, month + 1) if month < 12 else (year + 1, 1)
+    return timezone.make_aware(datetime(year, month, 1)), timezone.make_aware(datetime(next_year, next_month, 1))
+
+
+def _lock_period(year, month):
+    LeaderboardPeriod.objects.get_or_create(year=year, month=month)
+    return LeaderboardPeriod.objects.select_for_update().get(year=year, month=month)
+
+
+def _scores(year, month):
+    return LeaderboardScore.objects.filter(year=year, month=month)
+
+
+def _leave_score(year, month, total):
+    scores = _scores(year, month)
+    scores.filter(total_points=total).update(member_count=F('member_count') - 1)
+    deleted, _ = scores.filter(total_points=total, member_count=0).delete()
+    if deleted:
+        scores.filter(total_points__lt=total).update(rank=F('rank') - 1)
+
+
+def _join_score(year, month, total):
+    scores = _scores(year, month)
+    if scores.filter(total_points=total).update(member_count=F('member_count') + 1):
+        return
+    above = scores.filter(total_points__gt=total).count()
+    scores.filter(total_points__lt=total).update(rank=F('rank') + 1)
+    LeaderboardScore.objects.create(year=year, month=month, total_points=total, member_count=1, rank=above + 1)
+
+
+def add_points(member_id, year, month, points, reversal=False):
+    """
+    Add points (negative to deduct) to a member's total for a month and move
+    their rank. A reversal undoes earlier points, so a member without a total
+    (e.g. one being deleted) is left alone.
+    """
+    if not points:
+        return
+    with transaction.atomic():
+        _lock_period(year, month)
+        rows = MemberMonthlyPoints.objects.select_for_update()
+        if reversal:
+            row, created = rows.filter(member_id=member_id, year=year, month=month).first(), False
+            if row is None:
+                return
+        else:
+            row, created = rows.get_or_create(member_id=member_id, year=year, month=month)
+        old_total = None if created else row.total_points
+        row.total_points += points
+        row.save(update_fields=['total_points', 'updated_at'])
+        if old_total is not None:
+            _leave_score(year, month, old_total)
+        _join_score(year, month, row.total_points)
+
+
+def add_points_many(member_ids, year, month, points):
+    """
+    Add the same points to many members' totals for a month in one pass (bulk
+    awards): one UPDATE for existing totals, one insert for new ones, then the
+    month's score rows are regenerated from the totals in a single aggregate.
+    """
+    if not points or not member_ids:
+        return
+    with transaction.atomic():
+        _lock_period(year, month)
+        rows = MemberMonthlyPoints.objects.filter(year=year, month=month, member_id__in=member_ids)
+        existing = set(rows.values_list('member_id', flat=True))
+        rows.update(total_points=F('total_points') + points, updated_at=timezone.now())
+        MemberMonthlyPoints.objects.bulk_create([
+            MemberMonthlyPoints(member_id=member_id, year=year, month=month, total_points=points)
+            for member_id in set(member_ids) - existing
+        ], batch_size=1000)
+        _rescore(year, month)
+
+
+def apply_change(old, new):
+    """Move the totals from ledger entry old to new (PointsTransaction.ledger_entry(); either may be None)."""
+    if old == new:
+        return
+    if old is not None:
+        member_id, year, month, points = old
+        add_points(member_id, year, month, -points, reversal=True)
+    if new is not None:
+        add_points(*new)
+
+
+def remove_total(row):
+    """Take a deleted MemberMonthlyPoints row out of its month's ranks."""
+    with transaction.atomic():
+        _lock_period(row.year, row.month)
+        _leave_score(row.year, row.month, row.total_points)
+
+
+def member_rank(member_id, year=None, month=None):
+    """{'year', 'month', 'total_points', 'rank'} for a member, or None if they have no points that month."""
+    if year is None or month is None:
+        year, month = current_period()
+    total = (
+        MemberMonthlyPoints.objects.filter(member_id=member_id, year=year, month=month)
+        .values_list('total_points', flat=True).first()
+    )
+    if total is None:
+        return None
+    rank = _scores(year, month).filter(total_points=total).values_list('rank', flat=True).first()
+    return {'year': year, 'month': month, 'total_points': total, 'rank': rank}
+
+
+def standings(year=None, month=None):
+    """MemberMonthlyPoints for a month, best first, annotated with each member's dense rank."""
+    if year is None or month is None:
+        year, month = current_period()
+    rank = _scores(year, month).filter(total_points=OuterRef('total_points')).values('rank')[:1]
+    return (
+        MemberMonthlyPoints.objects.filter(year=year, month=month)
+        .annotate(rank=Subquery(rank))
+        .order_by('-total_points', 'member_id')
+    )
+
+
+def snapshot(year, month):
+    """Replace the Leaderboard rows for a month with its current standings; returns the row count."""
+    badges = (
+        MemberBadge.objects.filter(member=OuterRef('member'))
+        .order_by().values('member').annotate(n=Count('pk')).values('n')
+    )
+    rows = standings(year, month).annotate(badges=Subquery(badges)).values_list('member_id', 'total_points', 'rank', 'badges')
+    with transaction.atomic():
+        period = _lock_period(year, month)
+        Leaderboard.objects.filter(year=year, month=month).delete()
+        entries = Leaderboard.objects.bulk_create([
+            Leaderboard(year=year, month=month, member_id=member_id, total_points=total, rank=rank, badges_count=n or 0)
+            for member_id, total, rank, n in rows.iterator()
+        ], batch_size=1000)
+        period.snapshot_at = timezone.now()
+        period.save(update_fields=['snapshot_at'])
+    return len(entries)
+
+
+def _rescore(year, month):
+    """Regenerate a month's score rows (dense ranks) from its MemberMonthlyPoints; call with the period locked."""
+    members_per_total = dict(
+        MemberMonthlyPoints.objects.filter(year=year, month=month)
+        .order_by().values('total_points').annotate(n=Count('pk')).values_list('total_points', 'n')
+    )
+    _scores(year, month).delete()
+    LeaderboardScore.objects.bulk_create([
+        LeaderboardScore(year=year, month=month, total_points=total, member_count=members_per_total[total], rank=rank)
+        for rank, total in enumerate(sorted(members_per_total, reverse=True), start=1)
+    ], batch_size=1000)
+
+
+def rebuild(year, month):
+    """Recompute a month's totals and ranks from its PointsTransaction rows; returns the member count."""
+    start, end = period_bounds(year, month)
+    with transaction.atomic():
+        _lock_period(year, month)
+        totals = dict(
+            PointsTransaction.objects.filter(created_at__gte=start, created_at__lt=end)
+            .order_by().values('member').annotate(total=Sum('points')).values_list('member', 'total')
+        )
+        MemberMonthlyPoints.objects.filter(year=year, month=month).delete()
+        MemberMonthlyPoints.objects.bulk_create([
+            MemberMonthlyPoints(member_id=member_id, year=year, month=month, total_points=total)
+            for member_id, total in totals.items()
+        ], batch_size=1000)
+        _rescore(year, month)
+    return len(totals)
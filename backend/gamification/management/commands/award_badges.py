@@ -0,0 +1,35 @@
+"""
+Award the automatic (points threshold) badges every member has already earned,
+e.g. after adding a badge or lowering a threshold. Members are processed in
+primary key batches, each with a fixed number of queries (gamification.badges),
+so the run never issues a query per member or per member-badge pair.
+"""
+from django.core.management.base import BaseCommand
+
+from gamification import badges
+from members.models import MemberProfile
+
+
+class Command(BaseCommand):
+    help = 'Award points-threshold badges to all members who have reached them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Members per batch (default 500)')
+
+    def handle(self, *args, **options):
+        points, _ = badges.thresholds()
+        if not points:
+            self.stdout.write(self.style.SUCCESS('No active badges with a points threshold.'))
+            return
+        # Only members who have reached the lowest threshold can earn anything
+        candidates = MemberProfile.objects.filter(points_balance__gte=points[0]).order_by('pk')
+        awarded = members = 0
+        last_pk = 0
+        while True:
+            batch = list(candidates.filter(pk__gt=last_pk).values_list('pk', flat=True)[:options['batch_size']])
+            if not batch:
+                break
+            awarded += badges.award(batch)
+            members += len(batch)
+            last_pk = batch[-1]
+        self.stdout.write(self.style.SUCCESS(f'Awarded {awarded} badges across {members} members.'))
@@ -0,0 +1,27 @@
+"""
+Check every member's points_balance against the PointsTransaction ledger and,
+with --fix, repair the ones that drifted (bulk_create, QuerySet.update() or raw
+SQL skip the save signals that keep balances current).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from gamification import balances
+
+
+class Command(BaseCommand):
+    help = 'Compare member points balances with the ledger (and repair them with --fix)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Reset drifted balances to the ledger total')
+
+    def handle(self, *args, **options):
+        rows = balances.drifted()
+        for member_id, stored, total in rows:
+            self.stdout.write(f'  member {member_id}: balance {stored}, ledger {total}')
+        if not rows:
+            self.stdout.write(self.style.SUCCESS('All points balances match the ledger.'))
+        elif options['fix']:
+            fixed = balances.repair([member_id for member_id, _, _ in rows])
+            self.stdout.write(self.style.SUCCESS(f'Repaired {fixed} points balances.'))
+        else:
+            raise CommandError(f'{len(rows)} points balances differ from the ledger; run with --fix to repair.')
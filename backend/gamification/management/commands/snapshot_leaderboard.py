@@ -0,0 +1,28 @@
+"""
+Month-end leaderboard job: write Leaderboard rows for a month from the live
+standings. Schedule it early on the 1st (e.g. cron `5 0 1 * *`) to snapshot the
+month that just ended; --rebuild first recomputes the month's totals from
+PointsTransaction (after imports or QuerySet.update() calls that bypass signals).
+"""
+from django.core.management.base import BaseCommand
+
+from gamification import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Snapshot a month of live standings into Leaderboard (default: last month)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int)
+        parser.add_argument('--month', type=int)
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute totals and ranks from PointsTransaction first')
+
+    def handle(self, *args, **options):
+        year, month = leaderboard.previous_period(*leaderboard.current_period())
+        year, month = options['year'] or year, options['month'] or month
+        if options['rebuild']:
+            members = leaderboard.rebuild(year, month)
+            self.stdout.write(f'  rebuilt totals for {members} members')
+        rows = leaderboard.snapshot(year, month)
+        self.stdout.write(self.style.SUCCESS(f'Leaderboard {year}-{month:02d}: {rows} rows written.'))
@@ -0,0 +1,84 @@
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def build_leaderboard(apps, schema_editor):
+    PointsTransaction = apps.get_model('gamification', 'PointsTransaction')
+    MemberMonthlyPoints = apps.get_model('gamification', 'MemberMonthlyPoints')
+    LeaderboardScore = apps.get_model('gamification', 'LeaderboardScore')
+    totals = defaultdict(int)
+    for member_id, created_at, points in PointsTransaction.objects.values_list('member_id', 'created_at', 'points').iterator():
+        local = timezone.localtime(created_at)
+        totals[(member_id, local.year, local.month)] += points
+    MemberMonthlyPoints.objects.bulk_create([
+        MemberMonthlyPoints(member_id=member_id, year=year, month=month, total_points=total)
+        for (member_id, year, month), total in totals.items()
+    ], batch_size=1000)
+    per_month = defaultdict(Counter)
+    for (_, year, month), total in totals.items():
+        per_month[(year, month)][total] += 1
+    LeaderboardScore.objects.bulk_create([
+        LeaderboardScore(year=year, month=month, total_points=total, member_count=members[total], rank=rank)
+        for (year, month), members in per_month.items()
+        for rank, total in enumerate(sorted(members, reverse=True), start=1)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_alter_certificate_certificate_file_and_more'),
+        ('gamification', '0003_alter_badge_icon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('snapshot_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('total_points', models.IntegerField()),
+                ('member_count', models.PositiveIntegerField(default=0)),
+                ('rank', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ['year', 'month', 'rank'],
+                'unique_together': {('year', 'month', 'total_points')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MemberMonthlyPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('total_points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_points', to='members.memberprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'Member monthly points',
+                'ordering': ['year', 'month', '-total_points'],
+                'indexes': [models.Index(fields=['year', 'month', '-total_points'], name='gamificatio_year_83b70a_idx')],
+                'unique_together': {('member', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(build_leaderboard, migrations.RunPython.noop),
+    ]
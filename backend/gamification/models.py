@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 from core.storage import get_storage
 
 
@@ -82,6 +83,32 @@ class PointsTransaction(models.Model):
     
     def __str__(self):
         return f"{self.member.user.username} - {self.points} points - {self.transaction_type}"
+    
+    LEDGER_FIELDS = {'member_id', 'points', 'created_at'}
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this row added to the running totals so saves can apply a delta
+        if not (instance.get_deferred_fields() & cls.LEDGER_FIELDS):
+            instance._ledger_snapshot = instance.ledger_entry()
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # Running totals are updated by post_save handlers: keep them in this transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+    
+    def ledger_entry(self):
+        """(member_id, year, month, points) this transaction adds to the monthly totals."""
+        if self.member_id is None or not self.points:
+            return None
+        when = timezone.localtime(self.created_at) if self.created_at else timezone.localtime()
+        return self.member_id, when.year, when.month, self.points
 
 
 class Leaderboard(models.Model):
@@ -105,3 +132,60 @@ class Leaderboard(models.Model):
     
     def __str__(self):
         return f"{self.year}-{self.month:02d} - {self.member.user.username} - Rank {self.rank}"
+
+
+class LeaderboardPeriod(models.Model):
+    """
+    One row per leaderboard month: writers lock it so rank updates for the
+    month never interleave, and the month-end job records its snapshot here.
+    """
+    year = models.IntegerField()
+    month = models.IntegerField()
+    snapshot_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['year', 'month']
+        ordering = ['-year', '-month']
+    
+    def __str__(self):
+        return f"{self.year}-{self.month:02d}"
+
+
+class MemberMonthlyPoints(models.Model):
+    """
+    A member's running points total for one month (kept current by gamification.leaderboard)
+    """
+    member = models.ForeignKey('members.MemberProfile', on_delete=models.CASCADE, related_name='monthly_points')
+    year = models.IntegerField()
+    month = models.IntegerField()
+    total_points = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['member', 'year', 'month']
+        ordering = ['year', 'month', '-total_points']
+        verbose_name_plural = 'Member monthly points'
+        indexes = [
+            models.Index(fields=['year', 'month', '-total_points']),
+        ]
+    
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} - {self.member_id} - {self.total_points} points"
+
+
+class LeaderboardScore(models.Model):
+    """
+    A distinct monthly total, how many members have it and its dense rank
+    """
+    year = models.IntegerField()
+    month = models.IntegerField()
+    total_points = models.IntegerField()
+    member_count = models.PositiveIntegerField(default=0)
+    rank = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ['year', 'month', 'total_points']
+        ordering = ['year', 'month', 'rank']
+    
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} - {self.total_points} points - Rank {self.rank}"
@@ -1,9 +1,12 @@
 from rest_framework import serializers
-from .models import Badge, MemberBadge, PointsTransaction, Leaderboard
-from members.serializers import MemberProfileSerializer
+from .models import Badge, MemberBadge, PointsTransaction, Leaderboard, MemberMonthlyPoints
+from core.serializers import DynamicFieldsMixin
+from events.models import Event
+from projects.models import Project
+from members.serializers import MemberProfileSerializer, MemberProfileSummarySerializer
 
 
-class BadgeSerializer(serializers.ModelSerializer):
+class BadgeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Badge
         fields = ['id', 'name', 'slug', 'description', 'icon', 'icon_class',
@@ -11,9 +14,11 @@ class BadgeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class MemberBadgeSerializer(serializers.ModelSerializer):
+class MemberBadgeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     badge = BadgeSerializer(read_only=True)
-    member = MemberProfileSerializer(read_only=True)
+    member = MemberProfileSummarySerializer(read_only=True)
+    
+    expandable_fields = {'member': MemberProfileSerializer}
     
     class Meta:
         model = MemberBadge
@@ -21,8 +26,10 @@ class MemberBadgeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'earned_date']
 
 
-class PointsTransactionSerializer(serializers.ModelSerializer):
-    member = MemberProfileSerializer(read_only=True)
+class PointsTransactionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    member = MemberProfileSummarySerializer(read_only=True)
+    
+    expandable_fields = {'member': MemberProfileSerializer}
     
     class Meta:
         model = PointsTransaction
@@ -31,11 +38,45 @@ class PointsTransactionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class LeaderboardSerializer(serializers.ModelSerializer):
-    member = MemberProfileSerializer(read_only=True)
+class BulkPointsAwardSerializer(serializers.Serializer):
+    """Input for PointsTransactionViewSet.bulk_award: one event or project and the points rule"""
+    event = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all(), required=False)
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all(), required=False)
+    points = serializers.IntegerField()
+    transaction_type = serializers.ChoiceField(choices=PointsTransaction.TRANSACTION_TYPE_CHOICES, required=False)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    
+    def validate_points(self, value):
+        if value == 0:
+            raise serializers.ValidationError('Points must not be zero.')
+        return value
+    
+    def validate(self, attrs):
+        if bool(attrs.get('event')) == bool(attrs.get('project')):
+            raise serializers.ValidationError('Give either an event or a project.')
+        return attrs
+
+
+class LeaderboardSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    member = MemberProfileSummarySerializer(read_only=True)
+    
+    expandable_fields = {'member': MemberProfileSerializer}
     
     class Meta:
         model = Leaderboard
         fields = ['id', 'year', 'month', 'member', 'total_points', 'rank',
                   'badges_count', 'created_at']
         read_only_fields = ['id', 'created_at']
+
+
+class LeaderboardStandingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Live standing from gamification.leaderboard.standings() (rank is annotated)"""
+    member = MemberProfileSummarySerializer(read_only=True)
+    rank = serializers.IntegerField(read_only=True)
+    
+    expandable_fields = {'member': MemberProfileSerializer}
+    column_dependencies = {'rank': ()}
+    
+    class Meta:
+        model = MemberMonthlyPoints
+        fields = ['year', 'month', 'member', 'total_points', 'rank']
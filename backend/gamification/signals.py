@@ -0,0 +1,60 @@
+"""Signal handlers for gamification: keep points balances, badges and the live leaderboard in step with points transactions."""
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from core import cache as site_cache
+
+from . import badges, balances, leaderboard
+from .models import Badge, MemberMonthlyPoints, PointsTransaction
+
+# Badge thresholds are cached for the award engine
+site_cache.track(Badge)
+
+
+def _ensure_snapshot(instance):
+    """Deferred loads skip the snapshot in from_db; read the stored row instead."""
+    if hasattr(instance, '_ledger_snapshot'):
+        return
+    stored = None
+    if not instance._state.adding and instance.pk is not None:
+        stored = PointsTransaction.objects.filter(pk=instance.pk).first()
+    instance._ledger_snapshot = stored.ledger_entry() if stored else None
+
+
+@receiver(pre_save, sender=PointsTransaction, dispatch_uid='gamification_ledger_snapshot_on_save')
+@receiver(pre_delete, sender=PointsTransaction, dispatch_uid='gamification_ledger_snapshot_on_delete')
+def snapshot_before_write(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _ensure_snapshot(instance)
+
+
+@receiver(post_save, sender=PointsTransaction, dispatch_uid='gamification_leaderboard_on_save')
+def update_leaderboard_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new = instance.ledger_entry()
+    badges.award(balances.apply_change(instance._ledger_snapshot, new))
+    leaderboard.apply_change(instance._ledger_snapshot, new)
+    instance._ledger_snapshot = new
+
+
+def _deleted_directly(model, origin):
+    """True unless the delete cascaded from another model (only a member's deletion cascades here)."""
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
+
+@receiver(post_delete, sender=PointsTransaction, dispatch_uid='gamification_leaderboard_on_delete')
+def update_leaderboard_on_delete(sender, instance, origin=None, **kwargs):
+    # A deleted member's totals leave the ranks with their MemberMonthlyPoints rows (below), using
+    # the totals the cascade loaded up front; reversing transactions as well would count them twice.
+    # Their balance goes with the profile row.
+    if _deleted_directly(PointsTransaction, origin):
+        badges.award(balances.apply_change(instance._ledger_snapshot, None))
+        leaderboard.apply_change(instance._ledger_snapshot, None)
+
+
+@receiver(post_delete, sender=MemberMonthlyPoints, dispatch_uid='gamification_leaderboard_on_total_delete')
+def update_leaderboard_on_total_delete(sender, instance, origin=None, **kwargs):
+    """Totals removed by a cascade (a member being deleted) leave the ranks; the engine's own deletes don't."""
+    if not _deleted_directly(MemberMonthlyPoints, origin):
+        leaderboard.remove_total(instance)
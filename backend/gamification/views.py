@@ -1,49 +1,56 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
-from django.db.models import Sum, Count
-from django.utils import timezone
+from . import leaderboard as leaderboard_engine
+from .awards import award_points
 from .models import Badge, MemberBadge, PointsTransaction, Leaderboard
 from .serializers import (
     BadgeSerializer, MemberBadgeSerializer, PointsTransactionSerializer,
-    LeaderboardSerializer
+    LeaderboardSerializer, LeaderboardStandingSerializer, BulkPointsAwardSerializer
 )
 from members.models import MemberProfile
+from core.eager_loading import EagerLoadingMixin, setup_eager_loading
+from core.pagination import KeysetPagination
 
 
-class BadgeViewSet(viewsets.ReadOnlyModelViewSet):
+class BadgeViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Badge.objects.filter(is_active=True)
     serializer_class = BadgeSerializer
     permission_classes = [IsAuthenticated]
 
 
-class MemberBadgeViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = MemberBadge.objects.select_related('member__user', 'badge').all()
+class MemberBadgeViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = MemberBadge.objects.all()
     serializer_class = MemberBadgeSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_admin_user:
-            return self.queryset
+            return queryset
         if hasattr(user, 'member_profile'):
-            return self.queryset.filter(member=user.member_profile)
-        return self.queryset.none()
+            return queryset.filter(member=user.member_profile)
+        return queryset.none()
 
 
-class PointsTransactionViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = PointsTransaction.objects.select_related('member__user', 'project', 'event').all()
+class PointsTransactionViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = PointsTransaction.objects.all()
     serializer_class = PointsTransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering = ['-created_at', '-id']
     
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_admin_user:
-            return self.queryset
+            return queryset
         if hasattr(user, 'member_profile'):
-            return self.queryset.filter(member=user.member_profile)
-        return self.queryset.none()
+            return queryset.filter(member=user.member_profile)
+        return queryset.none()
     
     @action(detail=False, methods=['get'])
     def my_points(self, request):
@@ -52,33 +59,65 @@ class PointsTransactionViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'total_points': 0, 'transactions': []})
         
         member = request.user.member_profile
-        total_points = PointsTransaction.objects.filter(member=member).aggregate(
-            total=Sum('points')
-        )['total'] or 0
-        
-        recent_transactions = PointsTransaction.objects.filter(member=member)[:10]
+        recent_transactions = self.eager_load(PointsTransaction.objects.filter(member=member))[:10]
         serializer = self.get_serializer(recent_transactions, many=True)
         
         return Response({
-            'total_points': total_points,
+            'total_points': member.points_balance,
             'recent_transactions': serializer.data
         })
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def bulk_award(self, request):
+        """Award points to an event's confirmed attendees or a project's active members (once per member and type)"""
+        serializer = BulkPointsAwardSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        member_ids = award_points(
+            data.get('event') or data['project'], data['points'],
+            transaction_type=data.get('transaction_type'), description=data['description'],
+            created_by=request.user,
+        )
+        created = status.HTTP_201_CREATED if member_ids else status.HTTP_200_OK
+        return Response({'awarded': len(member_ids), 'member_ids': member_ids}, status=created)
 
 
-class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Leaderboard.objects.select_related('member__user').all()
+class LeaderboardViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Leaderboard.objects.all()
     serializer_class = LeaderboardSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        year = self.request.query_params.get('year', timezone.now().year)
-        month = self.request.query_params.get('month', timezone.now().month)
-        return self.queryset.filter(year=year, month=month).order_by('rank')[:100]
+        year, month = self._period(self.request)
+        return super().get_queryset().filter(year=year, month=month).order_by('rank')[:100]
+    
+    def _period(self, request):
+        """(year, month) from ?year=&month= (default: the current month); 400 on bad values."""
+        year, month = leaderboard_engine.current_period()
+        try:
+            year = int(request.query_params.get('year', year))
+            month = int(request.query_params.get('month', month))
+            if not 1900 <= year <= 2100 or not 1 <= month <= 12:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({'error': 'year must be an integer from 1900 to 2100 and month one from 1 to 12'})
+        return year, month
     
     @action(detail=False, methods=['get'])
     def current(self, request):
-        """Get current month's leaderboard"""
-        now = timezone.now()
-        leaderboard = self.queryset.filter(year=now.year, month=now.month).order_by('rank')[:20]
-        serializer = self.get_serializer(leaderboard, many=True)
+        """Live standings for the current month (top 20; ?year=&month= for another month)"""
+        year, month = self._period(request)
+        standings = leaderboard_engine.standings(year, month)
+        serializer = LeaderboardStandingSerializer(
+            setup_eager_loading(LeaderboardStandingSerializer, standings)[:20],
+            many=True, context=self.get_serializer_context(),
+        )
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def my_rank(self, request):
+        """Current user's live total and dense rank for the month"""
+        year, month = self._period(request)
+        member = getattr(request.user, 'member_profile', None)
+        standing = leaderboard_engine.member_rank(member.pk, year, month) if member else None
+        return Response(standing or {'year': year, 'month': month, 'total_points': 0, 'rank': None})
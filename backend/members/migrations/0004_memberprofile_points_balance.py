@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_points_balance(apps, schema_editor):
+    MemberProfile = apps.get_model('members', 'MemberProfile')
+    PointsTransaction = apps.get_model('gamification', 'PointsTransaction')
+    total = (
+        PointsTransaction.objects.filter(member=OuterRef('pk'))
+        .order_by().values('member').annotate(total=Sum('points')).values('total')
+    )
+    MemberProfile.objects.update(points_balance=Coalesce(Subquery(total), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_alter_certificate_certificate_file_and_more'),
+        ('gamification', '0004_leaderboard_engine'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memberprofile',
+            name='points_balance',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_points_balance, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,10 @@
 from django.db import models
 from django.conf import settings
+from core.models import CounterFieldsMixin
 from core.storage import get_storage
 
 
-class MemberProfile(models.Model):
+class MemberProfile(CounterFieldsMixin, models.Model):
     """
     Extended profile for members
     """
@@ -27,6 +28,11 @@ class MemberProfile(models.Model):
     emergency_contact_phone = models.CharField(max_length=15, blank=True)
     joined_date = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    # Sum of the member's PointsTransaction rows, kept current by gamification.balances
+    # with F() updates; saves of an existing profile leave it out (COUNTER_FIELDS)
+    points_balance = models.IntegerField(default=0, editable=False)
+    
+    COUNTER_FIELDS = ('points_balance',)
     
     class Meta:
         ordering = ['-joined_date']
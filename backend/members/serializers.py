@@ -1,9 +1,9 @@
 from rest_framework import serializers
-from core.serializers import UserSerializer
+from core.serializers import DynamicFieldsMixin, UserSerializer, UserSummarySerializer
 from .models import MemberProfile, Certificate
 
 
-class CertificateSerializer(serializers.ModelSerializer):
+class CertificateSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Certificate
         fields = ['id', 'title', 'description', 'issued_by', 'issue_date', 
@@ -11,19 +11,22 @@ class CertificateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class MemberProfileSerializer(serializers.ModelSerializer):
+class MemberProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     certificates = CertificateSerializer(many=True, read_only=True)
     skills_list = serializers.SerializerMethodField()
     interests_list = serializers.SerializerMethodField()
     
+    column_dependencies = {'skills_list': ('skills',), 'interests_list': ('interests',)}
+    
     class Meta:
         model = MemberProfile
         fields = ['id', 'user', 'profile_picture', 'date_of_birth', 'gender', 
                   'id_number', 'address', 'county', 'skills', 'interests', 
                   'skills_list', 'interests_list', 'bio', 'emergency_contact_name',
-                  'emergency_contact_phone', 'joined_date', 'is_active', 'certificates']
-        read_only_fields = ['id', 'joined_date']
+                  'emergency_contact_phone', 'joined_date', 'is_active', 'points_balance',
+                  'certificates']
+        read_only_fields = ['id', 'joined_date', 'points_balance']
     
     def get_skills_list(self, obj):
         return [s.strip() for s in obj.skills.split(',')] if obj.skills else []
@@ -32,6 +35,15 @@ class MemberProfileSerializer(serializers.ModelSerializer):
         return [i.strip() for i in obj.interests.split(',')] if obj.interests else []
 
 
+class MemberProfileSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact profile embedded by other serializers; ?expand= gives the full MemberProfileSerializer"""
+    user = UserSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = MemberProfile
+        fields = ['id', 'user', 'profile_picture', 'county']
+
+
 class MemberProfileCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = MemberProfile
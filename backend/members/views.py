@@ -6,13 +6,14 @@ from django.shortcuts import get_object_or_404
 from .models import MemberProfile, Certificate
 from .serializers import MemberProfileSerializer, MemberProfileCreateSerializer, CertificateSerializer
 from core.models import User
+from core.eager_loading import EagerLoadingMixin
 
 
-class MemberProfileViewSet(viewsets.ModelViewSet):
+class MemberProfileViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for member profiles
     """
-    queryset = MemberProfile.objects.select_related('user', 'county').all()
+    queryset = MemberProfile.objects.all()
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -21,10 +22,11 @@ class MemberProfileViewSet(viewsets.ModelViewSet):
         return MemberProfileSerializer
     
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_admin_user:
-            return self.queryset
-        return self.queryset.filter(user=user)
+            return queryset
+        return queryset.filter(user=user)
     
     @action(detail=False, methods=['get'])
     def me(self, request):
@@ -50,17 +52,18 @@ class MemberProfileViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Member rejected'})
 
 
-class CertificateViewSet(viewsets.ModelViewSet):
+class CertificateViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for certificates
     """
-    queryset = Certificate.objects.select_related('member__user').all()
+    queryset = Certificate.objects.all()
     serializer_class = CertificateSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_admin_user:
-            return self.queryset
+            return queryset
         profile = get_object_or_404(MemberProfile, user=user)
-        return self.queryset.filter(member=profile)
+        return queryset.filter(member=profile)
@@ -5,3 +5,8 @@ class PagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pages'
     verbose_name = 'Web Pages'
+
+    def ready(self):
+        # Importing the views registers the models each cached page depends on,
+        # so their saves invalidate pages in every worker from startup.
+        from . import views  # noqa: F401
@@ -0,0 +1,70 @@
+"""
+Full-page cache for anonymous GET requests to public pages.
+
+Each cached view declares the models it renders. Page keys embed the cache
+versions of those models (see core.cache), so saving e.g. a Project only makes
+the pages that list projects miss; everything else keeps being served from cache.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+
+from core import cache as site_cache
+from core.models import SiteSettings, SectionStyle, SectionSlide
+
+# Every page renders header/footer from the site_settings and section_styles context processors
+BASE_DEPENDENCIES = (SiteSettings, SectionStyle, SectionSlide)
+
+
+def _is_cacheable_request(request):
+    if request.method != 'GET' or request.user.is_authenticated:
+        return False
+    # A cached copy must not swallow (or replay) one-off flash messages
+    return len(get_messages(request)) == 0
+
+
+def _is_cacheable_response(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+    )
+
+
+def _page_key(request, dependencies):
+    # Absolute URL: templates build absolute media URLs from the request host
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    versions = '.'.join(str(v) for v in site_cache.get_versions(*dependencies))
+    return f'{site_cache.KEY_PREFIX}:page:{url}:{versions}'
+
+
+def cache_public_page(*models, timeout=None):
+    """
+    Cache the rendered page for anonymous visitors until one of models (or the
+    site settings / section backgrounds) changes, or PAGE_CACHE_TIMEOUT passes.
+    """
+    dependencies = BASE_DEPENDENCIES + tuple(models)
+    site_cache.track(*dependencies)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            page_timeout = settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout
+            if page_timeout <= 0 or not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+            key = _page_key(request, dependencies)
+            response = cache.get(key)
+            if response is not None:
+                return response
+            response = view_func(request, *args, **kwargs)
+            if _is_cacheable_response(response):
+                if callable(getattr(response, 'render', None)):
+                    response.add_post_render_callback(lambda r: cache.set(key, r, page_timeout))
+                else:
+                    cache.set(key, response, page_timeout)
+            return response
+        return wrapped
+    return decorator
@@ -6,6 +6,7 @@ from gallery.models import GalleryItem
 from projects.models import Project, ProjectCategory, County, Ministry
 from events.models import Event
 from sports.models import SportProgram, Team
+from gamification.models import PointsTransaction
 
 User = get_user_model()
 
@@ -206,6 +207,83 @@ class YouthJobForm(forms.ModelForm):
                 field.widget.attrs.setdefault('class', 'input')
 
 
+class PointsAwardForm(forms.Form):
+    """Bulk points award for an event's attendees or a project's members (manage area)."""
+    points = forms.IntegerField(initial=10)
+    transaction_type = forms.ChoiceField(choices=PointsTransaction.TRANSACTION_TYPE_CHOICES)
+    description = forms.CharField(max_length=200, required=False, help_text='Defaults to the type and the event/project name')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            field.widget.attrs.setdefault('class', 'input')
+
+    def clean_points(self):
+        points = self.cleaned_data['points']
+        if points == 0:
+            raise forms.ValidationError('Points must not be zero.')
+        return points
+
+
+class IdListField(forms.Field):
+    """Integer ids from repeated inputs (e.g. ticked checkboxes named alike)."""
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return [int(v) for v in value or []]
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Invalid selection.')
+
+
+class BulkApprovalForm(forms.Form):
+    """Approve/reject many accounts of one role: the ticked rows, or everyone matching the filters."""
+    SCOPE_CHOICES = [('selected', 'Ticked rows'), ('filtered', 'Everyone matching the filters')]
+    decision = forms.ChoiceField()
+    scope = forms.ChoiceField(choices=SCOPE_CHOICES, initial='selected')
+    ids = IdListField(required=False)
+    ward = forms.ModelChoiceField(queryset=Ward.objects.select_related('constituency'), required=False, empty_label='Any ward')
+    constituency = forms.ModelChoiceField(queryset=Constituency.objects.all(), required=False, empty_label='Any constituency')
+    joined_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}), label='Registered from')
+    joined_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}), label='Registered to')
+
+    def __init__(self, *args, decisions=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['decision'].choices = [(d, d.capitalize()) for d in decisions]
+        for field in self.fields.values():
+            field.widget.attrs.setdefault('class', 'input')
+
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get('scope') == 'selected' and not cleaned.get('ids'):
+            raise forms.ValidationError('Tick at least one row, or apply to everyone matching the filters.')
+        return cleaned
+
+    def selection(self):
+        """Keyword arguments for core.approvals.select()."""
+        data = self.cleaned_data
+        return {
+            'ids': data['ids'] if data['scope'] == 'selected' else None,
+            'ward': data['ward'],
+            'constituency': data['constituency'],
+            'joined_from': data['joined_from'],
+            'joined_to': data['joined_to'],
+        }
+
+
+class ManageListForm(forms.Form):
+    """Search box and filters of a manage list (pages.listing); the filter fields come from the list."""
+
+    def __init__(self, *args, filters=None, search=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        if search:
+            self.fields['q'] = forms.CharField(label='Search', required=False, max_length=100)
+        for name, spec in (filters or {}).items():
+            self.fields[name] = spec.field()
+        for field in self.fields.values():
+            field.widget.attrs.setdefault('class', 'input')
+
+
 class UserCreateForm(forms.ModelForm):
     """Add user from manage dashboard. Only super_admin can create admin/super_admin users."""
     password = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'input'}), min_length=8, label='Password', required=False)
@@ -0,0 +1,192 @@
+"""
+Server-side paging, sorting, filtering and search for the manage lists.
+
+A ManageList declares what one list offers: the columns it sorts on, its
+filters (role, ward, status, year, ...) and the fields its search box looks
+in. page(request, queryset) applies the request's choices and returns a
+ListPage with one page of rows and the links around it, rendered with the
+manage/list_toolbar.html, list_pager.html and sort_header.html includes.
+
+Paging is keyset: ?after= / ?before= carry the sort value and primary key of
+the last / first row shown, and a page is the next page_size rows past that
+row along the sort. Every sort column is indexed with the primary key as
+tie-breaker (see the models' Meta.indexes), so any page costs about the same
+as the first and no OFFSET or COUNT(*) is run; the total shown comes from
+core.pagination.estimate_count(). Sort columns must not be nullable.
+
+Several lists can share one page (members: pending and approved). Each gets a
+prefix for its sort and cursor parameters, while the filters and the search
+box apply to all of them.
+
+Search matches every word at the start of one of the list's search fields
+(istartswith). Each search field has a prefix index (core.prefix_indexes), so a
+search is a few index range scans whatever the table size; a substring match
+would have to read every row.
+"""
+import base64
+import json
+from collections import namedtuple
+from datetime import date, datetime, time
+
+from django import forms
+from django.db import connections, models
+from django.db.models import Q
+from django.utils import timezone
+
+from core.pagination import ESTIMATE_COUNT_CAP, estimate_count
+
+from .forms import ManageListForm
+
+# field: makes the form field; apply: (queryset, cleaned value) -> queryset
+Filter = namedtuple('Filter', 'field apply')
+ListPage = namedtuple('ListPage', 'items form sort sort_links keep previous_url next_url count count_label')
+
+
+def choice_filter(label, choices, lookup):
+    return Filter(
+        lambda: forms.ChoiceField(label=label, required=False, choices=[('', f'Any {label.lower()}'), *choices]),
+        lambda queryset, value: queryset.filter(**{lookup: value}),
+    )
+
+
+def boolean_filter(label, lookup, yes, no):
+    """Filter on a boolean field, offered as two named states (e.g. Published / Draft)."""
+    return choice_filter(label, [('1', yes), ('0', no)], lookup)
+
+
+def model_filter(label, choices, lookup):
+    """Filter on a foreign key; choices is the queryset offered."""
+    return Filter(
+        lambda: forms.ModelChoiceField(label=label, queryset=choices, required=False, empty_label=f'Any {label.lower()}'),
+        lambda queryset, value: queryset.filter(**{lookup: value}),
+    )
+
+
+def year_filter(label, field_name):
+    """Rows whose date or datetime field_name falls in a year (a range, so its index is used)."""
+    def apply(queryset, year):
+        start, end = date(year, 1, 1), date(year + 1, 1, 1)
+        if isinstance(queryset.model._meta.get_field(field_name), models.DateTimeField):
+            start, end = (timezone.make_aware(datetime.combine(day, time.min)) for day in (start, end))
+        return queryset.filter(**{f'{field_name}__gte': start, f'{field_name}__lt': end})
+    return Filter(
+        lambda: forms.IntegerField(label=label, required=False, min_value=1900, max_value=2100,
+                                   widget=forms.NumberInput(attrs={'placeholder': 'Any year'})),
+        apply,
+    )
+
+
+def _encode(value, pk):
+    value = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode().rstrip('=')
+
+
+def _decode(cursor, field):
+    """(sort value, pk) of a cursor, or None if it is malformed."""
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return field.to_python(value), int(pk)
+    except (ValueError, TypeError, forms.ValidationError):
+        return None
+
+
+def _past(name, value, pk, descending):
+    """Rows after (value, pk) along the sort on name."""
+    op = 'lt' if descending else 'gt'
+    return Q(**{f'{name}__{op}': value}) | Q(**{name: value, f'pk__{op}': pk})
+
+
+def _query(request, **params):
+    """The current query string with params set (None removes one)."""
+    query = request.GET.copy()
+    for name, value in params.items():
+        if value is None:
+            query.pop(name, None)
+        else:
+            query[name] = value
+    return f'?{query.urlencode()}' if query else '?'
+
+
+class ManageList:
+    def __init__(self, sorts, default_sort, filters=None, search=(), page_size=50):
+        """
+        sorts: {key: field} of the sortable columns, '-field' if the column
+        starts descending; default_sort: a key, '-key' for descending.
+        filters: {name: Filter}; search: fields the search box matches by prefix
+        (istartswith), each with a prefix index (core.prefix_indexes).
+        """
+        self.sorts = sorts
+        self.default_sort = default_sort
+        self.filters = filters or {}
+        self.search = search
+        self.page_size = page_size
+
+    def _sort(self, request, param):
+        sort = request.GET.get(param, '')
+        return sort if sort.lstrip('-') in self.sorts else self.default_sort
+
+    def filter(self, request, queryset):
+        """(form, queryset narrowed by the request's valid filters and search)."""
+        form = ManageListForm(request.GET, filters=self.filters, search=bool(self.search))
+        form.is_valid()  # invalid filters are ignored; cleaned_data keeps the valid ones
+        data = form.cleaned_data
+        for name, spec in self.filters.items():
+            if data.get(name) not in (None, ''):
+                queryset = spec.apply(queryset, data[name])
+        for word in (data.get('q') or '').split():
+            queryset = queryset.filter(Q(*(Q(**{f'{name}__istartswith': word}) for name in self.search), _connector=Q.OR))
+        return form, queryset
+
+    def page(self, request, queryset, prefix=''):
+        sort_param, after_param, before_param = f'{prefix}sort', f'{prefix}after', f'{prefix}before'
+        form, queryset = self.filter(request, queryset)
+        count = estimate_count(queryset)
+
+        sort = self._sort(request, sort_param)
+        descending = sort.startswith('-')
+        name = self.sorts[sort.lstrip('-')].lstrip('-')
+        field = queryset.model._meta.get_field(name)
+        ordering = [f'-{name}', '-pk'] if descending else [name, 'pk']
+
+        after = _decode(request.GET.get(after_param, ''), field)
+        before = None if after else _decode(request.GET.get(before_param, ''), field)
+        if after:
+            queryset = queryset.filter(_past(name, *after, descending))
+        elif before:
+            # Walk backwards from the first row shown, then put the page back in order
+            queryset = queryset.filter(_past(name, *before, not descending))
+            ordering = [o[1:] if o.startswith('-') else f'-{o}' for o in ordering]
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if before:
+            rows.reverse()
+        has_previous, has_next = (more, True) if before else (bool(after), more)
+
+        previous_url = next_url = None
+        if rows and has_previous:
+            cursor = _encode(getattr(rows[0], field.attname), rows[0].pk)
+            previous_url = _query(request, **{before_param: cursor, after_param: None})
+        if rows and has_next:
+            cursor = _encode(getattr(rows[-1], field.attname), rows[-1].pk)
+            next_url = _query(request, **{after_param: cursor, before_param: None})
+
+        sort_links = {}
+        for key, column in self.sorts.items():
+            active = sort.lstrip('-') == key
+            if active:
+                target = key if descending else f'-{key}'
+            else:
+                target = f'-{key}' if column.startswith('-') else key
+            sort_links[key] = {
+                'url': _query(request, **{sort_param: target, after_param: None, before_param: None}),
+                'active': active,
+                'descending': active and descending,
+            }
+
+        if connections[queryset.db].vendor == 'postgresql':
+            count_label = f'about {count}'
+        else:
+            count_label = f'{count}+' if count >= ESTIMATE_COUNT_CAP else str(count)
+        keep = [(k, v) for k, v in request.GET.items() if k.endswith('sort')]
+        return ListPage(rows, form, sort, sort_links, keep, previous_url, next_url, count, count_label)
@@ -9,10 +9,14 @@ urlpatterns = [
     path('members/', views_manage.members_list, name='members'),
     path('members/<int:pk>/approve/', views_manage.member_approve, name='member_approve'),
     path('members/<int:pk>/reject/', views_manage.member_reject, name='member_reject'),
+    path('members/bulk/', views_manage.bulk_approval, {'role': 'member'}, name='member_bulk'),
     path('donors/', views_manage.donors_list, name='donors'),
     path('donors/<int:pk>/approve/', views_manage.donor_approve, name='donor_approve'),
+    path('donors/bulk/', views_manage.bulk_approval, {'role': 'donor'}, name='donor_bulk'),
     path('county-officials/', views_manage.county_officials_list, name='county_officials'),
     path('county-officials/<int:pk>/verify/', views_manage.county_official_verify, name='county_official_verify'),
+    path('county-officials/bulk/', views_manage.bulk_approval, {'role': 'county_official'}, name='county_official_bulk'),
+    path('approvals/<uuid:job_id>/', views_manage.bulk_approval_status, name='bulk_approval_status'),
     path('users/', views_manage.users_list, name='users_list'),
     path('users/add/', views_manage.user_add, name='user_add'),
     path('users/<int:pk>/edit/', views_manage.user_edit, name='user_edit'),
@@ -24,10 +28,12 @@ urlpatterns = [
     path('projects/add/', views_manage.project_add, name='project_add'),
     path('projects/<int:pk>/edit/', views_manage.project_edit, name='project_edit'),
     path('projects/<int:pk>/delete/', views_manage.project_delete, name='project_delete'),
+    path('projects/<int:pk>/award-points/', views_manage.project_award_points, name='project_award_points'),
     path('events/', views_manage.events_list, name='events_list'),
     path('events/add/', views_manage.event_add, name='event_add'),
     path('events/<int:pk>/edit/', views_manage.event_edit, name='event_edit'),
     path('events/<int:pk>/delete/', views_manage.event_delete, name='event_delete'),
+    path('events/<int:pk>/award-points/', views_manage.event_award_points, name='event_award_points'),
     path('sports/programs/', views_manage.sport_programs_list, name='sport_programs_list'),
     path('sports/programs/add/', views_manage.sport_program_add, name='sport_program_add'),
     path('sports/programs/<int:pk>/edit/', views_manage.sport_program_edit, name='sport_program_edit'),
@@ -1,6 +1,9 @@
 from django import template
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+from core.images import get_manifest
+
 register = template.Library()
 
 
@@ -23,3 +26,53 @@ def bold_youth_labour_office(value):
         'Youth Labour Office',
         '<strong>Youth Labour Office</strong>'
     ))
+
+
+def _srcset(fieldfile, fmt, request):
+    manifest = get_manifest(fieldfile)
+    if not manifest:
+        return ''
+    storage = fieldfile.storage
+    return ', '.join(
+        f'{absolute_media(storage.url(name), request)} {width}w'
+        for width, name in manifest['sources'].get(fmt, [])
+    )
+
+
+@register.simple_tag(takes_context=True)
+def srcset(context, fieldfile, fmt='jpeg'):
+    """srcset value for an image's renditions in fmt ('jpeg' or 'webp'); empty when it has none."""
+    return _srcset(fieldfile, fmt, context.get('request'))
+
+
+@register.simple_tag(takes_context=True)
+def picture(context, fieldfile, alt='', sizes='100vw', css_class='', loading='lazy'):
+    """
+    <picture> for an uploaded image: WebP and JPEG renditions at each width with
+    the original as fallback, or a plain <img> when it has no renditions yet.
+    """
+    request = context.get('request')
+    src = absolute_media(fieldfile.url, request)
+    webp, jpeg = _srcset(fieldfile, 'webp', request), _srcset(fieldfile, 'jpeg', request)
+    if not jpeg:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="{}">', src, alt, css_class, loading)
+    manifest = get_manifest(fieldfile)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" loading="{}"></picture>',
+        webp, sizes, src, jpeg, sizes, manifest['width'], manifest['height'], alt, css_class, loading,
+    )
+
+
+@register.filter
+def rendition_url(fieldfile, width):
+    """
+    URL of the narrowest JPEG rendition at least width pixels wide (the widest
+    one if none is), for CSS backgrounds; the original's URL when it has none.
+    """
+    manifest = get_manifest(fieldfile)
+    if not manifest:
+        return fieldfile.url if fieldfile else ''
+    sources = manifest['sources']['jpeg']
+    name = next((name for w, name in sources if w >= int(width)), sources[-1][1])
+    return fieldfile.storage.url(name)
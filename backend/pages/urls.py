@@ -16,6 +16,7 @@ urlpatterns = [
     path('gallery/', views.gallery, name='gallery'),
     path('sports/', views.sports, name='sports'),
     path('reports/', views.reports_list, name='reports'),
+    path('search/', views.search, name='search'),
     path('login/', views.WebLoginView.as_view(), name='login'),
     path('logout/', views.WebLogoutView.as_view(), name='logout'),
     path('register/', views.register, name='register'),
@@ -7,13 +7,17 @@ from django.views.generic import TemplateView, ListView, DetailView, FormView
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.http import JsonResponse
-from projects.models import Project
+from django.utils.decorators import method_decorator
+from projects.models import Project, ProjectCategory
 from events.models import Event
 from gallery.models import GalleryItem
 from sports.models import SportProgram, Team
 from reports.models import Report, ContactMessage
-from core.models import Constituency, Ward, Official, YouthJob, AboutPage
+from core import search as site_search
+from core.counters import get_counts
+from core.models import Constituency, Ward, Official, YouthJob, AboutPage, SiteCounter
 
+from .cache import cache_public_page
 from .forms import RegisterForm, ContactForm, DonorRegisterForm, CountyOfficialRegisterForm
 
 User = get_user_model()
@@ -21,46 +25,46 @@ User = get_user_model()
 
 # ---------- Page views (template-based) ----------
 
+def _public_stats():
+    counts = get_counts()
+    return {
+        'members': counts['approved_members'],
+        'projects': counts['public_projects'],
+        'events': counts['published_events'],
+        'communities': counts['communities'],
+    }
+
+
+@cache_public_page(Project, ProjectCategory, Event, SiteCounter)
 def home(request):
     featured_projects = Project.objects.filter(is_featured=True, status='ongoing')[:3]
     upcoming_events = Event.objects.filter(is_published=True).order_by('start_date')[:3]
     context = {
         'featured_projects': featured_projects,
         'upcoming_events': upcoming_events,
-        'stats': {
-            'members': 250,
-            'projects': 45,
-            'events': 120,
-            'communities': 15,
-        },
+        'stats': _public_stats(),
     }
     return render(request, 'pages/home.html', context)
 
 
+@cache_public_page(AboutPage, SiteCounter)
 def about(request):
-    from projects.models import Project
-    from events.models import Event
-    project_count = Project.objects.count() or 45
-    event_count = Event.objects.count() or 120
     about_content = AboutPage.load()
     context = {
-        'stats': {
-            'members': 250,
-            'projects': project_count,
-            'events': event_count,
-            'communities': 15,
-        },
+        'stats': _public_stats(),
         'about_content': about_content,
     }
     return render(request, 'pages/about.html', context)
 
 
+@cache_public_page(Official)
 def officials(request):
     """Public Officials page (CBO leadership)."""
     items = Official.objects.filter(is_published=True).order_by('order', 'name')
     return render(request, 'pages/officials.html', {'officials': items})
 
 
+@cache_public_page(YouthJob)
 def youth_jobs(request):
     """Public Community Youth Jobs / opportunities page."""
     items = YouthJob.objects.filter(is_published=True).order_by('-created_at')
@@ -85,6 +89,7 @@ def contact(request):
     return render(request, 'pages/contact.html', {'form': form})
 
 
+@method_decorator(cache_public_page(Project, ProjectCategory), name='dispatch')
 class ProjectListView(ListView):
     model = Project
     template_name = 'pages/projects.html'
@@ -95,11 +100,13 @@ class ProjectListView(ListView):
         return Project.objects.filter(is_public=True).select_related('category').order_by('-created_at')
 
 
+@cache_public_page(Project, ProjectCategory)
 def project_detail(request, slug):
     project = get_object_or_404(Project, slug=slug, is_public=True)
     return render(request, 'pages/project_detail.html', {'project': project})
 
 
+@method_decorator(cache_public_page(Event), name='dispatch')
 class EventListView(ListView):
     model = Event
     template_name = 'pages/events.html'
@@ -107,30 +114,61 @@ class EventListView(ListView):
     paginate_by = 12
 
     def get_queryset(self):
-        return Event.objects.filter(is_published=True).order_by('-start_date')
+        return Event.objects.with_registration_counts().filter(is_published=True).order_by('-start_date')
 
 
+@cache_public_page(Event)
 def event_detail(request, slug):
     event = get_object_or_404(Event, slug=slug, is_published=True)
     return render(request, 'pages/event_detail.html', {'event': event})
 
 
+@cache_public_page(GalleryItem)
 def gallery(request):
     items = GalleryItem.objects.filter(is_public=True).order_by('-created_at')[:48]
     return render(request, 'pages/gallery.html', {'items': items})
 
 
+@cache_public_page(SportProgram, Team)
 def sports(request):
     programs = SportProgram.objects.filter(is_active=True)
     teams = Team.objects.filter(is_active=True).select_related('sport_program')
     return render(request, 'pages/sports.html', {'programs': programs, 'teams': teams})
 
 
+@cache_public_page(Report)
 def reports_list(request):
     report_list = Report.objects.filter(is_public=True).order_by('-report_date')
     return render(request, 'pages/reports.html', {'reports': report_list})
 
 
+SEARCH_PAGE_SIZE = 20
+
+
+def search(request):
+    """Site search page: ranked, highlighted matches across the public content (core.search)."""
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('type', '')
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    total, results = site_search.search(
+        query, kinds=[kind] if kind else None, limit=SEARCH_PAGE_SIZE, offset=(page - 1) * SEARCH_PAGE_SIZE,
+    )
+    context = {
+        'query': query,
+        'kind': kind,
+        'kinds': site_search.KINDS,
+        'results': results,
+        'total': total,
+        'page': page,
+        'has_previous': page > 1,
+        'has_next': page * SEARCH_PAGE_SIZE < total,
+    }
+    return render(request, 'pages/search.html', context)
+
+
 # ---------- Auth ----------
 
 class WebLoginView(LoginView):
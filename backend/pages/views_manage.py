@@ -1,4 +1,5 @@
 """Custom admin / manage area views (eye-catching UI, no Django admin)."""
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -6,17 +7,22 @@ from django.contrib import messages
 from django.utils import timezone
 from django.utils.text import slugify
 
-from core.models import SiteSettings, AuditLog, Official, YouthJob, AboutPage, SectionStyle, SectionSlide
+from core import approvals, audit, changes
+from core.counters import get_counts
+from core.models import SiteSettings, Official, YouthJob, AboutPage, SectionStyle, SectionSlide, Ward
 from gallery.models import GalleryItem
 from reports.models import ContactMessage
 from projects.models import Project
 from events.models import Event
 from sports.models import SportProgram, Team
+from gamification.awards import DEFAULT_TRANSACTION_TYPES, award_points
 from .forms import (
     SiteSettingsForm, GalleryItemForm, ProjectForm, EventForm,
     SportProgramForm, TeamForm, AboutPageForm, OfficialForm, YouthJobForm,
-    UserCreateForm, UserEditForm, SectionStyleForm, SectionSlideForm,
+    UserCreateForm, UserEditForm, SectionStyleForm, SectionSlideForm, PointsAwardForm,
+    BulkApprovalForm,
 )
+from .listing import ManageList, boolean_filter, choice_filter, model_filter, year_filter
 
 User = get_user_model()
 
@@ -35,34 +41,41 @@ def require_admin(view_func):
 @require_admin
 def dashboard(request):
     """Manage dashboard home: stats and quick links."""
-    pending = User.objects.filter(role='member', is_approved=False).count()
-    total_members = User.objects.filter(role='member', is_approved=True).count()
-    gallery_count = GalleryItem.objects.filter(is_public=True).count()
-    projects_count = Project.objects.filter(is_public=True).count()
-    events_count = Event.objects.filter(is_published=True).count()
-    officials_count = Official.objects.filter(is_published=True).count()
-    youth_jobs_count = YouthJob.objects.filter(is_published=True).count()
+    counts = get_counts()
     recent_messages = ContactMessage.objects.order_by('-created_at')[:5]
     return render(request, 'pages/manage/dashboard.html', {
-        'pending_members': pending,
-        'total_members': total_members,
-        'gallery_count': gallery_count,
-        'projects_count': projects_count,
-        'events_count': events_count,
-        'officials_count': officials_count,
-        'youth_jobs_count': youth_jobs_count,
+        'pending_members': counts['pending_approvals'],
+        'total_members': counts['approved_members'],
+        'gallery_count': counts['gallery_items'],
+        'projects_count': counts['public_projects'],
+        'events_count': counts['published_events'],
+        'officials_count': counts['published_officials'],
+        'youth_jobs_count': counts['published_youth_jobs'],
         'recent_messages': recent_messages,
     })
 
 
+WARD_CHOICES = Ward.objects.select_related('constituency').order_by('name')
+USER_SEARCH = ('username', 'first_name', 'last_name', 'email')
+
+MEMBER_LIST = ManageList(
+    sorts={'joined': '-date_joined', 'username': 'username'},
+    default_sort='-joined',
+    filters={'ward': model_filter('Ward', WARD_CHOICES, 'ward'), 'year': year_filter('Year joined', 'date_joined')},
+    search=USER_SEARCH,
+)
+
+
 @require_admin
 def members_list(request):
-    """List members with approve/reject actions."""
-    pending = User.objects.filter(role='member', is_approved=False).select_related('ward', 'ward__constituency').order_by('-date_joined')
-    approved = User.objects.filter(role='member', is_approved=True).select_related('ward', 'ward__constituency').order_by('-date_joined')[:50]
+    """List members with approve/reject actions: pending and approved, paged separately."""
+    members = User.objects.filter(role='member').select_related('ward', 'ward__constituency')
+    pending = MEMBER_LIST.page(request, members.filter(is_approved=False), prefix='pending-')
+    approved = MEMBER_LIST.page(request, members.filter(is_approved=True), prefix='approved-')
     return render(request, 'pages/manage/members.html', {
         'pending': pending,
         'approved': approved,
+        'bulk_form': BulkApprovalForm(decisions=approvals.decisions_for('member')),
     })
 
 
@@ -71,15 +84,8 @@ def member_approve(request, pk):
     """Approve a member."""
     user = get_object_or_404(User, pk=pk, role='member')
     user.is_approved = True
-    user.save(update_fields=['is_approved', 'updated_at'])
-    AuditLog.objects.create(
-        user=request.user,
-        action='approve',
-        model_name='User',
-        object_id=str(user.pk),
-        object_repr=str(user),
-        ip_address=get_client_ip(request),
-    )
+    with changes.action('approve'):
+        user.save(update_fields=['is_approved', 'updated_at'])
     messages.success(request, f'{user.username} has been approved.')
     return redirect('manage:members')
 
@@ -89,26 +95,12 @@ def member_reject(request, pk):
     """Reject / unapprove a member."""
     user = get_object_or_404(User, pk=pk, role='member')
     user.is_approved = False
-    user.save(update_fields=['is_approved', 'updated_at'])
-    AuditLog.objects.create(
-        user=request.user,
-        action='reject',
-        model_name='User',
-        object_id=str(user.pk),
-        object_repr=str(user),
-        ip_address=get_client_ip(request),
-    )
+    with changes.action('reject'):
+        user.save(update_fields=['is_approved', 'updated_at'])
     messages.success(request, f'{user.username} has been unapproved.')
     return redirect('manage:members')
 
 
-def get_client_ip(request):
-    xff = request.META.get('HTTP_X_FORWARDED_FOR')
-    if xff:
-        return xff.split(',')[0].strip()
-    return request.META.get('REMOTE_ADDR') or None
-
-
 @require_admin
 def gallery_list(request):
     """List gallery items with edit/delete links."""
@@ -162,7 +154,7 @@ def gallery_delete(request, pk):
 @require_admin
 def settings_edit(request):
     """Edit site settings (singleton)."""
-    obj = SiteSettings.load()
+    obj = SiteSettings.refresh()
     if request.method == 'POST':
         form = SiteSettingsForm(request.POST, request.FILES, instance=obj)
         if form.is_valid():
@@ -174,17 +166,40 @@ def settings_edit(request):
     return render(request, 'pages/manage/settings.html', {'form': form, 'site_settings': obj})
 
 
+MESSAGE_LIST = ManageList(
+    sorts={'received': '-created_at'},
+    default_sort='-received',
+    filters={
+        'status': choice_filter('Status', ContactMessage.STATUS_CHOICES, 'status'),
+        'year': year_filter('Year', 'created_at'),
+    },
+    search=('name', 'email', 'subject'),
+)
+
+
 @require_admin
 def contact_messages(request):
     """List contact form messages."""
-    messages_list = ContactMessage.objects.order_by('-created_at')[:100]
+    messages_list = MESSAGE_LIST.page(request, ContactMessage.objects.all())
     return render(request, 'pages/manage/messages.html', {'messages_list': messages_list})
 
 
 # ---------- Users ----------
+USER_LIST = ManageList(
+    sorts={'joined': '-date_joined', 'username': 'username'},
+    default_sort='-joined',
+    filters={
+        'role': choice_filter('Role', User.ROLE_CHOICES, 'role'),
+        'ward': model_filter('Ward', WARD_CHOICES, 'ward'),
+        'year': year_filter('Year joined', 'date_joined'),
+    },
+    search=USER_SEARCH,
+)
+
+
 @require_admin
 def users_list(request):
-    users = User.objects.all().select_related('ward').order_by('-date_joined')[:100]
+    users = USER_LIST.page(request, User.objects.select_related('ward'))
     return render(request, 'pages/manage/users_list.html', {'users': users})
 
 
@@ -223,6 +238,7 @@ def donors_list(request):
     return render(request, 'pages/manage/donors.html', {
         'pending': pending,
         'approved': approved,
+        'bulk_form': BulkApprovalForm(decisions=approvals.decisions_for('donor')),
     })
 
 
@@ -231,15 +247,8 @@ def donor_approve(request, pk):
     """Approve a donor/sponsor."""
     user = get_object_or_404(User, pk=pk, role='donor')
     user.is_approved = True
-    user.save(update_fields=['is_approved', 'updated_at'])
-    AuditLog.objects.create(
-        user=request.user,
-        action='approve',
-        model_name='User',
-        object_id=str(user.pk),
-        object_repr=str(user),
-        ip_address=get_client_ip(request),
-    )
+    with changes.action('approve'):
+        user.save(update_fields=['is_approved', 'updated_at'])
     messages.success(request, f'{user.get_full_name() or user.username} has been approved as donor.')
     return redirect('manage:donors')
 
@@ -252,6 +261,7 @@ def county_officials_list(request):
     return render(request, 'pages/manage/county_officials.html', {
         'pending': pending,
         'verified': verified,
+        'bulk_form': BulkApprovalForm(decisions=approvals.decisions_for('county_official')),
     })
 
 
@@ -260,23 +270,68 @@ def county_official_verify(request, pk):
     """Verify a county official."""
     user = get_object_or_404(User, pk=pk, role='county_official')
     user.is_verified = True
-    user.save(update_fields=['is_verified', 'updated_at'])
-    AuditLog.objects.create(
-        user=request.user,
-        action='verify',
-        model_name='User',
-        object_id=str(user.pk),
-        object_repr=str(user),
-        ip_address=get_client_ip(request),
-    )
+    with changes.action('verify'):
+        user.save(update_fields=['is_verified', 'updated_at'])
     messages.success(request, f'{user.get_full_name() or user.username} has been verified.')
     return redirect('manage:county_officials')
 
 
+BULK_APPROVAL_LISTS = {'member': 'manage:members', 'donor': 'manage:donors', 'county_official': 'manage:county_officials'}
+
+
+@require_admin
+def bulk_approval(request, role):
+    """Apply one decision to many accounts of role (core.approvals); a queued job's progress gets its own page."""
+    list_url = BULK_APPROVAL_LISTS[role]
+    if request.method != 'POST':
+        return redirect(list_url)
+    form = BulkApprovalForm(request.POST, decisions=approvals.decisions_for(role))
+    if not form.is_valid():
+        messages.error(request, ' '.join(e for errors in form.errors.values() for e in errors))
+        return redirect(list_url)
+    decision = form.cleaned_data['decision']
+    user_ids = list(approvals.select(role, decision, **form.selection()).values_list('pk', flat=True))
+    if not user_ids:
+        messages.info(request, 'Nobody in the selection needed that change.')
+        return redirect(list_url)
+    job = approvals.run(role, decision, user_ids, actor=request.user, ip_address=audit.client_ip(request))
+    if not job.finished:
+        # Queued for Celery: follow its progress (the job row is shared by every worker)
+        return redirect('manage:bulk_approval_status', job_id=job.pk)
+    messages.success(request, f'Bulk {decision}: {job.changed} of {job.total} selected account{"s" if job.total != 1 else ""} updated.')
+    return redirect(list_url)
+
+
+@require_admin
+def bulk_approval_status(request, job_id):
+    """Progress of a bulk approval job (?format=json for polling)."""
+    job = approvals.job_status(job_id)
+    if job is None:
+        raise Http404('Unknown or expired job')
+    if request.GET.get('format') == 'json':
+        return JsonResponse(job)
+    return render(request, 'pages/manage/bulk_approval_status.html', {
+        'job': job,
+        'percent': 100 * job['done'] // job['total'] if job['total'] else 100,
+        'list_url': BULK_APPROVAL_LISTS[job['role']],
+    })
+
+
 # ---------- Projects ----------
+PROJECT_LIST = ManageList(
+    sorts={'created': '-created_at', 'title': 'title'},
+    default_sort='-created',
+    filters={
+        'status': choice_filter('Status', Project.STATUS_CHOICES, 'status'),
+        'year': year_filter('Year added', 'created_at'),
+    },
+    search=('title',),
+)
+
+
 @require_admin
 def projects_list(request):
-    items = Project.objects.all().select_related('category', 'county').order_by('-created_at')[:80]
+    items = PROJECT_LIST.page(request, Project.objects.select_related('category', 'county'))
     return render(request, 'pages/manage/projects_list.html', {'items': items})
 
 
@@ -322,10 +377,28 @@ def project_delete(request, pk):
     return render(request, 'pages/manage/confirm_delete.html', {'item': obj, 'cancel_url': 'manage:projects_list', 'label': 'project'})
 
 
+@require_admin
+def project_award_points(request, pk):
+    obj = get_object_or_404(Project, pk=pk)
+    return _award_points(request, obj, 'manage:projects_list', 'active members')
+
+
 # ---------- Events ----------
+EVENT_LIST = ManageList(
+    sorts={'start': '-start_date', 'title': 'title'},
+    default_sort='-start',
+    filters={
+        'type': choice_filter('Type', Event.EVENT_TYPE_CHOICES, 'event_type'),
+        'status': boolean_filter('Status', 'is_published', 'Published', 'Draft'),
+        'year': year_filter('Year', 'start_date'),
+    },
+    search=('title', 'venue'),
+)
+
+
 @require_admin
 def events_list(request):
-    items = Event.objects.all().order_by('-start_date')[:80]
+    items = EVENT_LIST.page(request, Event.objects.all())
     return render(request, 'pages/manage/events_list.html', {'items': items})
 
 
@@ -371,6 +444,44 @@ def event_delete(request, pk):
     return render(request, 'pages/manage/confirm_delete.html', {'item': obj, 'cancel_url': 'manage:events_list', 'label': 'event'})
 
 
+@require_admin
+def event_award_points(request, pk):
+    obj = get_object_or_404(Event, pk=pk)
+    return _award_points(request, obj, 'manage:events_list', 'confirmed attendees')
+
+
+def _award_points(request, source, cancel_url, recipients):
+    """Award points to every eligible member of an event/project (members already awarded are skipped)."""
+    if request.method == 'POST':
+        form = PointsAwardForm(request.POST)
+        if form.is_valid():
+            data = form.cleaned_data
+            member_ids = award_points(
+                source, data['points'], transaction_type=data['transaction_type'],
+                description=data['description'], created_by=request.user,
+            )
+            if member_ids:
+                audit.record(
+                    user=request.user,
+                    action='create',
+                    model_name='PointsTransaction',
+                    object_id=str(source.pk),
+                    object_repr=f'{data["points"]} points x {len(member_ids)}: {source}'[:200],
+                    changes={source._meta.model_name: source.pk, 'points': data['points'],
+                             'transaction_type': data['transaction_type'], 'members': len(member_ids)},
+                    ip_address=audit.client_ip(request),
+                )
+                messages.success(request, f'Awarded {data["points"]} points to {len(member_ids)} members.')
+            else:
+                messages.info(request, f'No {recipients} left to award.')
+            return redirect(cancel_url)
+    else:
+        form = PointsAwardForm(initial={'transaction_type': DEFAULT_TRANSACTION_TYPES[type(source)]})
+    return render(request, 'pages/manage/award_points.html', {
+        'form': form, 'item': source, 'cancel_url': cancel_url, 'recipients': recipients,
+    })
+
+
 # ---------- Sports (programs & teams) ----------
 @require_admin
 def sport_programs_list(request):
@@ -463,7 +574,7 @@ def team_delete(request, pk):
 # ---------- About page ----------
 @require_admin
 def about_edit(request):
-    obj = AboutPage.load()
+    obj = AboutPage.refresh()
     if request.method == 'POST':
         form = AboutPageForm(request.POST, instance=obj)
         if form.is_valid():
@@ -521,9 +632,20 @@ def official_delete(request, pk):
 
 
 # ---------- Youth jobs ----------
+YOUTH_JOB_LIST = ManageList(
+    sorts={'created': '-created_at', 'title': 'title'},
+    default_sort='-created',
+    filters={
+        'status': boolean_filter('Status', 'is_published', 'Published', 'Draft'),
+        'year': year_filter('Year added', 'created_at'),
+    },
+    search=('title', 'organization'),
+)
+
+
 @require_admin
 def youth_jobs_list(request):
-    items = YouthJob.objects.all().order_by('-created_at')[:80]
+    items = YOUTH_JOB_LIST.page(request, YouthJob.objects.all())
     return render(request, 'pages/manage/youth_jobs_list.html', {'items': items})
 
 
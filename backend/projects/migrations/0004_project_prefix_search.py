@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from core.prefix_indexes import create_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_list_indexes'),
+    ]
+
+    operations = [
+        create_operation('projects_project', 'title'),
+    ]
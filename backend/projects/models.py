@@ -108,6 +108,8 @@ class Project(models.Model):
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['category', 'status']),
             models.Index(fields=['county', 'status']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['title', 'id']),
         ]
     
     def __str__(self):
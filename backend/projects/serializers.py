@@ -1,16 +1,17 @@
 from rest_framework import serializers
 from .models import County, Ministry, ProjectCategory, Project, ProjectMember, ProjectReport
-from members.serializers import MemberProfileSerializer
+from core.serializers import DynamicFieldsMixin
+from members.serializers import MemberProfileSerializer, MemberProfileSummarySerializer
 
 
-class CountySerializer(serializers.ModelSerializer):
+class CountySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = County
         fields = ['id', 'name', 'code', 'description', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class MinistrySerializer(serializers.ModelSerializer):
+class MinistrySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Ministry
         fields = ['id', 'name', 'abbreviation', 'description', 'logo', 
@@ -18,14 +19,14 @@ class MinistrySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class ProjectCategorySerializer(serializers.ModelSerializer):
+class ProjectCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectCategory
         fields = ['id', 'name', 'slug', 'description', 'icon', 'color', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class ProjectReportSerializer(serializers.ModelSerializer):
+class ProjectReportSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectReport
         fields = ['id', 'title', 'description', 'report_file', 'report_url', 
@@ -33,8 +34,10 @@ class ProjectReportSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class ProjectMemberSerializer(serializers.ModelSerializer):
-    member = MemberProfileSerializer(read_only=True)
+class ProjectMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    member = MemberProfileSummarySerializer(read_only=True)
+    
+    expandable_fields = {'member': MemberProfileSerializer}
     
     class Meta:
         model = ProjectMember
@@ -42,7 +45,7 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'joined_date']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = ProjectCategorySerializer(read_only=True)
     county = CountySerializer(read_only=True)
     ministry = MinistrySerializer(read_only=True)
@@ -50,6 +53,8 @@ class ProjectSerializer(serializers.ModelSerializer):
     reports = ProjectReportSerializer(many=True, read_only=True)
     budget_utilization = serializers.ReadOnlyField()
     
+    column_dependencies = {'budget_utilization': ('budget_amount', 'spent_amount')}
+    
     class Meta:
         model = Project
         fields = ['id', 'title', 'slug', 'description', 'objectives', 'category',
@@ -61,7 +66,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'budget_utilization']
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = ProjectCategorySerializer(read_only=True)
     county = CountySerializer(read_only=True)
     
@@ -69,3 +74,10 @@ class ProjectListSerializer(serializers.ModelSerializer):
         model = Project
         fields = ['id', 'title', 'slug', 'description', 'category', 'county', 
                   'status', 'featured_image', 'is_featured', 'created_at']
+
+
+class ProjectSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact project embedded by other serializers; ?expand= gives ProjectListSerializer"""
+    class Meta:
+        model = Project
+        fields = ['id', 'title', 'slug', 'status']
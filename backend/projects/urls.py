@@ -6,11 +6,12 @@ from .views import (
 )
 
 router = DefaultRouter()
+# Register the prefixed routes first: the '' route's detail pattern would otherwise swallow them
 router.register(r'counties', CountyViewSet, basename='county')
 router.register(r'ministries', MinistryViewSet, basename='ministry')
 router.register(r'categories', ProjectCategoryViewSet, basename='projectcategory')
-router.register(r'', ProjectViewSet, basename='project')
 router.register(r'reports', ProjectReportViewSet, basename='projectreport')
+router.register(r'', ProjectViewSet, basename='project')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from core.eager_loading import EagerLoadingMixin, setup_eager_loading
 from .models import County, Ministry, ProjectCategory, Project, ProjectMember, ProjectReport
 from .serializers import (
     CountySerializer, MinistrySerializer, ProjectCategorySerializer,
@@ -11,13 +12,13 @@ from .serializers import (
 )
 
 
-class CountyViewSet(viewsets.ReadOnlyModelViewSet):
+class CountyViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = County.objects.all()
     serializer_class = CountySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class MinistryViewSet(viewsets.ReadOnlyModelViewSet):
+class MinistryViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Ministry.objects.all()
     serializer_class = MinistrySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -25,14 +26,14 @@ class MinistryViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['name', 'abbreviation']
 
 
-class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectCategoryViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ProjectCategory.objects.all()
     serializer_class = ProjectCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.select_related('category', 'county', 'ministry').prefetch_related('project_members', 'reports')
+class ProjectViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'category', 'county', 'ministry', 'is_featured', 'is_public', 'slug']
@@ -79,12 +80,12 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def members(self, request, pk=None):
         """Get all members of a project"""
         project = self.get_object()
-        members = project.project_members.filter(is_active=True)
+        members = setup_eager_loading(ProjectMemberSerializer, ProjectMember.objects.filter(project=project, is_active=True))
         serializer = ProjectMemberSerializer(members, many=True)
         return Response(serializer.data)
 
 
-class ProjectReportViewSet(viewsets.ModelViewSet):
+class ProjectReportViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = ProjectReport.objects.select_related('project')
     serializer_class = ProjectReportSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from core.prefix_indexes import create_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_contactmessage_indexes'),
+    ]
+
+    operations = [
+        create_operation('reports_contactmessage', 'name', 'email', 'subject'),
+    ]
@@ -71,6 +71,10 @@ class ContactMessage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['status', 'created_at']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
@@ -3,8 +3,9 @@ from rest_framework.routers import DefaultRouter
 from .views import ReportViewSet, ContactMessageViewSet
 
 router = DefaultRouter()
-router.register(r'', ReportViewSet, basename='report')
+# Register the prefixed routes first: the '' route's detail pattern would otherwise swallow them
 router.register(r'contact', ContactMessageViewSet, basename='contactmessage')
+router.register(r'', ReportViewSet, basename='report')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -3,14 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from core.eager_loading import EagerLoadingMixin
 from .models import Report, ContactMessage
 from .serializers import (
     ReportSerializer, ContactMessageSerializer, ContactMessageCreateSerializer
 )
 
 
-class ReportViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Report.objects.select_related('project').all()
+class ReportViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Report.objects.all()
     serializer_class = ReportSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
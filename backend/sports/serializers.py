@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import SportProgram, Team, TeamMember, Match, TrainingSchedule
-from members.serializers import MemberProfileSerializer
+from core.serializers import DynamicFieldsMixin
+from members.serializers import MemberProfileSerializer, MemberProfileSummarySerializer
 
 
-class SportProgramSerializer(serializers.ModelSerializer):
+class SportProgramSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SportProgram
         fields = ['id', 'name', 'description', 'sport_type', 'logo', 
@@ -11,8 +12,10 @@ class SportProgramSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
-    member = MemberProfileSerializer(read_only=True)
+class TeamMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    member = MemberProfileSummarySerializer(read_only=True)
+    
+    expandable_fields = {'member': MemberProfileSerializer}
     
     class Meta:
         model = TeamMember
@@ -20,7 +23,18 @@ class TeamMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'joined_date']
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Compact team embedded by matches/training; ?expand= gives the full TeamSerializer"""
+    sport_program_name = serializers.CharField(source='sport_program.name', read_only=True)
+    
+    select_related_fields = ('sport_program',)
+    
+    class Meta:
+        model = Team
+        fields = ['id', 'name', 'logo', 'sport_program', 'sport_program_name']
+
+
+class TeamSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     sport_program = SportProgramSerializer(read_only=True)
     team_members = TeamMemberSerializer(many=True, read_only=True)
     
@@ -31,8 +45,10 @@ class TeamSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class MatchSerializer(serializers.ModelSerializer):
-    team = TeamSerializer(read_only=True)
+class MatchSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    team = TeamSummarySerializer(read_only=True)
+    
+    expandable_fields = {'team': TeamSerializer}
     
     class Meta:
         model = Match
@@ -41,8 +57,10 @@ class MatchSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class TrainingScheduleSerializer(serializers.ModelSerializer):
-    team = TeamSerializer(read_only=True)
+class TrainingScheduleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    team = TeamSummarySerializer(read_only=True)
+    
+    expandable_fields = {'team': TeamSerializer}
     
     class Meta:
         model = TrainingSchedule
@@ -1,6 +1,7 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
+from core.eager_loading import EagerLoadingMixin
 from .models import SportProgram, Team, TeamMember, Match, TrainingSchedule
 from .serializers import (
     SportProgramSerializer, TeamSerializer, TeamMemberSerializer,
@@ -8,30 +9,30 @@ from .serializers import (
 )
 
 
-class SportProgramViewSet(viewsets.ReadOnlyModelViewSet):
+class SportProgramViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
     queryset = SportProgram.objects.filter(is_active=True)
     serializer_class = SportProgramSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class TeamViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Team.objects.select_related('sport_program').prefetch_related('team_members').filter(is_active=True)
+class TeamViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Team.objects.filter(is_active=True)
     serializer_class = TeamSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['sport_program']
 
 
-class MatchViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Match.objects.select_related('team__sport_program').all()
+class MatchViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Match.objects.all()
     serializer_class = MatchSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['team', 'match_type', 'result']
 
 
-class TrainingScheduleViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = TrainingSchedule.objects.select_related('team').all()
+class TrainingScheduleViewSet(EagerLoadingMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = TrainingSchedule.objects.all()
     serializer_class = TrainingScheduleSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]